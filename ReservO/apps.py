@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+
+class ReservOConfig(AppConfig):
+    name = 'ReservO'
+    verbose_name = 'ReservO project'
+
+    def ready(self):
+        from . import checks  # noqa: F401 (registers the deploy checks)
+        from .sqlite import configure_sqlite
+        connection_created.connect(configure_sqlite, dispatch_uid='reservo-sqlite-profile')
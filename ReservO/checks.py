@@ -0,0 +1,28 @@
+# ReservO/checks.py
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+# Backends whose entries are only visible to the process that wrote them
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    The availability index generation and the catalog, booking and fragment
+    versions are how one worker tells the others to drop their copies; they
+    only work when every worker reads the same cache.
+    """
+    return [
+        Warning(
+            f"The {alias!r} cache ({config['BACKEND']}) is local to each process.",
+            hint="With more than one worker process, set RESERVO_REDIS_URL so cache invalidation "
+                 "(availability index, catalog, bookings and room fragments) reaches every worker.",
+            id="ReservO.W001",
+        )
+        for alias, config in settings.CACHES.items()
+        if config["BACKEND"] in PROCESS_LOCAL_CACHES
+    ]
@@ -0,0 +1,130 @@
+# ReservO/db.py
+"""
+Read replica routing.
+
+Views decorated with @use_replica send their ORM reads to the "replica"
+alias (configured only when RESERVO_DB_REPLICA is set, see settings);
+everything else, and every write, uses the primary. After any unsafe
+request the client gets a short-lived cookie that pins it to the primary
+for REPLICA_PIN_SECONDS, so users always read their own writes. Sessions
+and users always come from the primary (PRIMARY_ONLY_APPS), so a login or
+logout is never undone by a replica that has not caught up.
+
+Process-wide caches (room catalog, availability index, rate tables) and
+read-then-write code must be filled from the primary even inside a
+replica view; wrap them in read_from_primary().
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_ALIAS = "replica"
+PIN_COOKIE = "reservo_primary_until"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+# Read on the primary even inside @use_replica views (request.user, sessions)
+PRIMARY_ONLY_APPS = {"auth", "sessions", "contenttypes"}
+
+# Alias reads go to in the current request/task; None means the primary
+_read_alias = contextvars.ContextVar("read_alias", default=None)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def sync_interval():
+    return getattr(settings, "REPLICA_SYNC_INTERVAL", 5)
+
+
+def pin_seconds():
+    return getattr(settings, "REPLICA_PIN_SECONDS", 2 * sync_interval())
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return DEFAULT_DB_ALIAS
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        # The replica is a copy of the primary made by sync_replica, never migrated itself
+        return db == DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def read_from_primary():
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def pinned_to_primary(request):
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def _replica_for(request):
+    if replica_configured() and request.method in SAFE_METHODS and not pinned_to_primary(request):
+        return REPLICA_ALIAS
+    return None
+
+
+def use_replica(view):
+    """Serve this read-only view from the replica (sync or async view)."""
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            token = _read_alias.set(_replica_for(request))
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                _read_alias.reset(token)
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        token = _read_alias.set(_replica_for(request))
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+    return wrapper
+
+
+class ReplicaPinMiddleware:
+    """
+    Pins a client to the primary for REPLICA_PIN_SECONDS after any unsafe
+    request (booking, login, approval, ...). Removes itself from the chain
+    when no replica is configured.
+    """
+
+    def __init__(self, get_response):
+        if not replica_configured():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS:
+            seconds = pin_seconds()
+            response.set_cookie(
+                PIN_COOKIE, f"{time.time() + seconds:.0f}", max_age=seconds, httponly=True, samesite="Lax"
+            )
+        return response
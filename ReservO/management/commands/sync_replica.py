@@ -0,0 +1,48 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from ReservO.db import REPLICA_ALIAS, pin_seconds, replica_configured
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database onto the replica file (RESERVO_DB_REPLICA) with "
+        "SQLite's online backup API. Readers of the replica see either the old or the new "
+        "copy, never a partial one. Use --interval to keep it in sync for local testing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval", type=float,
+            help="Repeat every N seconds until interrupted (normally settings.REPLICA_SYNC_INTERVAL).",
+        )
+
+    def handle(self, *args, **options):
+        if not replica_configured():
+            raise CommandError("No replica configured; set RESERVO_DB_REPLICA to the replica's file path.")
+        primary, replica = connections[DEFAULT_DB_ALIAS], connections[REPLICA_ALIAS]
+        if primary.vendor != "sqlite" or replica.vendor != "sqlite":
+            raise CommandError("sync_replica copies SQLite files; use the database's own replication otherwise.")
+
+        while True:
+            started = time.perf_counter()
+            primary.ensure_connection()
+            target = sqlite3.connect(replica.settings_dict["NAME"], timeout=30)
+            try:
+                primary.connection.backup(target)
+            finally:
+                target.close()
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"Replica synced in {elapsed * 1000:.0f} ms")
+            if not options["interval"]:
+                break
+            if options["interval"] + 2 * elapsed > pin_seconds():
+                # A write made just after this sync started reaches the replica only after the next one
+                self.stderr.write(self.style.WARNING(
+                    f"Replica lag (up to {options['interval'] + 2 * elapsed:.1f}s) exceeds REPLICA_PIN_SECONDS "
+                    f"({pin_seconds()}s); clients may not see their own writes. Lower --interval or raise the pin."
+                ))
+            time.sleep(options["interval"])
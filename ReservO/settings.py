@@ -37,6 +37,8 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    # Project-level hooks (SQLite connection profile)
+    'ReservO',
     'accounts',
     'bookings',
     'dashboard',
@@ -44,6 +46,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Opt-in; removes itself from the chain unless REQUEST_METRICS_ENABLED
+    'dashboard.instrumentation.RequestMetricsMiddleware',
+    # Read-your-writes pinning; removes itself unless a replica is configured
+    'ReservO.db.ReplicaPinMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -59,8 +65,15 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Compiled templates are kept per process (Django's autoreloader
+            # still resets them in development when a template changes).
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -86,10 +99,97 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Reuse connections across requests (pragmas then run once per
+        # connection, not per request); a dead one is replaced on checkout.
+        'CONN_MAX_AGE': int(os.environ.get('RESERVO_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # BEGIN IMMEDIATE takes SQLite's write lock up front, so the
+            # check-then-insert in booking writes cannot interleave.
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
+        'TEST': {
+            # A file (not shared-cache memory) database so concurrency tests
+            # exercise real SQLite locking.
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
     }
 }
 
 
+# Optional read replica for @use_replica views (ReservO/db.py): point
+# RESERVO_DB_REPLICA at a second SQLite file and keep it in sync with
+# `manage.py sync_replica --interval 5` (REPLICA_SYNC_INTERVAL).
+DATABASE_REPLICA = os.environ.get('RESERVO_DB_REPLICA')
+if DATABASE_REPLICA:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': DATABASE_REPLICA,
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['ReservO.db.PrimaryReplicaRouter']
+# Seconds between replica syncs
+REPLICA_SYNC_INTERVAL = 5
+# Seconds a client keeps reading from the primary after it writes. A write
+# can land just after a sync starts, so the replica only has it once the
+# following sync finishes: one interval plus the copy time, with headroom.
+REPLICA_PIN_SECONDS = 2 * REPLICA_SYNC_INTERVAL
+
+
+# SQLite production profile (synchronous=NORMAL, mmap, cache, busy timeout),
+# see ReservO/sqlite.py. Set RESERVO_SQLITE_PROFILE=0 to disable.
+SQLITE_PROFILE_ENABLED = os.environ.get('RESERVO_SQLITE_PROFILE', '1') == '1'
+SQLITE_PRAGMAS = {}  # per-pragma overrides, e.g. {'mmap_size': 0}
+# Journal mode to set on connect, e.g. WAL in production. SQLite stores it in
+# the database file, so it persists after the process exits; unset, the
+# file's own mode (the checked-in db.sqlite3 uses DELETE) is left alone.
+SQLITE_JOURNAL_MODE = os.environ.get('RESERVO_SQLITE_JOURNAL_MODE') or None
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Local-memory by default, which is only coherent for a single process: the
+# version counters that invalidate cached data are bumped in the writing
+# process only. Any multi-process deployment must set RESERVO_REDIS_URL
+# (requires the redis package) so every worker shares them.
+SHARED_CACHE_URL = os.environ.get('RESERVO_REDIS_URL')
+# Lifetime of versioned {% cache %} fragments (room cards, room list). Without
+# a shared cache this also bounds how long another worker can serve a card
+# edited elsewhere, so it is kept short.
+FRAGMENT_TIMEOUT = 24 * 60 * 60 if SHARED_CACHE_URL else 5 * 60
+
+if SHARED_CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': SHARED_CACHE_URL,
+            'KEY_PREFIX': 'reservo',
+        },
+        'fragments': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': SHARED_CACHE_URL,
+            'KEY_PREFIX': 'reservo-fragments',
+            'TIMEOUT': FRAGMENT_TIMEOUT,
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'reservo',
+        },
+        # {% cache %} fragments (room cards, room list, home page); keys are
+        # versioned, so stale entries are simply never read again and culled.
+        'fragments': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'reservo-fragments',
+            'TIMEOUT': FRAGMENT_TIMEOUT,
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        },
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -130,3 +230,13 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Request metrics (per-view latency, SQL and template timings)
+# Enable with RESERVO_REQUEST_METRICS=1; each process writes its snapshot to REQUEST_METRICS_DIR
+
+REQUEST_METRICS_ENABLED = os.environ.get('RESERVO_REQUEST_METRICS') == '1'
+REQUEST_METRICS_BUFFER_SIZE = 1000  # samples kept per endpoint
+REQUEST_METRICS_DIR = os.path.join(BASE_DIR, 'request_metrics')
+# Snapshots not rewritten for this long (seconds) belong to workers that have exited; they are pruned
+REQUEST_METRICS_SNAPSHOT_TTL = 15 * 60
@@ -0,0 +1,54 @@
+# ReservO/sqlite.py
+"""
+SQLite production profile, applied to every new connection through the
+connection_created signal (connected in ReservO.apps).
+
+NORMAL sync is durable under WAL except on power loss, and the
+memory-mapped I/O and larger page cache keep the hot booking and occupancy
+pages in memory. These pragmas only last as long as the connection.
+Override single pragmas with settings.SQLITE_PRAGMAS or switch the profile
+off with settings.SQLITE_PROFILE_ENABLED = False.
+
+The journal mode is different: SQLite stores it in the database file
+itself. It is only set when settings.SQLITE_JOURNAL_MODE asks for it
+(RESERVO_SQLITE_JOURNAL_MODE=WAL in production, so readers run while a
+booking write commits). A file switched to WAL stays in WAL, with -wal
+and -shm files next to it, until it is switched back with
+PRAGMA journal_mode = DELETE. Without the setting a checked-in or copied
+database is never rewritten just by connecting to it.
+"""
+from django.conf import settings
+
+# Journal mode of the production profile; see SQLITE_JOURNAL_MODE
+PROFILE_JOURNAL_MODE = "WAL"
+
+SQLITE_PRAGMAS = {
+    "synchronous": "NORMAL",
+    "busy_timeout": 20000,  # ms; same as the sqlite3 "timeout" option in DATABASES
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64000,  # negative = KiB, i.e. 64 MB per connection
+    "temp_store": "MEMORY",
+}
+
+
+def profile_pragmas():
+    """The pragmas run on each new connection: the journal mode (if configured) first, then the rest."""
+    journal_mode = getattr(settings, "SQLITE_JOURNAL_MODE", None)
+    return {
+        **({"journal_mode": journal_mode} if journal_mode else {}),
+        **SQLITE_PRAGMAS,
+        **getattr(settings, "SQLITE_PRAGMAS", {}),
+    }
+
+
+def apply_pragmas(dbapi_connection, pragmas):
+    """Run PRAGMA statements on a raw sqlite3 connection."""
+    for name, value in pragmas.items():
+        dbapi_connection.execute(f"PRAGMA {name} = {value}")
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != "sqlite" or not getattr(settings, "SQLITE_PROFILE_ENABLED", True):
+        return
+    # On the raw connection, so the pragmas stay out of query logs and request metrics
+    apply_pragmas(connection.connection, profile_pragmas())
@@ -0,0 +1,144 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections, router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from bookings.models import Booking
+from ReservO.checks import check_shared_cache
+from ReservO.sqlite import SQLITE_PRAGMAS
+from ReservO.db import (
+    PIN_COOKIE, REPLICA_ALIAS, ReplicaPinMiddleware, pin_seconds, read_from_primary, use_replica,
+)
+
+
+def read_aliases(request):
+    """The alias each model would be read from inside this view."""
+    return HttpResponse(",".join(router.db_for_read(model) for model in (Booking, User, Session)))
+
+
+@mock.patch("ReservO.db.replica_configured", return_value=True)
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def aliases(self, request, view=read_aliases):
+        return use_replica(view)(request).content.decode().split(",")
+
+    def test_safe_requests_read_bookings_from_replica_and_auth_from_primary(self, _):
+        self.assertEqual(self.aliases(self.factory.get("/")), [REPLICA_ALIAS, "default", "default"])
+        self.assertEqual(router.db_for_write(Booking), "default")
+
+    def test_unsafe_and_pinned_requests_stay_on_primary(self, _):
+        self.assertEqual(self.aliases(self.factory.post("/")), ["default"] * 3)
+        pinned = self.factory.get("/")
+        pinned.COOKIES[PIN_COOKIE] = str(time.time() + 60)
+        self.assertEqual(self.aliases(pinned), ["default"] * 3)
+        expired = self.factory.get("/")
+        expired.COOKIES[PIN_COOKIE] = str(time.time() - 1)
+        self.assertEqual(self.aliases(expired)[0], REPLICA_ALIAS)
+
+    def test_read_from_primary_overrides_and_restores(self, _):
+        @read_from_primary()
+        def decorated():
+            return router.db_for_read(Booking)
+
+        def view(request):
+            with read_from_primary():
+                inside = router.db_for_read(Booking)
+            return HttpResponse(",".join([inside, decorated(), router.db_for_read(Booking)]))
+
+        self.assertEqual(self.aliases(self.factory.get("/"), view), ["default", "default", REPLICA_ALIAS])
+        self.assertEqual(router.db_for_read(Booking), "default")
+
+    def test_async_views_are_routed(self, _):
+        async def view(request):
+            return HttpResponse(router.db_for_read(Booking))
+
+        response = asyncio.run(use_replica(view)(self.factory.get("/")))
+        self.assertEqual(response.content.decode(), REPLICA_ALIAS)
+
+
+class ReplicaPinMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_removed_without_replica(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            ReplicaPinMiddleware(lambda request: HttpResponse())
+
+    @mock.patch("ReservO.db.replica_configured", return_value=True)
+    def test_pins_after_unsafe_requests_only(self, _):
+        middleware = ReplicaPinMiddleware(lambda request: HttpResponse())
+        self.assertNotIn(PIN_COOKIE, middleware(self.factory.get("/")).cookies)
+
+        cookie = middleware(self.factory.post("/")).cookies[PIN_COOKIE]
+        self.assertEqual(cookie["max-age"], pin_seconds())
+        self.assertAlmostEqual(float(cookie.value), time.time() + pin_seconds(), delta=2)
+
+    def test_pin_outlasts_a_sync_interval(self):
+        self.assertGreater(pin_seconds(), settings.REPLICA_SYNC_INTERVAL)
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    def test_warns_about_process_local_caches(self):
+        self.assertEqual({warning.id for warning in check_shared_cache(None)}, {"ReservO.W001"})
+
+    @override_settings(CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://cache:6379"},
+    })
+    def test_shared_cache_passes(self):
+        self.assertEqual(check_shared_cache(None), [])
+
+
+class SqliteProfileTests(SimpleTestCase):
+    # Scratch files only, but opening any connection needs the database guard lifted
+    databases = {DEFAULT_DB_ALIAS}
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.path = os.path.join(directory, "profile.sqlite3")
+
+    def connect(self):
+        """A fresh connection wrapper for a scratch file; opening it sends connection_created."""
+        default = connections[DEFAULT_DB_ALIAS]
+        wrapper = type(default)({**default.settings_dict, "NAME": self.path}, alias=DEFAULT_DB_ALIAS)
+        wrapper.ensure_connection()
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def pragmas(self, wrapper):
+        return {
+            name: wrapper.connection.execute(f"PRAGMA {name}").fetchone()[0]
+            for name in ("journal_mode", "synchronous", "busy_timeout", "mmap_size", "cache_size", "temp_store")
+        }
+
+    def test_profile_applied_on_connect_without_touching_the_journal_mode(self):
+        self.assertEqual(self.pragmas(self.connect()), {
+            "journal_mode": "delete", "synchronous": 1, "busy_timeout": SQLITE_PRAGMAS["busy_timeout"],
+            "mmap_size": SQLITE_PRAGMAS["mmap_size"], "cache_size": SQLITE_PRAGMAS["cache_size"], "temp_store": 2,
+        })
+
+    @override_settings(SQLITE_JOURNAL_MODE="WAL", SQLITE_PRAGMAS={"mmap_size": 0})
+    def test_configured_journal_mode_and_overrides(self):
+        pragmas = self.pragmas(self.connect())
+        self.assertEqual((pragmas["journal_mode"], pragmas["mmap_size"]), ("wal", 0))
+
+    @override_settings(SQLITE_PROFILE_ENABLED=False, SQLITE_JOURNAL_MODE="WAL")
+    def test_disabled_profile_leaves_sqlite_defaults(self):
+        pragmas = self.pragmas(self.connect())
+        # The sqlite3 "timeout" option still sets the busy timeout
+        self.assertEqual(
+            (pragmas["journal_mode"], pragmas["synchronous"], pragmas["mmap_size"], pragmas["cache_size"]),
+            ("delete", 2, 0, -2000),
+        )
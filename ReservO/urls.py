@@ -19,6 +19,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from bookings import views as booking_views
 from . import views
 urlpatterns = [
     path('', views.home, name='home'),
@@ -27,6 +28,7 @@ urlpatterns = [
     path('bookings/', include('bookings.urls', namespace='bookings')),
     path('dashboard/', include('dashboard.urls')),
     path('rooms/', include('rooms.urls')),
+    path('api/availability', booking_views.availability_api, name='api-availability'),
     
 ]
 if settings.DEBUG:
@@ -5,6 +5,7 @@ from django.contrib.auth.decorators import login_required
 
 from .forms import UserRegistrationForm
 from bookings.models import Booking
+from ReservO.db import use_replica
 
 User= get_user_model()
 def register_view(request):
@@ -53,7 +54,8 @@ def logout_view(request):
     return redirect("accounts:login")
 
 
+@use_replica
 @login_required
 def profile_view(request):
-    my_bookings = Booking.objects.filter(user=request.user).select_related("room")
+    my_bookings = Booking.objects.for_listing().filter(user=request.user)
     return render(request, "accounts/profile.html", {"bookings": my_bookings})
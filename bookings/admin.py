@@ -1,5 +1,6 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from .models import Booking
+from .transitions import bulk_transition
 
 @admin.register(Booking)
 class BookingAdmin(admin.ModelAdmin):
@@ -12,10 +13,19 @@ class BookingAdmin(admin.ModelAdmin):
 
     @admin.action(description="Mark selected bookings as Approved")
     def mark_approved(self, request, queryset):
-        updated = queryset.update(status=Booking.STATUS_APPROVED)
-        self.message_user(request, f"{updated} booking(s) marked as Approved.")
+        self._set_status(request, queryset, Booking.STATUS_APPROVED)
 
     @admin.action(description="Mark selected bookings as Declined")
     def mark_declined(self, request, queryset):
-        updated = queryset.update(status=Booking.STATUS_DECLINED)
-        self.message_user(request, f"{updated} booking(s) marked as Declined.")
+        self._set_status(request, queryset, Booking.STATUS_DECLINED)
+
+    def _set_status(self, request, queryset, status):
+        # Batched write that also keeps occupancy, stats and the availability index in sync
+        results = bulk_transition(queryset.values_list("pk", flat=True), status)
+        updated = sum(1 for result in results.values() if result["success"])
+        self.message_user(request, f"{updated} booking(s) marked as {status}.")
+
+        failed = {pk: result["error"] for pk, result in results.items() if not result["success"]}
+        if failed:
+            details = "; ".join(f"#{pk}: {error}" for pk, error in failed.items())
+            self.message_user(request, f"{len(failed)} booking(s) not changed. {details}", messages.WARNING)
@@ -0,0 +1,197 @@
+# bookings/availability.py
+import threading
+from bisect import bisect_left, insort
+
+from django.core.cache import cache
+
+from ReservO.db import read_from_primary
+from .models import Booking
+
+# Shared generation key: bumped whenever the index must be reloaded by every process
+INDEX_GENERATION_KEY = "bookings:availability-index:generation"
+
+
+class RoomIntervals:
+    """
+    Sorted booking intervals for a single room.
+    Intervals are kept ordered by check_in; a prefix max of check_out is rebuilt
+    lazily after a change so that a lookup is a single bisect.
+    """
+
+    def __init__(self):
+        self.intervals = []  # (check_in, check_out, booking_id), sorted
+        self._starts = []
+        self._max_ends = []
+        self._dirty = False
+
+    def __len__(self):
+        return len(self.intervals)
+
+    def add(self, check_in, check_out, booking_id):
+        insort(self.intervals, (check_in, check_out, booking_id))
+        self._dirty = True
+
+    def remove(self, booking_id):
+        before = len(self.intervals)
+        self.intervals = [iv for iv in self.intervals if iv[2] != booking_id]
+        if len(self.intervals) != before:
+            self._dirty = True
+
+    def _rebuild(self):
+        self._starts = [iv[0] for iv in self.intervals]
+        self._max_ends = []
+        current = None
+        for iv in self.intervals:
+            current = iv[1] if current is None or iv[1] > current else current
+            self._max_ends.append(current)
+        self._dirty = False
+
+    def is_free(self, check_in, check_out):
+        """
+        Overlap condition (same as bookings_conflict):
+            existing.check_in < check_out AND existing.check_out > check_in
+        Every interval starting before check_out is left of the bisect point,
+        so the room is free when none of them ends after check_in.
+        """
+        if self._dirty:
+            self._rebuild()
+        idx = bisect_left(self._starts, check_out)
+        return idx == 0 or self._max_ends[idx - 1] <= check_in
+
+
+class AvailabilityIndex:
+    """
+    In-process availability engine: one RoomIntervals per room covering
+    every non-declined booking.
+
+    The index is loaded lazily with a single query and kept current by the
+    Booking signals in bookings/signals.py. Other processes (or the
+    rebuild_availability_index command) force a reload by bumping the shared
+    generation stored in the cache, so with several worker processes the
+    default cache must be shared (RESERVO_REDIS_URL; see the ReservO.W001
+    deploy check). With a per-process cache each worker only sees its own
+    writes.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rooms = None
+        self._booking_rooms = {}
+        self._generation = None
+
+    # -----------------------------
+    # LOADING
+    # -----------------------------
+    def _current_generation(self):
+        return cache.get(INDEX_GENERATION_KEY, 0)
+
+    def _ensure_loaded(self):
+        generation = self._current_generation()
+        if self._rooms is None or generation != self._generation:
+            self.rebuild(generation=generation)
+
+    @read_from_primary()
+    def rebuild(self, generation=None):
+        """Reload every non-declined booking from the primary database."""
+        rows = (
+            Booking.objects.exclude(status=Booking.STATUS_DECLINED)
+            .order_by()
+            .values_list("room_id", "check_in", "check_out", "id")
+        )
+        rooms = {}
+        booking_rooms = {}
+        for room_id, check_in, check_out, booking_id in rows.iterator(chunk_size=5000):
+            rooms.setdefault(room_id, RoomIntervals()).intervals.append((check_in, check_out, booking_id))
+            booking_rooms[booking_id] = room_id
+        for intervals in rooms.values():
+            intervals.intervals.sort()
+            intervals._dirty = True
+
+        with self._lock:
+            self._rooms = rooms
+            self._booking_rooms = booking_rooms
+            self._generation = self._current_generation() if generation is None else generation
+        return sum(len(iv) for iv in rooms.values())
+
+    def _bump_generation(self):
+        try:
+            return cache.incr(INDEX_GENERATION_KEY)
+        except ValueError:
+            cache.set(INDEX_GENERATION_KEY, 1, None)
+            return 1
+
+    def invalidate(self):
+        """Drop the local copy and tell every other process to reload."""
+        self._bump_generation()
+        with self._lock:
+            self._rooms = None
+
+    def _publish_change(self):
+        # Called with the lock held after a local update. If another process
+        # changed bookings since our last load we cannot trust the local copy.
+        generation = self._bump_generation()
+        if self._generation is not None and generation == self._generation + 1:
+            self._generation = generation
+        else:
+            self._rooms = None
+
+    # -----------------------------
+    # INCREMENTAL UPDATES
+    # -----------------------------
+    def _discard(self, booking_id):
+        room_id = self._booking_rooms.pop(booking_id, None)
+        if room_id is not None:
+            self._rooms[room_id].remove(booking_id)
+
+    def update_booking(self, booking):
+        self.update_bookings([booking])
+
+    def update_bookings(self, bookings):
+        """Batch form of update_booking(): one generation bump for the whole batch."""
+        with self._lock:
+            if self._rooms is not None:
+                for booking in bookings:
+                    self._discard(booking.pk)
+                    if booking.status != Booking.STATUS_DECLINED:
+                        self._rooms.setdefault(booking.room_id, RoomIntervals()).add(
+                            booking.check_in, booking.check_out, booking.pk
+                        )
+                        self._booking_rooms[booking.pk] = booking.room_id
+            self._publish_change()
+
+    def remove_booking(self, booking_id):
+        with self._lock:
+            if self._rooms is not None:
+                self._discard(booking_id)
+            self._publish_change()
+
+    # -----------------------------
+    # QUERIES
+    # -----------------------------
+    def is_free(self, room_id, check_in, check_out):
+        with self._lock:
+            self._ensure_loaded()
+            intervals = self._rooms.get(room_id)
+            return intervals is None or intervals.is_free(check_in, check_out)
+
+    def free_room_ids(self, room_ids, check_in, check_out):
+        """Return the subset of room_ids free for [check_in, check_out), keeping order."""
+        with self._lock:
+            self._ensure_loaded()
+            free = []
+            for room_id in room_ids:
+                intervals = self._rooms.get(room_id)
+                if intervals is None or intervals.is_free(check_in, check_out):
+                    free.append(room_id)
+            return free
+
+    def stats(self):
+        with self._lock:
+            self._ensure_loaded()
+            return {
+                "rooms": len(self._rooms),
+                "bookings": sum(len(iv) for iv in self._rooms.values()),
+            }
+
+
+availability_index = AvailabilityIndex()
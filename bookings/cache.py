@@ -0,0 +1,39 @@
+# bookings/cache.py
+import threading
+
+from django.core.cache import cache
+
+# Bumped after every committed Booking write (signals, bulk transitions,
+# imports). Anything derived from bookings can embed it in a cache key or
+# an ETag and becomes stale the moment a booking changes.
+BOOKINGS_VERSION_KEY = "bookings:version"
+
+# Striped locks for get_or_build(): bounded, and keys rarely share a stripe
+_BUILD_LOCKS = [threading.Lock() for _ in range(64)]
+
+
+def bookings_version():
+    return cache.get_or_set(BOOKINGS_VERSION_KEY, 1, None)
+
+
+def bump_bookings_version():
+    try:
+        return cache.incr(BOOKINGS_VERSION_KEY)
+    except ValueError:
+        cache.set(BOOKINGS_VERSION_KEY, 2, None)
+        return 2
+
+
+def get_or_build(key, builder, timeout):
+    """
+    Like cache.get_or_set(), but concurrent misses for the same key in this
+    process wait for the first builder instead of all hitting the database.
+    """
+    value = cache.get(key)
+    if value is None:
+        with _BUILD_LOCKS[hash(key) % len(_BUILD_LOCKS)]:
+            value = cache.get(key)
+            if value is None:
+                value = builder()
+                cache.set(key, value, timeout)
+    return value
@@ -0,0 +1,71 @@
+# bookings/export.py
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Booking
+
+# (column name, ORM path) for every exported field, in output order
+EXPORT_COLUMNS = [
+    ("id", "id"),
+    ("created_at", "created_at"),
+    ("user", "user__username"),
+    ("email", "user__email"),
+    ("room", "room__room_number"),
+    ("room_type", "room__room_type"),
+    ("check_in", "check_in"),
+    ("check_out", "check_out"),
+    ("guests", "guests"),
+    ("total_price", "total_price"),
+    ("status", "status"),
+]
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+CHUNK_SIZE = 2000
+
+
+def export_rows(status=None, start=None, end=None, since=None, chunk_size=CHUNK_SIZE):
+    """
+    Stream booking rows (joined with room and user) as tuples, oldest first.
+    start/end filter on check_in (inclusive); since is a created_at
+    watermark for incremental exports (strictly after).
+    Uses values_list() + iterator() so memory stays flat regardless of size.
+    """
+    qs = Booking.objects.all()
+    if status:
+        qs = qs.filter(status=status)
+    if start:
+        qs = qs.filter(check_in__gte=start)
+    if end:
+        qs = qs.filter(check_in__lte=end)
+    if since:
+        qs = qs.filter(created_at__gt=since)
+    qs = qs.order_by("created_at", "id").values_list(*(path for _, path in EXPORT_COLUMNS))
+    return qs.iterator(chunk_size=chunk_size)
+
+
+class Echo:
+    """File-like object that hands back whatever csv.writer writes to it."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow([name for name, _ in EXPORT_COLUMNS])
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def iter_ndjson(rows):
+    names = [name for name, _ in EXPORT_COLUMNS]
+    for row in rows:
+        yield json.dumps(dict(zip(names, row)), cls=DjangoJSONEncoder) + "\n"
+
+
+def iter_export(export_format, rows):
+    return iter_csv(rows) if export_format == "csv" else iter_ndjson(rows)
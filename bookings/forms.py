@@ -1,6 +1,7 @@
 from django import forms
 from .models import Booking
 from rooms.models import Room
+from rooms.cache import room_choices, room_type_choices
 from datetime import date
 
 
@@ -35,8 +36,8 @@ class SearchAvailabilityForm(forms.Form):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        # Fetch DISTINCT room types dynamically from Room model
-        room_types = Room.objects.values_list("room_type", flat=True).distinct()
+        # DISTINCT room types, served from the versioned room catalog cache
+        room_types = room_type_choices()
 
         # Build dropdown choices
         choices = [("", "Any Room Type")] + [(rt, rt.title()) for rt in room_types]
@@ -47,10 +48,20 @@ class SearchAvailabilityForm(forms.Form):
 # ---------------------------------------------------------
 # BOOKING FORM
 # ---------------------------------------------------------
+class RoomChoiceField(forms.ModelChoiceField):
+    """ModelChoiceField that resolves the pk of an already loaded (locked) room without a query."""
+    loaded = None
+
+    def to_python(self, value):
+        if self.loaded is not None and value not in self.empty_values and str(value) == str(self.loaded.pk):
+            return self.loaded
+        return super().to_python(value)
+
+
 class BookingForm(forms.ModelForm):
 
     # Apply styling to room dropdown
-    room = forms.ModelChoiceField(
+    room = RoomChoiceField(
         queryset=Room.objects.all(),
         empty_label="Select a Room",
         widget=forms.Select(attrs={
@@ -93,6 +104,25 @@ class BookingForm(forms.ModelForm):
                                                     }),
         }
 
+    def __init__(self, *args, room=None, **kwargs):
+        """
+        `room` is the Room the view already loaded (and locked) for the
+        submitted pk; validation then reuses it instead of selecting it again.
+        """
+        super().__init__(*args, **kwargs)
+
+        # Render the dropdown from the cached catalog; validation still
+        # resolves the submitted pk through the queryset.
+        self.fields["room"].choices = [("", self.fields["room"].empty_label)] + room_choices()
+        self.fields["room"].loaded = room
+
+    def _get_validation_exclusions(self):
+        exclude = super()._get_validation_exclusions()
+        # A locked room was just read from the database: skip the model's FK-exists query
+        if self.fields["room"].loaded is not None and self.cleaned_data.get("room") is self.fields["room"].loaded:
+            exclude.add("room")
+        return exclude
+
     # Date validation
 
     def clean(self):
@@ -115,3 +145,96 @@ class BookingForm(forms.ModelForm):
 
         return cleaned
 
+
+
+# ---------------------------------------------------------
+# BOOKING LIST FILTERS
+# ---------------------------------------------------------
+class BookingFilterForm(forms.Form):
+    status = forms.ChoiceField(
+        required=False,
+        choices=[("", "Any Status")] + Booking.STATUS_CHOICES,
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    room = forms.TypedChoiceField(
+        required=False,
+        coerce=int,
+        empty_value=None,
+        choices=[],
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    date_from = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={"type": "date", "class": "form-control"}),
+    )
+    date_to = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={"type": "date", "class": "form-control"}),
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["room"].choices = [("", "Any Room")] + room_choices()
+
+    def filter(self, queryset):
+        """Apply the valid filters to a Booking queryset (check-in date range is inclusive)."""
+        if not self.is_valid():
+            return queryset
+        data = self.cleaned_data
+        if data.get("status"):
+            queryset = queryset.filter(status=data["status"])
+        if data.get("room"):
+            queryset = queryset.filter(room_id=data["room"])
+        if data.get("date_from"):
+            queryset = queryset.filter(check_in__gte=data["date_from"])
+        if data.get("date_to"):
+            queryset = queryset.filter(check_in__lte=data["date_to"])
+        return queryset
+
+
+# ---------------------------------------------------------
+# EXPORT FILTERS
+# ---------------------------------------------------------
+class BookingExportForm(forms.Form):
+    format = forms.ChoiceField(choices=[("csv", "CSV"), ("ndjson", "NDJSON")], required=False)
+    status = forms.ChoiceField(choices=[("", "Any Status")] + Booking.STATUS_CHOICES, required=False)
+    start = forms.DateField(required=False)
+    end = forms.DateField(required=False)
+    since = forms.DateTimeField(required=False)
+
+    def clean(self):
+        cleaned = super().clean()
+        if cleaned.get("start") and cleaned.get("end") and cleaned["start"] > cleaned["end"]:
+            raise forms.ValidationError("start must not be after end.")
+        cleaned["format"] = cleaned.get("format") or "csv"
+        return cleaned
+
+
+# ---------------------------------------------------------
+# CALENDAR FORM
+# ---------------------------------------------------------
+class CalendarForm(forms.Form):
+    start = forms.DateField(required=False)
+    days = forms.IntegerField(min_value=1, max_value=90, required=False)
+
+    def clean(self):
+        cleaned = super().clean()
+        cleaned["start"] = cleaned.get("start") or date.today()
+        cleaned["days"] = cleaned.get("days") or 30
+        return cleaned
+
+
+# ---------------------------------------------------------
+# PUBLIC AVAILABILITY API
+# ---------------------------------------------------------
+class AvailabilityQueryForm(forms.Form):
+    check_in = forms.DateField()
+    check_out = forms.DateField()
+    room_type = forms.CharField(required=False)
+    guests = forms.IntegerField(min_value=1, required=False)
+
+    def clean(self):
+        cleaned = super().clean()
+        if cleaned.get("check_in") and cleaned.get("check_out") and cleaned["check_in"] >= cleaned["check_out"]:
+            raise forms.ValidationError("check_out must be after check_in.")
+        return cleaned
@@ -0,0 +1,86 @@
+# bookings/grid.py
+from array import array
+from datetime import timedelta
+from itertools import groupby
+
+from rooms.cache import cached_catalog
+from rooms.models import Room
+from .models import Booking
+
+# Every span in the JSON is a list in this order
+SPAN_FIELDS = ["offset", "length", "booking", "status"]
+
+
+def calendar_rooms():
+    """(id, room_number, room_type, status) for every room, cached with the catalog."""
+    return cached_catalog(
+        "calendar-rooms",
+        lambda: list(Room.objects.values_list("id", "room_number", "room_type", "status")),
+    )
+
+
+def window_bookings(start, days):
+    """Non-declined bookings overlapping [start, start + days) as (id, room_id, check_in, check_out, status)."""
+    end = start + timedelta(days=days)
+    return (
+        Booking.objects.filter(check_in__lt=end, check_out__gt=start)
+        .exclude(status=Booking.STATUS_DECLINED)
+        .order_by("check_in", "id")
+        .values_list("id", "room_id", "check_in", "check_out", "status")
+    )
+
+
+def occupancy_grid(room_ids, start, days, bookings=None):
+    """
+    Room x night matrix for [start, start + days).
+    Returns ({room_id: array of slots}, bookings) where a slot is 0 for a free
+    night or i + 1 for bookings[i]. All overlapping bookings are fetched in
+    one query (unless already given) and each one fills its row with a
+    single slice assignment.
+    """
+    if bookings is None:
+        bookings = list(window_bookings(start, days))
+    grid = {room_id: array("l", [0]) * days for room_id in room_ids}
+    for slot, (_, room_id, check_in, check_out, _) in enumerate(bookings, start=1):
+        row = grid.get(room_id)
+        if row is None:
+            continue
+        first = max((check_in - start).days, 0)
+        last = min((check_out - start).days, days)
+        row[first:last] = array("l", [slot]) * (last - first)
+    return grid, bookings
+
+
+def run_length_spans(row, bookings):
+    """Collapse a grid row into [offset, length, booking id, status] spans of occupied nights."""
+    spans = []
+    offset = 0
+    for slot, run in groupby(row):
+        length = sum(1 for _ in run)
+        if slot:
+            booking_id, _, _, _, status = bookings[slot - 1]
+            spans.append([offset, length, booking_id, status])
+        offset += length
+    return spans
+
+
+def calendar_payload(start, days, rooms=None, bookings=None):
+    if rooms is None:
+        rooms = calendar_rooms()
+    grid, bookings = occupancy_grid([room[0] for room in rooms], start, days, bookings)
+    return {
+        "start": start.isoformat(),
+        "end": (start + timedelta(days=days)).isoformat(),
+        "days": days,
+        "span_fields": SPAN_FIELDS,
+        "rooms": [
+            {
+                "id": room_id,
+                "number": number,
+                "type": room_type,
+                "status": status,
+                "spans": run_length_spans(grid[room_id], bookings),
+            }
+            for room_id, number, room_type, status in rooms
+        ],
+    }
@@ -0,0 +1,210 @@
+# bookings/importer.py
+import csv
+import json
+from collections import defaultdict
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils.dateparse import parse_date
+
+from rooms.models import Room
+from rooms.rates import quote_stay
+from .availability import RoomIntervals, availability_index
+from .cache import bump_bookings_version
+from .models import Booking, RoomNight
+from .occupancy import stay_nights
+from .utils import UNAVAILABLE_ROOM_STATUSES, lock_rooms
+
+IMPORT_FIELDS = ["user", "room", "check_in", "check_out", "guests", "status", "total_price", "notes"]
+VALID_STATUSES = {value for value, _ in Booking.STATUS_CHOICES}
+
+
+class RowError(ValueError):
+    pass
+
+
+@dataclass
+class ImportResult:
+    imported: int = 0
+    rejects: list = field(default_factory=list)  # (line, row dict, reason)
+
+
+def read_rows(stream, input_format):
+    """
+    Yield (line number, row) from CSV, NDJSON or a JSON array. Input that is
+    not valid JSON is yielded as a RowError in place of the row, so it lands
+    in the reject report like any other bad row.
+    """
+    if input_format == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif input_format == "ndjson":
+        for line_number, line in enumerate(stream, start=1):
+            if line.strip():
+                yield line_number, _load_json(line)
+    else:
+        rows = _load_json(stream.read())
+        if isinstance(rows, RowError):
+            yield 1, rows
+        elif not isinstance(rows, list):
+            yield 1, RowError("A JSON import must be an array of objects.")
+        else:
+            yield from enumerate(rows, start=1)
+
+
+def _load_json(text):
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as exc:
+        return RowError(f"Invalid JSON: {exc.msg} (line {exc.lineno}, column {exc.colno}).")
+
+
+def _parse_row(row, rooms, users):
+    """Validate one row against the in-memory room/user maps; returns a Booking (unsaved)."""
+    if isinstance(row, RowError):
+        raise row
+    if not isinstance(row, dict):
+        raise RowError("Each row must be a JSON object.")
+    room = rooms.get(str(row.get("room") or "").strip())
+    if room is None:
+        raise RowError(f"Unknown room {row.get('room')!r}.")
+    user_id = users.get(str(row.get("user") or "").strip())
+    if user_id is None:
+        raise RowError(f"Unknown user {row.get('user')!r}.")
+
+    check_in = parse_date(str(row.get("check_in") or ""))
+    check_out = parse_date(str(row.get("check_out") or ""))
+    if check_in is None or check_out is None:
+        raise RowError("check_in and check_out must be YYYY-MM-DD dates.")
+    if check_in >= check_out:
+        raise RowError("Check-in date must be before check-out date.")
+
+    try:
+        guests = int(row.get("guests") or 1)
+    except (TypeError, ValueError):
+        raise RowError(f"Invalid guests {row.get('guests')!r}.")
+    if guests < 1 or guests > room.capacity:
+        raise RowError(f"Number of guests ({guests}) exceeds room capacity ({room.capacity}).")
+
+    status = row.get("status") or Booking.STATUS_PENDING
+    if not isinstance(status, str) or status not in VALID_STATUSES:
+        raise RowError(f"Invalid status {status!r}.")
+    if room.status in UNAVAILABLE_ROOM_STATUSES and status != Booking.STATUS_DECLINED:
+        raise RowError("Room is unavailable (maintenance or out of service).")
+
+    try:
+        total_price = Decimal(row["total_price"]) if row.get("total_price") not in (None, "") else quote_stay(room, check_in, check_out)
+    except (InvalidOperation, TypeError, ValueError):
+        raise RowError(f"Invalid total_price {row.get('total_price')!r}.")
+
+    return Booking(
+        user_id=user_id, room_id=room.pk, check_in=check_in, check_out=check_out,
+        guests=guests, status=status, total_price=total_price, notes=str(row.get("notes") or ""),
+    )
+
+
+def _sweep_overlaps(candidates):
+    """
+    Per-room sort-and-sweep. `candidates` is a list of (line, row, booking).
+    Existing non-declined bookings of the affected rooms come from one
+    query; file rows are sorted by check-in so an overlap with an earlier
+    accepted row is just a comparison with the running max check-out.
+    Returns (accepted bookings, rejects).
+    """
+    blocking = [c for c in candidates if c[2].status != Booking.STATUS_DECLINED]
+    accepted = [c[2] for c in candidates if c[2].status == Booking.STATUS_DECLINED]
+    rejects = []
+    if not blocking:
+        return accepted, rejects
+
+    existing = defaultdict(RoomIntervals)
+    rows = (
+        Booking.objects.filter(
+            room_id__in={c[2].room_id for c in blocking},
+            check_in__lt=max(c[2].check_out for c in blocking),
+            check_out__gt=min(c[2].check_in for c in blocking),
+        )
+        .exclude(status=Booking.STATUS_DECLINED)
+        .order_by()
+        .values_list("room_id", "check_in", "check_out", "id")
+    )
+    for room_id, check_in, check_out, booking_id in rows.iterator(chunk_size=5000):
+        existing[room_id].add(check_in, check_out, booking_id)
+
+    by_room = defaultdict(list)
+    for candidate in blocking:
+        by_room[candidate[2].room_id].append(candidate)
+
+    for room_id, room_candidates in by_room.items():
+        room_candidates.sort(key=lambda c: (c[2].check_in, c[2].check_out, c[0]))
+        intervals = existing.get(room_id)
+        last_check_out = None
+        for line, row, booking in room_candidates:
+            if intervals is not None and not intervals.is_free(booking.check_in, booking.check_out):
+                rejects.append((line, row, "Room is already booked for these dates."))
+            elif last_check_out is not None and booking.check_in < last_check_out:
+                rejects.append((line, row, "Overlaps an earlier row in this file."))
+            else:
+                accepted.append(booking)
+                last_check_out = booking.check_out
+    return accepted, rejects
+
+
+def import_bookings(rows, batch_size=2000, dry_run=False):
+    """
+    Validate and insert bookings from an iterable of (line, row dict).
+    Rooms and users are resolved from in-memory maps, overlaps are found
+    with a per-room sweep, and rows are written with bulk_create() in
+    chunks. The sweep and the inserts share one transaction holding the
+    same room locks as booking_create (on SQLite the IMMEDIATE transaction
+    is the lock), so nothing can be booked between the check and the write.
+    Occupancy nights, dashboard stats and the availability index are synced
+    in bulk afterwards.
+    """
+    from dashboard.stats import apply_booking_changes, make_facts  # dashboard depends on bookings
+
+    rooms = {room.room_number: room for room in Room.objects.all()}
+    users = dict(get_user_model().objects.values_list("username", "id"))
+    result = ImportResult()
+
+    candidates = []
+    for line, row in rows:
+        try:
+            candidates.append((line, row, _parse_row(row, rooms, users)))
+        except RowError as exc:
+            result.rejects.append((line, row if isinstance(row, dict) else {}, str(exc)))
+
+    def sweep():
+        accepted, overlap_rejects = _sweep_overlaps(candidates)
+        result.rejects.extend(overlap_rejects)
+        result.rejects.sort(key=lambda reject: reject[0])
+        return accepted
+
+    if dry_run:
+        result.imported = len(sweep())
+        return result
+
+    room_types = {room.pk: room.room_type for room in rooms.values()}
+    with transaction.atomic():
+        lock_rooms({c[2].room_id for c in candidates})
+        accepted = sweep()
+        for start in range(0, len(accepted), batch_size):
+            chunk = Booking.objects.bulk_create(accepted[start:start + batch_size])
+            RoomNight.objects.bulk_create(
+                RoomNight(room_id=b.room_id, booking_id=b.pk, date=night)
+                for b in chunk
+                if b.status != Booking.STATUS_DECLINED
+                for night in stay_nights(b.check_in, b.check_out)
+            )
+            result.imported += len(chunk)
+        # bulk_create() sends no signals: feed the dashboard all deltas at once
+        apply_booking_changes([
+            (None, make_facts(b.check_in, b.check_out, b.status, room_types[b.room_id], b.total_price))
+            for b in accepted
+        ])
+        transaction.on_commit(availability_index.invalidate)
+        transaction.on_commit(bump_bookings_version)
+    return result
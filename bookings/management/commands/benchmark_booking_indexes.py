@@ -0,0 +1,160 @@
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from bookings.models import Booking
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a standalone SQLite database with synthetic bookings and show the query plans "
+        "and latencies of the hot Booking queries before and after the Meta indexes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000, help="Number of bookings to seed.")
+        parser.add_argument("--rooms", type=int, default=300)
+        parser.add_argument("--users", type=int, default=5000)
+        parser.add_argument("--repeat", type=int, default=200, help="Executions per query when timing.")
+        parser.add_argument("--path", help="SQLite file to use (default: a temporary file, removed afterwards).")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            self.stderr.write("This benchmark generates SQLite DDL; run it with the SQLite settings.")
+            return
+
+        path = options["path"] or os.path.join(tempfile.mkdtemp(), "booking_index_bench.sqlite3")
+        keep = bool(options["path"])
+        if os.path.exists(path):
+            os.remove(path)
+
+        table_sql, index_sql = self._schema_sql()
+        db = sqlite3.connect(path)
+        try:
+            for sql in table_sql:
+                db.execute(sql)
+            self._seed(db, options)
+
+            rng = random.Random(options["seed"] + 1)
+            queries = self._queries(rng, options)
+
+            self.stdout.write(self.style.MIGRATE_HEADING("Before (foreign key indexes only)"))
+            before = self._run(db, queries, options["repeat"])
+
+            started = time.perf_counter()
+            for sql in index_sql:
+                db.execute(sql)
+            db.execute("ANALYZE")
+            db.commit()
+            self.stdout.write(f"\nCreated {len(index_sql)} index(es) in {time.perf_counter() - started:.1f}s\n")
+
+            self.stdout.write(self.style.MIGRATE_HEADING("After (Booking.Meta.indexes)"))
+            after = self._run(db, queries, options["repeat"])
+
+            self.stdout.write(self.style.MIGRATE_HEADING("\nSummary (mean ms per query)"))
+            for label in queries:
+                speedup = before[label] / after[label] if after[label] else float("inf")
+                self.stdout.write(f"  {label:<28} {before[label]:>10.3f} -> {after[label]:>9.3f}  x{speedup:.1f}")
+        finally:
+            db.close()
+            if not keep:
+                os.remove(path)
+
+    def _schema_sql(self):
+        """
+        DDL for the bookings table exactly as Django would create it, split into
+        the baseline (table + FK indexes) and the Meta indexes under test.
+        """
+        meta_index_names = {index.name for index in Booking._meta.indexes}
+        with connection.schema_editor(collect_sql=True) as editor:
+            editor.create_model(Booking)
+        table_sql, index_sql = [], []
+        for sql in editor.collected_sql:
+            sql = sql.rstrip(";")
+            if any(f'"{name}"' in sql for name in meta_index_names):
+                index_sql.append(sql)
+            else:
+                table_sql.append(sql)
+        return table_sql, index_sql
+
+    def _seed(self, db, options):
+        rng = random.Random(options["seed"])
+        statuses = [Booking.STATUS_PENDING] * 2 + [Booking.STATUS_APPROVED] * 6 + [Booking.STATUS_DECLINED] * 2
+        start = date(2020, 1, 1)
+        span = 365 * 6
+        insert = (
+            f"INSERT INTO {Booking._meta.db_table} "
+            "(user_id, room_id, check_in, check_out, guests, total_price, status, created_at, notes) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, '')"
+        )
+        started = time.perf_counter()
+        batch = []
+        for _ in range(options["rows"]):
+            check_in = start + timedelta(days=rng.randrange(span))
+            nights = rng.randint(1, 7)
+            batch.append((
+                rng.randint(1, options["users"]),
+                rng.randint(1, options["rooms"]),
+                check_in.isoformat(),
+                (check_in + timedelta(days=nights)).isoformat(),
+                rng.randint(1, 4),
+                f"{nights * 100:.2f}",
+                rng.choice(statuses),
+                f"{check_in.isoformat()} 12:00:00",
+            ))
+            if len(batch) == 50_000:
+                db.executemany(insert, batch)
+                batch = []
+        if batch:
+            db.executemany(insert, batch)
+        db.execute("ANALYZE")
+        db.commit()
+        self.stdout.write(f"Seeded {options['rows']} bookings in {time.perf_counter() - started:.1f}s\n")
+
+    def _queries(self, rng, options):
+        """The ORM querysets used by the app, compiled to SQL with sample parameters."""
+        check_in = date(2023, 6, 1) + timedelta(days=rng.randrange(90))
+        check_out = check_in + timedelta(days=3)
+        room_id = rng.randint(1, options["rooms"])
+        user_id = rng.randint(1, options["users"])
+
+        querysets = {
+            "overlap (bookings_conflict)": Booking.objects.filter(
+                room_id=room_id, check_in__lt=check_out, check_out__gt=check_in
+            ).exclude(status=Booking.STATUS_DECLINED).order_by().values("id")[:1],  # what .exists() runs
+            "search conflicting rooms": Booking.objects.filter(
+                check_in__lt=check_out, check_out__gt=check_in
+            ).exclude(status=Booking.STATUS_DECLINED).order_by().values_list("room_id").distinct(),
+            "my_bookings": Booking.objects.filter(user_id=user_id).order_by("-check_in"),
+            "pending queue (first 50)": Booking.objects.filter(
+                status=Booking.STATUS_PENDING
+            ).order_by("check_in")[:50],
+        }
+        compiled = {}
+        for label, qs in querysets.items():
+            sql, params = qs.query.get_compiler(connection=connection).as_sql()
+            # Django uses "format" placeholders; the raw sqlite3 module wants "qmark"
+            params = tuple(p.isoformat() if isinstance(p, date) else p for p in params)
+            compiled[label] = (sql.replace("%s", "?"), params)
+        return compiled
+
+    def _run(self, db, queries, repeat):
+        results = {}
+        for label, (sql, params) in queries.items():
+            plan = db.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+            started = time.perf_counter()
+            for _ in range(repeat):
+                db.execute(sql, params).fetchall()
+            results[label] = (time.perf_counter() - started) * 1000 / repeat
+
+            self.stdout.write(f"\n{label}: {results[label]:.3f} ms")
+            for row in plan:
+                self.stdout.write(f"    {row[-1]}")
+        return results
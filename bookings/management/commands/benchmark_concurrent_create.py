@@ -0,0 +1,99 @@
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from bookings.models import Booking, RoomNight
+from rooms.models import Room
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire simultaneous POST /bookings/create/ requests from a thread pool in a throwaway test "
+        "database and report req/s, for one contended slot and for mixed overlapping stays."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Requests per scenario.")
+        parser.add_argument("--workers", type=int, default=50, help="Threads posting at once.")
+        parser.add_argument("--rooms", type=int, default=4)
+        parser.add_argument("--users", type=int, default=10)
+
+    def handle(self, *args, **options):
+        if min(options["requests"], options["workers"], options["rooms"], options["users"]) < 1:
+            raise CommandError("--requests, --workers, --rooms and --users must be positive.")
+
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self._run(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def _run(self, options):
+        users = [User.objects.create_user(f"bench-guest{i}", password="pw") for i in range(options["users"])]
+        rooms = [
+            Room.objects.create(room_number=f"B{i}", price=Decimal("100.00"), capacity=2)
+            for i in range(options["rooms"])
+        ]
+        check_in = date.today() + timedelta(days=30)
+        count = options["requests"]
+        scenarios = [
+            ("one slot", [self._payload(rooms[0], check_in, 3)] * count),
+            ("mixed", [
+                self._payload(rooms[i % len(rooms)], check_in + timedelta(days=i % 9), 1 + i % 4)
+                for i in range(count)
+            ]),
+        ]
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{count} concurrent creates per scenario, {options['workers']} workers"
+        ))
+        for label, payloads in scenarios:
+            RoomNight.objects.all().delete()
+            Booking.objects.all().delete()
+            codes, elapsed = self._fire(users, payloads, options["workers"])
+            summary = ", ".join(f"{code}: {n}" for code, n in sorted(Counter(codes).items()))
+            self.stdout.write(f"  {label:<10} {count / elapsed:>8.0f} req/s  ({summary})")
+
+    def _payload(self, room, check_in, nights):
+        return {
+            "room": room.pk,
+            "check_in": check_in.isoformat(),
+            "check_out": (check_in + timedelta(days=nights)).isoformat(),
+            "guests": 1,
+            "notes": "",
+            "total_price": "0",
+        }
+
+    def _fire(self, users, payloads, workers):
+        """POST every payload at once from a pool of threads; returns (status codes, seconds)."""
+        barrier = threading.Barrier(min(workers, len(payloads)))
+
+        def post(args):
+            user, payload = args
+            client = Client()
+            client.force_login(user)
+            try:
+                barrier.wait(timeout=30)
+            except threading.BrokenBarrierError:
+                pass
+            try:
+                return client.post("/bookings/create/", payload).status_code
+            finally:
+                connection.close()
+
+        jobs = [(users[i % len(users)], payload) for i, payload in enumerate(payloads)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            codes = list(pool.map(post, jobs))
+        return codes, time.perf_counter() - started
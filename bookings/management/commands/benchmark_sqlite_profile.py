@@ -0,0 +1,176 @@
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from ReservO.sqlite import PROFILE_JOURNAL_MODE, apply_pragmas, profile_pragmas
+
+# SQLite's own defaults for the pragmas the profile changes
+BASELINE_PRAGMAS = {"journal_mode": "DELETE", "synchronous": "FULL"}
+
+READ_SQL = [
+    # bookings_conflict / room_is_free
+    "SELECT EXISTS(SELECT 1 FROM bookings_roomnight WHERE room_id = ? AND date >= ? AND date < ?)",
+    # my_bookings / profile_view
+    "SELECT id, room_id, check_in, check_out, status FROM bookings_booking "
+    "WHERE user_id = ? ORDER BY check_in DESC LIMIT 20",
+]
+INSERT_BOOKING_SQL = (
+    "INSERT INTO bookings_booking "
+    "(user_id, room_id, check_in, check_out, guests, total_price, status, created_at, notes) "
+    "VALUES (?, ?, ?, ?, 1, '100.00', 'pending', datetime('now'), '')"
+)
+INSERT_NIGHT_SQL = "INSERT INTO bookings_roomnight (room_id, booking_id, date) VALUES (?, ?, ?)"
+
+
+class Command(BaseCommand):
+    help = (
+        "Concurrent read/write throughput on copies of the SQLite database, first with SQLite's "
+        "defaults and a new connection per operation (the old setup), then with the "
+        "ReservO.sqlite profile and persistent connections. The real database is never written."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--readers", type=int, default=8, help="Reader threads.")
+        parser.add_argument("--writers", type=int, default=2, help="Writer threads (booking inserts).")
+        parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each run.")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("This benchmark measures SQLite; run it with the SQLite settings.")
+        connection.ensure_connection()
+        timeout = connection.settings_dict["OPTIONS"].get("timeout", 5)
+
+        room_ids = [row[0] for row in connection.cursor().execute("SELECT id FROM rooms_room")]
+        user_ids = [row[0] for row in connection.cursor().execute("SELECT id FROM auth_user")]
+        if not room_ids or not user_ids:
+            raise CommandError("The database has no rooms or users; run seed_benchmark first.")
+
+        workdir = tempfile.mkdtemp()
+        try:
+            results = {}
+            for label, pragmas, persistent in (
+                ("baseline", BASELINE_PRAGMAS, False),
+                ("profile", {"journal_mode": PROFILE_JOURNAL_MODE, **profile_pragmas()}, True),
+            ):
+                path = os.path.join(workdir, f"{label}.sqlite3")
+                self._copy_database(path, pragmas)
+                self.stdout.write(self.style.MIGRATE_HEADING(
+                    f"{label}: {options['readers']} readers, {options['writers']} writers, "
+                    f"{'persistent' if persistent else 'per-operation'} connections"
+                ))
+                results[label] = self._run(path, pragmas, persistent, timeout, room_ids, user_ids, options)
+                self._report(results[label], options["seconds"])
+
+            self.stdout.write(self.style.MIGRATE_HEADING("\nSummary (operations per second)"))
+            for kind in ("reads", "writes"):
+                before = len(results["baseline"][kind]) / options["seconds"]
+                after = len(results["profile"][kind]) / options["seconds"]
+                speedup = after / before if before else float("inf")
+                self.stdout.write(f"  {kind:<8} {before:>10.0f} -> {after:>10.0f}  x{speedup:.1f}")
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    def _copy_database(self, path, pragmas):
+        """Copy the current database with the backup API and set its journal mode for the run."""
+        target = sqlite3.connect(path)
+        connection.connection.backup(target)
+        target.execute(f"PRAGMA journal_mode = {pragmas['journal_mode']}")
+        target.close()
+
+    def _run(self, path, pragmas, persistent, timeout, room_ids, user_ids, options):
+        stop = threading.Event()
+        results = {"reads": [], "writes": [], "errors": []}
+        lock = threading.Lock()
+        far_future = date.today() + timedelta(days=3 * 365)
+
+        def connect():
+            db = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+            apply_pragmas(db, pragmas)
+            return db
+
+        def worker(kind, seed):
+            rng = random.Random(seed)
+            db = connect() if persistent else None
+            timings, errors = [], []
+            while not stop.is_set():
+                started = time.perf_counter()
+                conn = db or connect()
+                try:
+                    if kind == "reads":
+                        self._read(conn, rng, room_ids, user_ids)
+                    else:
+                        self._write(conn, rng, room_ids, user_ids, far_future)
+                    timings.append((time.perf_counter() - started) * 1000)
+                except sqlite3.OperationalError as exc:
+                    errors.append(str(exc))
+                finally:
+                    if db is None:
+                        conn.close()
+            if db is not None:
+                db.close()
+            with lock:
+                results[kind].extend(timings)
+                results["errors"].extend(errors)
+
+        threads = [
+            threading.Thread(target=worker, args=("reads", options["seed"] + i))
+            for i in range(options["readers"])
+        ] + [
+            threading.Thread(target=worker, args=("writes", options["seed"] + 1000 + i))
+            for i in range(options["writers"])
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(options["seconds"])
+        stop.set()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def _read(self, db, rng, room_ids, user_ids):
+        check_in = date.today() + timedelta(days=rng.randrange(-365, 365))
+        db.execute(READ_SQL[0], (rng.choice(room_ids), check_in, check_in + timedelta(days=3))).fetchone()
+        db.execute(READ_SQL[1], (rng.choice(user_ids),)).fetchall()
+
+    def _write(self, db, rng, room_ids, user_ids, far_future):
+        """One booking the way booking_create writes it: BEGIN IMMEDIATE, check, insert booking and nights."""
+        room_id = rng.choice(room_ids)
+        check_in = far_future + timedelta(days=rng.randrange(3650))
+        nights = [check_in + timedelta(days=n) for n in range(rng.randint(1, 4))]
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            taken = db.execute(READ_SQL[0], (room_id, nights[0], nights[-1] + timedelta(days=1))).fetchone()[0]
+            if not taken:
+                booking_id = db.execute(
+                    INSERT_BOOKING_SQL,
+                    (rng.choice(user_ids), room_id, check_in, nights[-1] + timedelta(days=1)),
+                ).lastrowid
+                db.executemany(INSERT_NIGHT_SQL, [(room_id, booking_id, night) for night in nights])
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def _report(self, results, seconds):
+        for kind in ("reads", "writes"):
+            timings = sorted(results[kind])
+            if not timings:
+                self.stdout.write(f"  {kind:<8} none completed")
+                continue
+            p95 = timings[min(int(len(timings) * 0.95), len(timings) - 1)]
+            self.stdout.write(
+                f"  {kind:<8} {len(timings) / seconds:>8.0f}/s  "
+                f"median {statistics.median(timings):>7.2f} ms  p95 {p95:>7.2f} ms"
+            )
+        if results["errors"]:
+            self.stdout.write(self.style.WARNING(f"  {len(results['errors'])} error(s), e.g. {results['errors'][0]}"))
@@ -0,0 +1,62 @@
+import csv
+import sys
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from bookings.importer import IMPORT_FIELDS, import_bookings, read_rows
+
+IMPORT_FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson", ".json": "json"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-import bookings from CSV, NDJSON or a JSON array (columns as written by "
+        "export_bookings: user, room, check_in, check_out, guests, status, total_price, notes). "
+        "Invalid or overlapping rows are skipped and listed in a reject report."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, or - for stdin.")
+        parser.add_argument("--format", choices=sorted(set(IMPORT_FORMATS.values())),
+                            help="Input format (default: from the file extension, csv for stdin).")
+        parser.add_argument("--rejects", help="Write rejected rows with the reason to this CSV file.")
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--dry-run", action="store_true", help="Validate only, write nothing.")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        input_format = options["format"] or ("csv" if path == "-" else IMPORT_FORMATS.get(Path(path).suffix.lower()))
+        if input_format is None:
+            raise CommandError("Cannot tell the input format from the file name; pass --format.")
+
+        started = time.perf_counter()
+        stream = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+        try:
+            result = import_bookings(
+                read_rows(stream, input_format),
+                batch_size=options["batch_size"],
+                dry_run=options["dry_run"],
+            )
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        elapsed = time.perf_counter() - started
+
+        if options["rejects"]:
+            with open(options["rejects"], "w", newline="", encoding="utf-8") as out:
+                writer = csv.writer(out)
+                writer.writerow(["line", "reason"] + IMPORT_FIELDS)
+                for line, row, reason in result.rejects:
+                    writer.writerow([line, reason] + [row.get(name, "") for name in IMPORT_FIELDS])
+        else:
+            for line, _, reason in result.rejects[:20]:
+                self.stderr.write(f"  line {line}: {reason}")
+            if len(result.rejects) > 20:
+                self.stderr.write(f"  ... and {len(result.rejects) - 20} more (use --rejects to see all)")
+
+        verb = "Would import" if options["dry_run"] else "Imported"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {result.imported} booking(s), rejected {len(result.rejects)} in {elapsed:.1f}s."
+        ))
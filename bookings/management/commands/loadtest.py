@@ -0,0 +1,111 @@
+import asyncio
+import statistics
+import time
+from datetime import date, timedelta
+from urllib.parse import urlencode, urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+# view name -> (sync path served under WSGI, async path served under ASGI)
+LOADTEST_VIEWS = {
+    "search": ("/bookings/search/", "/bookings/search/async/"),
+    "rooms": ("/rooms/", "/rooms/async/"),
+    "calendar": ("/bookings/calendar/", "/bookings/calendar/async/"),
+    "stats": ("/dashboard/stats/", "/dashboard/stats/async/"),
+}
+STAFF_VIEWS = {"calendar", "stats"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Hammer the read-heavy views of running servers with N concurrent clients and compare "
+        "throughput. The WSGI target gets the sync views, the ASGI target their async versions. "
+        "Example: gunicorn ReservO.wsgi -w 4 --threads 8 -b :8000 & "
+        "uvicorn ReservO.asgi:application --workers 4 --port 8001 & "
+        "manage.py loadtest --wsgi http://127.0.0.1:8000 --asgi http://127.0.0.1:8001"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--wsgi", help="Base URL of the WSGI server.")
+        parser.add_argument("--asgi", help="Base URL of the ASGI server.")
+        parser.add_argument("--views", nargs="+", choices=sorted(LOADTEST_VIEWS), default=["search", "rooms"])
+        parser.add_argument("--clients", type=int, default=200, help="Concurrent clients.")
+        parser.add_argument("--requests", type=int, default=4000, help="Requests per view and target.")
+        parser.add_argument("--sessionid", help="Session cookie of a staff user (needed for calendar and stats).")
+        parser.add_argument("--timeout", type=float, default=30.0)
+
+    def handle(self, *args, **options):
+        targets = [(name, options[name]) for name in ("wsgi", "asgi") if options[name]]
+        if not targets:
+            raise CommandError("Give at least one of --wsgi / --asgi.")
+        if STAFF_VIEWS.intersection(options["views"]) and not options["sessionid"]:
+            raise CommandError("calendar and stats need --sessionid of a staff user.")
+
+        check_in = date.today() + timedelta(days=30)
+        query = {
+            "search": urlencode({"check_in": check_in, "check_out": check_in + timedelta(days=3)}),
+            "calendar": urlencode({"start": check_in, "days": 30}),
+        }
+        cookie = f"sessionid={options['sessionid']}" if options["sessionid"] else None
+
+        self.stdout.write(
+            f"{options['clients']} clients, {options['requests']} requests per view\n\n"
+            f"{'target':<6} {'view':<10} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}"
+        )
+        for view in options["views"]:
+            for name, base_url in targets:
+                path = LOADTEST_VIEWS[view][name == "asgi"]
+                if view in query:
+                    path = f"{path}?{query[view]}"
+                result = asyncio.run(self._load(
+                    base_url + path, options["clients"], options["requests"], cookie, options["timeout"]
+                ))
+                self.stdout.write(
+                    f"{name:<6} {view:<10} {result['rps']:>9.1f} {result['p50']:>9.1f} "
+                    f"{result['p95']:>9.1f} {result['p99']:>9.1f} {result['errors']:>7}"
+                )
+
+    async def _load(self, url, clients, total, cookie, timeout):
+        """Run `total` GETs of url from `clients` concurrent connections."""
+        parts = urlsplit(url)
+        host, port = parts.hostname, parts.port or 80
+        target = parts.path + (f"?{parts.query}" if parts.query else "")
+        request = (
+            f"GET {target} HTTP/1.1\r\nHost: {parts.netloc}\r\nConnection: close\r\n"
+            + (f"Cookie: {cookie}\r\n" if cookie else "")
+            + "\r\n"
+        ).encode()
+
+        latencies, errors = [], 0
+        remaining = total
+
+        async def client():
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                try:
+                    status = await asyncio.wait_for(self._get(host, port, request), timeout)
+                except (OSError, asyncio.TimeoutError, ValueError):
+                    status = None
+                latencies.append((time.perf_counter() - started) * 1000)
+                if status != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+
+        cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        return {"rps": total / elapsed, "p50": cuts[49], "p95": cuts[94], "p99": cuts[98], "errors": errors}
+
+    async def _get(self, host, port, request):
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            writer.write(request)
+            await writer.drain()
+            status_line = await reader.readline()
+            await reader.read()  # drain the body until the server closes
+            return int(status_line.split()[1])
+        finally:
+            writer.close()
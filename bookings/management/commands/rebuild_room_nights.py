@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from bookings.occupancy import rebuild_room_nights
+
+
+class Command(BaseCommand):
+    help = (
+        "Recreate the RoomNight occupancy table from the Booking table. Bookings that overlap "
+        "an earlier one get no nights; they are listed and the command exits with an error."
+    )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        with transaction.atomic():
+            written, conflicts = rebuild_room_nights()
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {written} room night(s) in {time.perf_counter() - started:.1f}s."
+        ))
+        if conflicts:
+            for booking_id, other_id, night in conflicts:
+                self.stderr.write(f"Booking #{booking_id} overlaps booking #{other_id} on {night}; it has no nights.")
+            raise CommandError(
+                f"{len(conflicts)} booking(s) overlap an earlier one. Decline or move them, then run this again."
+            )
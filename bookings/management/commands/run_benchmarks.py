@@ -0,0 +1,196 @@
+import json
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from bookings.seeding import BENCHMARK_PREFIX, clear_benchmark_data, mark_benchmark_rows, seed_benchmark_data
+from bookings.utils import bookings_conflict
+
+HOT_PATHS = [
+    "search_availability",
+    "bookings_conflict",
+    "booking_create",
+    "booking_list",
+    "admin_dashboard",
+    "profile_view",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database at several scales and time the hot paths "
+        f"({', '.join(HOT_PATHS)}) through the test client. Writes JSON for regression tracking."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scales", default="1000,10000,50000", help="Comma-separated booking counts.")
+        parser.add_argument("--repeat", type=int, default=20, help="Timed runs per hot path and scale.")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--paths", nargs="+", choices=HOT_PATHS, default=HOT_PATHS)
+        parser.add_argument("--output", help="Write the JSON report here (default: stdout).")
+
+    def handle(self, *args, **options):
+        try:
+            scales = [int(scale) for scale in options["scales"].split(",") if scale.strip()]
+        except ValueError:
+            raise CommandError("--scales must be comma-separated integers.")
+
+        report = {"meta": self._meta(options), "scales": []}
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            for scale in scales:
+                report["scales"].append(self._run_scale(scale, options))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as fh:
+                fh.write(output + "\n")
+            self.stderr.write(f"Wrote {options['output']}")
+        else:
+            self.stdout.write(output)
+
+    def _meta(self, options):
+        try:
+            commit = subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=settings.BASE_DIR
+            ).stdout.strip() or None
+        except OSError:
+            commit = None
+        return {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": commit,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": options["seed"],
+            "repeat": options["repeat"],
+        }
+
+    # -----------------------------
+    # ONE SCALE
+    # -----------------------------
+    def _run_scale(self, scale, options):
+        rooms, users = max(20, scale // 250), max(50, scale // 50)
+        self.stderr.write(f"\nScale {scale}: {rooms} rooms, {users} users")
+
+        clear_benchmark_data()
+        started = time.perf_counter()
+        room_objs, user_objs, _ = seed_benchmark_data(rooms=rooms, users=users, bookings=scale, seed=options["seed"])
+        seed_seconds = time.perf_counter() - started
+
+        staff = User.objects.create_user(f"{BENCHMARK_PREFIX}staff", is_staff=True, is_superuser=True)
+        mark_benchmark_rows(users=[staff])
+        guest = user_objs[0]
+        staff_client, guest_client = Client(), Client()
+        staff_client.force_login(staff)
+        guest_client.force_login(guest)
+
+        rng = random.Random(options["seed"] + scale)
+        bookable = [room for room in room_objs if room.status == "available"]
+        first_day = date.today() - timedelta(days=365)
+        far_future = date.today() + timedelta(days=5 * 365)
+
+        def random_stay():
+            check_in = first_day + timedelta(days=rng.randrange(500))
+            return check_in, check_in + timedelta(days=rng.randint(1, 5))
+
+        def search():
+            check_in, check_out = random_stay()
+            return staff_client.get("/bookings/search/", {"check_in": check_in, "check_out": check_out})
+
+        def conflict():
+            check_in, check_out = random_stay()
+            bookings_conflict(rng.choice(room_objs), check_in, check_out)
+
+        created = iter(range(10**6))
+
+        def create():
+            # Each run books a fresh far-future slot so it always succeeds
+            check_in = far_future + timedelta(days=3 * next(created))
+            return guest_client.post("/bookings/create/", {
+                "room": rng.choice(bookable).pk,
+                "check_in": check_in,
+                "check_out": check_in + timedelta(days=2),
+                "guests": 1,
+                "notes": "",
+                "total_price": "0",
+            })
+
+        calls = {
+            "search_availability": search,
+            "bookings_conflict": conflict,
+            "booking_create": create,
+            "booking_list": lambda: staff_client.get("/bookings/all/"),
+            "admin_dashboard": lambda: staff_client.get("/dashboard/"),
+            "profile_view": lambda: guest_client.get("/accounts/profile/"),
+        }
+        results = {}
+        for name in options["paths"]:
+            results[name] = self._time(calls[name], options["repeat"])
+            self.stderr.write(
+                f"  {name:<22} median {results[name]['median_ms']:>8.2f} ms  "
+                f"p95 {results[name]['p95_ms']:>8.2f} ms  {results[name]['queries']} queries"
+            )
+
+        return {
+            "bookings": scale,
+            "rooms": len(room_objs),
+            "users": len(user_objs),
+            "seed_seconds": round(seed_seconds, 2),
+            "results": results,
+        }
+
+    def _time(self, call, repeat):
+        """One warm-up run, one run counting queries, then `repeat` timed runs."""
+        statuses = Counter()
+
+        def run():
+            response = call()
+            statuses[getattr(response, "status_code", "ok")] += 1
+
+        # Not CaptureQueriesContext: request_started clears connection.queries mid-run
+        queries = []
+
+        def count(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        run()
+        with connection.execute_wrapper(count):
+            run()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - started) * 1000)
+
+        timings.sort()
+        return {
+            "runs": repeat,
+            "mean_ms": round(statistics.fmean(timings), 3),
+            "median_ms": round(statistics.median(timings), 3),
+            "p95_ms": round(timings[min(int(repeat * 0.95), repeat - 1)], 3),
+            "min_ms": round(timings[0], 3),
+            "max_ms": round(timings[-1], 3),
+            "queries": len(queries),
+            "status_codes": {str(code): count for code, count in statuses.items()},
+        }
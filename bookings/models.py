@@ -1,10 +1,27 @@
 # bookings/models.py
 from decimal import Decimal
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 
+class BookingQuerySet(models.QuerySet):
+    # Columns the listing templates actually render (room __str__ needs number + type)
+    LISTING_FIELDS = (
+        "id", "check_in", "check_out", "guests", "total_price", "status", "created_at",
+        "room__id", "room__room_number", "room__room_type",
+        "user__id", "user__username",
+    )
+
+    def with_related(self):
+        """Join room and user so templates can follow them without a query per row."""
+        return self.select_related("room", "user")
+
+    def for_listing(self):
+        """with_related() restricted to the columns rendered in booking tables."""
+        return self.with_related().only(*self.LISTING_FIELDS)
+
+
 # Use string for room foreign key to avoid import-time circular issues
 class Booking(models.Model):
     STATUS_PENDING = 'pending'
@@ -28,68 +45,117 @@ class Booking(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     notes = models.TextField(blank=True)
 
+    objects = BookingQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Overlap predicate: room = ? AND check_in < ? AND check_out > ?
+            models.Index(fields=["room", "check_in", "check_out"], name="booking_room_dates_idx"),
+            # Same columns restricted to bookings that can still block a room
+            models.Index(
+                fields=["room", "check_in", "check_out"],
+                condition=~models.Q(status="Declined"),
+                name="booking_room_active_idx",
+            ),
+            # my_bookings / profile_view
+            models.Index(fields=["user", "-check_in"], name="booking_user_checkin_idx"),
+            # Dashboard pending queue
+            models.Index(fields=["status", "check_in"], name="booking_status_checkin_idx"),
+            # Keyset pagination of booking_list on (created_at, id)
+            models.Index(fields=["created_at"], name="booking_created_at_idx"),
+        ]
 
     def __str__(self):
         return f"Booking #{self.pk or 'new'} - {self.room} by {self.user}"
 
     def clean(self):
         """
-        Validation logic:
+        Validation logic lives in bookings.utils.booking_validation_errors:
          - check_in < check_out
          - guests <= room.capacity
          - room must be available (no overlapping bookings, not under maintenance)
+        A successful pass is remembered so save() does not repeat the overlap query.
         """
-        errors = {}
-
-        if self.check_in >= self.check_out:
-            errors["check_in"] = "Check-in date must be before check-out date."
-
-        # Prevent booking in the past if desired (optional)
-        # if self.check_in < timezone.now().date():
-        #     errors["check_in"] = "Check-in date cannot be in the past."
-
-        # Validate room and guest capacity
-        if not self.room:
-            errors["room"] = "A room must be selected."
-        else:
-            if self.guests and self.guests > self.room.capacity:
-                errors["guests"] = f"Number of guests ({self.guests}) exceeds room capacity ({self.room.capacity})."
-
-            # Check room status (maintenance/out_of_service)
-            if self.room.status in ("maintenance", "out_of_service"):
-                errors["room"] = "Selected room is currently unavailable (maintenance or out of service)."
-
-            # Availability overlap check
-            from bookings.models import Booking as BookingModel  # local name
-            qs = BookingModel.objects.filter(room=self.room).exclude(status="cancelled")
-            if self.pk:
-                qs = qs.exclude(pk=self.pk)
-
-            overlap_exists = qs.filter(check_in__lt=self.check_out, check_out__gt=self.check_in).exists()
-            if overlap_exists:
-                errors["room"] = "Selected room is already booked for the chosen dates."
+        from bookings.utils import booking_validation_errors  # local import: utils imports this module
 
+        self._validated_state = None
+        errors = booking_validation_errors(self)
         if errors:
             raise ValidationError(errors)
+        self._validated_state = self._validation_key()
+
+    def _validation_key(self):
+        return (self.pk, self.room_id, self.check_in, self.check_out, self.guests)
+
+    def is_validated(self):
+        """True when clean() already passed for the current room, dates and guests."""
+        return getattr(self, "_validated_state", None) == self._validation_key()
 
     def calculate_total_price(self):
         """
-        Calculate total_price based on nights * room.price
-        Nights is integer days between check_in and check_out.
+        Sum of the room's nightly rates (rate plans included) for each night
+        between check_in and check_out, read from its precomputed rate table.
         """
-        nights = (self.check_out - self.check_in).days
-        if nights <= 0:
+        from rooms.rates import quote_stay  # local import: rooms.rates imports rooms.models
+
+        if (self.check_out - self.check_in).days <= 0:
             return Decimal("0.00")
-        return Decimal(nights) * self.room.price
+        return quote_stay(self.room, self.check_in, self.check_out)
 
-    def save(self, *args, **kwargs):
-        # Run full clean to enforce validations (this raises ValidationError if invalid)
-        self.full_clean()
+    def save(self, *args, validate=True, **kwargs):
+        """
+        validate=False is a fast path for trusted internal callers (status
+        transitions, admin bulk actions) that must not re-run full_clean().
+        When a ModelForm already validated this instance the check is skipped too.
+        The row and its RoomNight occupancy (synced by the post_save handler)
+        are written in one transaction, so a (room, date) clash rolls both back.
+        """
+        if validate and not self.is_validated():
+            # Run full clean to enforce validations (this raises ValidationError if invalid)
+            self.full_clean()
+
+        # Compute price automatically (unless the caller restricted the columns to write)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "total_price" in update_fields:
+            if self.check_in and self.check_out and self.room_id:
+                self.total_price = self.calculate_total_price()
+
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+
+
+class RoomNight(models.Model):
+    """
+    Materialized occupancy: one row per room per night held by a
+    non-declined booking. The unique (room, date) constraint lets the
+    database itself reject a double booking.
+    Maintained by bookings.occupancy (see bookings/signals.py).
+    """
+    room = models.ForeignKey("rooms.Room", on_delete=models.CASCADE, related_name="nights")
+    booking = models.ForeignKey(Booking, on_delete=models.CASCADE, related_name="nights")
+    date = models.DateField()
 
-        # Compute price automatically
-        if self.check_in and self.check_out and self.room:
-            self.total_price = self.calculate_total_price()
+    class Meta:
+        ordering = ["room", "date"]
+        constraints = [
+            models.UniqueConstraint(fields=["room", "date"], name="unique_room_night"),
+        ]
 
-        super().save(*args, **kwargs)
+    def __str__(self):
+        return f"{self.room_id} @ {self.date} (booking #{self.booking_id})"
+
+
+class BenchmarkRecord(models.Model):
+    """
+    A room or user created by bookings.seeding. clear_benchmark_data()
+    removes exactly the rows recorded here (and their bookings), so real
+    rooms and accounts that merely look like benchmark data are never touched.
+    """
+    room = models.OneToOneField("rooms.Room", null=True, blank=True, on_delete=models.CASCADE, related_name="+")
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.CASCADE, related_name="+",
+    )
+
+    def __str__(self):
+        return f"benchmark {'room' if self.room_id else 'user'} #{self.room_id or self.user_id}"
@@ -0,0 +1,71 @@
+# bookings/occupancy.py
+from datetime import timedelta
+
+from .models import Booking, RoomNight
+
+
+def stay_nights(check_in, check_out):
+    """Nights covered by a stay: check_in up to (not including) check_out."""
+    return [check_in + timedelta(days=i) for i in range((check_out - check_in).days)]
+
+
+def sync_booking_nights(booking, created=False):
+    """
+    Bring the RoomNight rows of one booking in line with its current room,
+    dates and status. Called inside the booking's own transaction, so a
+    clash on (room, date) aborts the write with an IntegrityError.
+    A just-created booking has no rows yet, so there is nothing to delete.
+    """
+    if not created:
+        RoomNight.objects.filter(booking_id=booking.pk).delete()
+    if booking.status == Booking.STATUS_DECLINED or not booking.check_in or not booking.check_out:
+        return
+    RoomNight.objects.bulk_create(
+        RoomNight(room_id=booking.room_id, booking_id=booking.pk, date=night)
+        for night in stay_nights(booking.check_in, booking.check_out)
+    )
+
+
+def rebuild_room_nights(batch_size=5000):
+    """
+    Recreate the whole occupancy table from Booking. Of two overlapping
+    legacy bookings the one created first keeps the nights; the other gets
+    none and is reported. Returns (nights written, [(booking_id,
+    other_booking_id, first clashing date), ...]).
+    """
+    RoomNight.objects.all().delete()
+    rows = (
+        Booking.objects.exclude(status=Booking.STATUS_DECLINED)
+        .order_by("created_at", "id")
+        .values_list("id", "room_id", "check_in", "check_out")
+    )
+    written = 0
+    conflicts = []
+    claimed = {}
+    batch = []
+    for booking_id, room_id, check_in, check_out in rows.iterator(chunk_size=batch_size):
+        nights = stay_nights(check_in, check_out)
+        clash = next((night for night in nights if (room_id, night) in claimed), None)
+        if clash is not None:
+            conflicts.append((booking_id, claimed[room_id, clash], clash))
+            continue
+        claimed.update(((room_id, night), booking_id) for night in nights)
+        batch.extend(RoomNight(room_id=room_id, booking_id=booking_id, date=night) for night in nights)
+        if len(batch) >= batch_size:
+            written += len(RoomNight.objects.bulk_create(batch))
+            batch = []
+    if batch:
+        written += len(RoomNight.objects.bulk_create(batch))
+    return written, conflicts
+
+
+# -----------------------------
+# AVAILABILITY
+# -----------------------------
+def room_is_free(room_id, check_in, check_out, exclude_booking_id=None):
+    """Single indexed lookup on (room, date) instead of an interval overlap query."""
+    qs = RoomNight.objects.filter(room_id=room_id, date__gte=check_in, date__lt=check_out)
+    if exclude_booking_id:
+        qs = qs.exclude(booking_id=exclude_booking_id)
+    return not qs.exists()
+
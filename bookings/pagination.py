@@ -0,0 +1,97 @@
+# bookings/pagination.py
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_date, parse_datetime
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(value, pk):
+    raw = json.dumps([value.isoformat(), pk]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, field):
+    """Turn a cursor back into (value, pk) typed for `field` (DateField or DateTimeField)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw_value, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        pk = int(pk)
+        # parse_date/parse_datetime raise ValueError on impossible dates and TypeError on non-strings
+        if field.get_internal_type() == "DateTimeField":
+            value = parse_datetime(raw_value)
+        else:
+            value = parse_date(raw_value)
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+    if value is None:
+        raise InvalidCursor(cursor)
+    return value, pk
+
+
+class KeysetPage:
+    def __init__(self, items, next_cursor, per_page):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.per_page = per_page
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def keyset_paginate(queryset, field_name, cursor=None, per_page=50, descending=False):
+    """
+    Cursor-based pagination on (field_name, id).
+    Each page is a range seek on the index instead of an OFFSET, so page N
+    costs the same as page 1. Invalid cursors restart from the first page.
+    """
+    field = queryset.model._meta.get_field(field_name)
+    if descending:
+        qs = queryset.order_by(f"-{field_name}", "-id")
+        before, same = f"{field_name}__lt", "id__lt"
+    else:
+        qs = queryset.order_by(field_name, "id")
+        before, same = f"{field_name}__gt", "id__gt"
+
+    if cursor:
+        try:
+            value, pk = decode_cursor(cursor, field)
+        except InvalidCursor:
+            pass
+        else:
+            qs = qs.filter(Q(**{before: value}) | Q(**{field_name: value, same: pk}))
+
+    items = list(qs[:per_page + 1])
+    next_cursor = None
+    if len(items) > per_page:
+        items = items[:per_page]
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, field_name), last.pk)
+    return KeysetPage(items, next_cursor, per_page)
+
+
+def pager_links(request, page, param="after"):
+    """
+    Query strings for the pager template: the next page and the first page,
+    both keeping the other GET filters.
+    """
+    query = request.GET.copy()
+    is_first_page = not query.get(param)
+    query.pop(param, None)
+    first_query = query.urlencode()
+    next_query = None
+    if page.has_next:
+        query[param] = page.next_cursor
+        next_query = query.urlencode()
+    return {"next_query": next_query, "first_query": first_query, "is_first_page": is_first_page}
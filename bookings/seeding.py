@@ -0,0 +1,166 @@
+# bookings/seeding.py
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.db.models import Q
+
+from rooms.cache import bump_catalog_version, bump_room_list_version
+from rooms.models import Room
+from rooms.rates import rebuild_rate_tables
+from .availability import availability_index
+from .cache import bump_bookings_version
+from .models import BenchmarkRecord, Booking, RoomNight
+from .occupancy import stay_nights
+
+# Names of generated rooms and users start with this. "~" is not allowed in usernames, so seeded
+# accounts never clash with real sign-ups; removal goes by BenchmarkRecord, not by this prefix.
+BENCHMARK_PREFIX = "~bench"
+
+# room_type -> (share of rooms, capacity range, nightly price range)
+ROOM_PROFILES = {
+    "single": (0.35, (1, 1), (40, 70)),
+    "double": (0.35, (2, 3), (70, 120)),
+    "suite": (0.20, (2, 4), (150, 300)),
+    "conference": (0.10, (10, 40), (200, 500)),
+}
+STAY_NIGHTS = [1, 2, 2, 3, 3, 3, 4, 5, 7, 10]
+# Share of requests that were declined because they overlapped an existing stay
+DECLINED_SHARE = 0.15
+
+
+def benchmark_rooms():
+    return Room.objects.filter(pk__in=BenchmarkRecord.objects.filter(room__isnull=False).values("room"))
+
+
+def benchmark_users():
+    return User.objects.filter(pk__in=BenchmarkRecord.objects.filter(user__isnull=False).values("user"))
+
+
+def mark_benchmark_rows(rooms=(), users=()):
+    """Record rooms and users as benchmark data, so clear_benchmark_data() removes them."""
+    BenchmarkRecord.objects.bulk_create(
+        [BenchmarkRecord(room=room) for room in rooms] + [BenchmarkRecord(user=user) for user in users]
+    )
+
+
+def clear_benchmark_data():
+    """
+    Remove every room and user recorded by mark_benchmark_rows(), with all
+    their bookings, then resync the derived state. Rows are found through
+    BenchmarkRecord only, never by name.
+    """
+    from dashboard.stats import recompute_dashboard_stats  # dashboard depends on bookings
+
+    rooms, users = benchmark_rooms(), benchmark_users()
+    with transaction.atomic():
+        _delete_bookings(Booking.objects.filter(Q(room__in=rooms) | Q(user__in=users)))
+        rooms.delete()
+        users.delete()
+        recompute_dashboard_stats()
+        transaction.on_commit(availability_index.invalidate)
+        transaction.on_commit(bump_bookings_version)
+
+
+def _delete_bookings(bookings):
+    """
+    Delete `bookings` and their nights without sending a signal per row.
+    QuerySet.delete() would send post_delete for every booking, and each
+    handler rewrites the dashboard stats that clear_benchmark_data()
+    recomputes once anyway. RoomNight has no delete signals, so its
+    QuerySet.delete() already runs as one DELETE; the bookings go with a
+    raw DELETE over the same (ORM-built) selection.
+    """
+    RoomNight.objects.filter(booking__in=bookings).delete()
+    sql, params = bookings.values("pk").query.get_compiler(connection=connection).as_sql()
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {connection.ops.quote_name(Booking._meta.db_table)} WHERE id IN ({sql})", params)
+
+
+def seed_benchmark_data(rooms=200, users=1000, bookings=50_000, seed=42, start=None, stdout=None):
+    """
+    Generate a reproducible data set: `rooms` rooms across Room.ROOM_TYPES,
+    `users` guests and `bookings` bookings. Each room gets back-to-back
+    stays with short gaps; past stays are mostly approved, future ones
+    mostly pending, and DECLINED_SHARE of the requests overlap a stay that
+    was already taken. Rows are bulk-inserted, then the occupancy table,
+    dashboard stats and availability index are brought in line.
+    """
+    from dashboard.stats import recompute_dashboard_stats  # dashboard depends on bookings
+
+    rng = random.Random(seed)
+    start = start or date.today() - timedelta(days=365)
+    today = date.today()
+
+    types = list(ROOM_PROFILES)
+    weights = [ROOM_PROFILES[t][0] for t in types]
+    room_objs = []
+    for i in range(rooms):
+        room_type = rng.choices(types, weights)[0]
+        _, (low_cap, high_cap), (low_price, high_price) = ROOM_PROFILES[room_type]
+        room_objs.append(Room(
+            room_number=f"{BENCHMARK_PREFIX}{i:05d}",
+            room_type=room_type,
+            capacity=rng.randint(low_cap, high_cap),
+            price=Decimal(rng.randrange(low_price, high_price + 1)),
+            status="maintenance" if rng.random() < 0.02 else "available",
+        ))
+    room_objs = Room.objects.bulk_create(room_objs)
+    rebuild_rate_tables(room_objs)
+    # bulk_create() sends no signals
+    bump_catalog_version()
+    bump_room_list_version()
+
+    user_objs = [User(username=f"{BENCHMARK_PREFIX}{i:05d}", email=f"{BENCHMARK_PREFIX}{i}@example.com") for i in range(users)]
+    for user in user_objs:
+        user.set_unusable_password()
+    user_objs = User.objects.bulk_create(user_objs)
+    mark_benchmark_rows(room_objs, user_objs)
+
+    per_room, extra = divmod(bookings, max(len(room_objs), 1))
+    booking_objs = []
+    for index, room in enumerate(room_objs):
+        cursor = start + timedelta(days=rng.randrange(7))
+        taken = []
+        for _ in range(per_room + (1 if index < extra else 0)):
+            if taken and rng.random() < DECLINED_SHARE:
+                check_in, check_out = rng.choice(taken[-5:])
+                check_in += timedelta(days=rng.randint(-1, 1))
+                check_out = max(check_out + timedelta(days=rng.randint(-1, 1)), check_in + timedelta(days=1))
+                status = Booking.STATUS_DECLINED
+            else:
+                cursor += timedelta(days=rng.choice([0, 0, 1, 1, 2, 3, 5]))
+                check_in, check_out = cursor, cursor + timedelta(days=rng.choice(STAY_NIGHTS))
+                cursor = check_out
+                taken.append((check_in, check_out))
+                if check_in < today:
+                    status = Booking.STATUS_APPROVED if rng.random() < 0.95 else Booking.STATUS_PENDING
+                else:
+                    status = Booking.STATUS_PENDING if rng.random() < 0.6 else Booking.STATUS_APPROVED
+            booking_objs.append(Booking(
+                user=rng.choice(user_objs),
+                room=room,
+                check_in=check_in,
+                check_out=check_out,
+                guests=rng.randint(1, room.capacity),
+                status=status,
+                total_price=(check_out - check_in).days * room.price,
+            ))
+
+    with transaction.atomic():
+        for offset in range(0, len(booking_objs), 5000):
+            chunk = Booking.objects.bulk_create(booking_objs[offset:offset + 5000])
+            RoomNight.objects.bulk_create(
+                RoomNight(room_id=b.room_id, booking_id=b.pk, date=night)
+                for b in chunk
+                if b.status != Booking.STATUS_DECLINED
+                for night in stay_nights(b.check_in, b.check_out)
+            )
+            if stdout:
+                stdout.write(f"  {offset + len(chunk)}/{len(booking_objs)} bookings")
+        recompute_dashboard_stats()
+        transaction.on_commit(availability_index.invalidate)
+        transaction.on_commit(bump_bookings_version)
+    return room_objs, user_objs, len(booking_objs)
@@ -0,0 +1,33 @@
+# bookings/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .availability import availability_index
+from .cache import bump_bookings_version
+from .models import Booking
+from .occupancy import sync_booking_nights
+
+
+@receiver(post_save, sender=Booking)
+def sync_booking_occupancy(sender, instance, created=False, **kwargs):
+    # Booking.save() wraps this in the booking's own transaction; RoomNight rows go away on delete via CASCADE
+    sync_booking_nights(instance, created=created)
+
+
+@receiver(post_save, sender=Booking)
+def index_booking_saved(sender, instance, **kwargs):
+    # Only touch the in-process index once the write is actually committed
+    transaction.on_commit(lambda: availability_index.update_booking(instance))
+
+
+@receiver(post_delete, sender=Booking)
+def index_booking_deleted(sender, instance, **kwargs):
+    booking_id = instance.pk
+    transaction.on_commit(lambda: availability_index.remove_booking(booking_id))
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def bump_version(sender, **kwargs):
+    transaction.on_commit(bump_bookings_version)
@@ -0,0 +1,96 @@
+# bookings/suggestions.py
+from collections import defaultdict, namedtuple
+from datetime import date, timedelta
+
+from .models import Booking
+from .utils import UNAVAILABLE_ROOM_STATUSES, bookable_rooms
+
+# How far (in days) before and after the preferred check-in to look for windows
+SUGGESTION_HORIZON_DAYS = 60
+
+Suggestion = namedtuple("Suggestion", "room check_in check_out distance")
+
+
+def booked_intervals(room_ids, start, end, exclude_booking_id=None):
+    """{room_id: [(check_in, check_out), ...] sorted} of non-declined bookings overlapping [start, end), in one query."""
+    intervals = defaultdict(list)
+    qs = (
+        Booking.objects.filter(room_id__in=room_ids, check_in__lt=end, check_out__gt=start)
+        .exclude(status=Booking.STATUS_DECLINED)
+        .order_by("room_id", "check_in")
+        .values_list("room_id", "check_in", "check_out")
+    )
+    if exclude_booking_id:
+        qs = qs.exclude(pk=exclude_booking_id)
+    for room_id, check_in, check_out in qs:
+        intervals[room_id].append((check_in, check_out))
+    return intervals
+
+
+def gap_starts(intervals, nights, preferred, earliest, latest):
+    """
+    Gap scan over one room's sorted intervals. For every free gap long enough
+    for `nights`, yield the check-in in that gap closest to `preferred`
+    (check-ins are limited to [earliest, latest]).
+    """
+    cursor = earliest
+    for check_in, check_out in intervals + [(latest + timedelta(days=nights), None)]:
+        if check_in > cursor:
+            last_start = min(check_in - timedelta(days=nights), latest)
+            if last_start >= cursor:
+                yield min(max(preferred, cursor), last_start)
+        if check_out is None:
+            break
+        cursor = max(cursor, check_out)
+
+
+def nearest_free_windows(rooms, nights, preferred, k=3, horizon=SUGGESTION_HORIZON_DAYS,
+                         intervals=None, exclude_booking_id=None):
+    """
+    The k free windows of `nights` nights closest to `preferred` across
+    `rooms` (one room, or every room of a type), at most one per free gap so
+    the suggestions are real alternatives rather than consecutive days.
+    Returns Suggestions ordered by distance in days, then date.
+    """
+    earliest = max(preferred - timedelta(days=horizon), date.today())
+    latest = preferred + timedelta(days=horizon)
+    if intervals is None:
+        intervals = booked_intervals(
+            [room.pk for room in rooms], earliest, latest + timedelta(days=nights), exclude_booking_id
+        )
+
+    found = []
+    for room in rooms:
+        for start in gap_starts(intervals.get(room.pk, []), nights, preferred, earliest, latest):
+            found.append(Suggestion(room, start, start + timedelta(days=nights), abs((start - preferred).days)))
+    found.sort(key=lambda s: (s.distance, s.check_in, s.room.room_number))
+    return found[:k]
+
+
+def suggest_alternatives(room, check_in, check_out, guests=None, k=3, exclude_booking_id=None):
+    """
+    What to offer when `room` is not free for [check_in, check_out):
+      "dates": the k nearest windows of the same length in this room
+      "rooms": other rooms of the same type (and capacity) free for the exact dates
+    One booking query covers every candidate room; the rest is an in-memory sweep.
+    """
+    nights = (check_out - check_in).days
+    candidates = list(bookable_rooms(room.room_type, guests))
+    if room.status not in UNAVAILABLE_ROOM_STATUSES and all(c.pk != room.pk for c in candidates):
+        candidates.append(room)
+
+    earliest = max(check_in - timedelta(days=SUGGESTION_HORIZON_DAYS), date.today())
+    latest = check_in + timedelta(days=SUGGESTION_HORIZON_DAYS)
+    intervals = booked_intervals(
+        [c.pk for c in candidates], earliest, latest + timedelta(days=nights), exclude_booking_id
+    )
+
+    dates = []
+    if room.status not in UNAVAILABLE_ROOM_STATUSES:
+        dates = nearest_free_windows([room], nights, check_in, k=k, intervals=intervals)
+    rooms = [
+        c for c in candidates
+        if c.pk != room.pk
+        and all(existing_out <= check_in or existing_in >= check_out for existing_in, existing_out in intervals.get(c.pk, []))
+    ]
+    return {"dates": dates, "rooms": rooms[:k]}
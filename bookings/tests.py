@@ -1,3 +1,796 @@
-from django.test import TestCase
+import base64
+import csv
+import io
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection
+from django.test import Client, RequestFactory, TestCase, TransactionTestCase
+
+from bookings.availability import AvailabilityIndex, availability_index
+from bookings.export import EXPORT_COLUMNS, export_rows
+from bookings.grid import occupancy_grid, run_length_spans
+from bookings.importer import import_bookings, read_rows
+from bookings.models import BenchmarkRecord, Booking, RoomNight
+from bookings.occupancy import rebuild_room_nights
+from bookings.pagination import InvalidCursor, decode_cursor, keyset_paginate
+from bookings.seeding import clear_benchmark_data, seed_benchmark_data
+from bookings.suggestions import gap_starts, suggest_alternatives
+from bookings.transitions import bulk_transition
+from bookings.views import booking_list
+from dashboard.stats import get_dashboard_stats, recompute_dashboard_stats
+from rooms.models import Room
+from rooms.rates import rate_tables
+from rooms.tests import TempMediaMixin
+
+
+class ConcurrentBookingCreateTests(TransactionTestCase):
+    """
+    Fire many simultaneous booking_create requests and make sure the
+    check-then-insert never lets two overlapping bookings through.
+    Throughput for the same scenarios: manage.py benchmark_concurrent_create.
+    """
+
+    REQUESTS = 200
+    WORKERS = 50
+
+    def setUp(self):
+        self.users = [User.objects.create_user(f"guest{i}", password="pw") for i in range(10)]
+        self.rooms = [
+            Room.objects.create(room_number=f"10{i}", price=Decimal("100.00"), capacity=2)
+            for i in range(4)
+        ]
+        self.check_in = date.today() + timedelta(days=30)
+
+    def _fire(self, payloads):
+        """POST every payload at once from a pool of threads; returns their status codes."""
+        barrier = threading.Barrier(min(self.WORKERS, len(payloads)))
+
+        def post(args):
+            user, payload = args
+            client = Client()
+            client.force_login(user)
+            try:
+                barrier.wait(timeout=30)
+            except threading.BrokenBarrierError:
+                pass
+            try:
+                return client.post("/bookings/create/", payload).status_code
+            finally:
+                connection.close()
+
+        jobs = [(self.users[i % len(self.users)], payload) for i, payload in enumerate(payloads)]
+        with ThreadPoolExecutor(max_workers=self.WORKERS) as pool:
+            return list(pool.map(post, jobs))
+
+    def _payload(self, room, check_in, nights):
+        return {
+            "room": room.pk,
+            "check_in": check_in.isoformat(),
+            "check_out": (check_in + timedelta(days=nights)).isoformat(),
+            "guests": 1,
+            "notes": "",
+            "total_price": "0",
+        }
+
+    def assertNoOverlaps(self):
+        for room in self.rooms:
+            stays = list(
+                Booking.objects.filter(room=room)
+                .exclude(status=Booking.STATUS_DECLINED)
+                .order_by("check_in")
+                .values_list("check_in", "check_out")
+            )
+            for (_, previous_out), (next_in, _) in zip(stays, stays[1:]):
+                self.assertLessEqual(previous_out, next_in, f"double booking in room {room.room_number}")
+
+    def test_same_room_same_dates_books_exactly_once(self):
+        payloads = [self._payload(self.rooms[0], self.check_in, 3)] * self.REQUESTS
+        codes = self._fire(payloads)
+
+        self.assertEqual(codes.count(302), 1)
+        self.assertEqual(codes.count(200), self.REQUESTS - 1)
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_overlapping_requests_across_rooms(self):
+        payloads = [
+            self._payload(self.rooms[i % len(self.rooms)], self.check_in + timedelta(days=i % 9), 1 + i % 4)
+            for i in range(self.REQUESTS)
+        ]
+        codes = self._fire(payloads)
+
+        self.assertNotIn(500, codes)
+        self.assertEqual(codes.count(302), Booking.objects.count())
+        self.assertNoOverlaps()
+
+
+class ListingQueryCountTests(TestCase):
+    """
+    Listing pages must issue the same number of queries whether they show
+    one booking or many (no per-row room/user lookups).
+    """
+
+    SMALL = 1
+    LARGE = 30
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user("frontdesk", password="pw", is_staff=True, is_superuser=True)
+        cls.guest = User.objects.create_user("guest", password="pw")
+        cls.rooms = [
+            Room.objects.create(room_number=f"2{i:02d}", room_type="double", price=Decimal("80.00"), capacity=2)
+            for i in range(cls.LARGE)
+        ]
+
+    def _add_bookings(self, count, start=0):
+        check_in = date.today() + timedelta(days=10)
+        for i in range(start, start + count):
+            Booking(
+                user=self.guest if i % 2 == 0 else self.staff,
+                room=self.rooms[i],
+                check_in=check_in,
+                check_out=check_in + timedelta(days=2),
+                status=Booking.STATUS_PENDING if i % 3 else Booking.STATUS_APPROVED,
+            ).save(validate=False)
+
+    def assertConstantQueries(self, expected, render):
+        """Render with SMALL bookings, then with LARGE, asserting `expected` queries both times."""
+        self._add_bookings(self.SMALL)
+        render()  # warm the room catalog cache
+        with self.assertNumQueries(expected):
+            render()
+        self._add_bookings(self.LARGE - self.SMALL, start=self.SMALL)
+        render()  # the first dashboard read after booking writes refreshes the summary breakdowns
+        with self.assertNumQueries(expected):
+            render()
+
+    def test_my_bookings(self):
+        self.client.force_login(self.guest)
+        # session, user, bookings
+        self.assertConstantQueries(3, lambda: self.client.get("/bookings/").content)
+
+    def test_booking_list_for_staff(self):
+        request = RequestFactory().get("/bookings/")
+        request.user = self.staff
+        # bookings only: the user is already on the request
+        self.assertConstantQueries(1, lambda: booking_list(request).content)
+
+    def test_admin_dashboard(self):
+        self.client.force_login(self.staff)
+        # session, user, precomputed stats row, recent bookings, pending queue
+        self.assertConstantQueries(5, lambda: self.client.get("/dashboard/").content)
+
+
+class WritePathQueryCountTests(TestCase):
+    """Create and update resolve the submitted room once: the locked row is reused by the form."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.guest = User.objects.create_user("writer", password="pw")
+        cls.room = Room.objects.create(room_number="1501", room_type="double", price=Decimal("80.00"), capacity=2)
+        cls.check_in = date.today() + timedelta(days=20)
+
+    def setUp(self):
+        rate_tables.clear()
+        self.client.force_login(self.guest)
+
+    def post(self, url, offset, nights, guests=1):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(url, {
+                "room": self.room.pk, "check_in": self.check_in + timedelta(days=offset),
+                "check_out": self.check_in + timedelta(days=offset + nights), "guests": guests,
+                "notes": "", "total_price": "0",
+            })
+
+    def test_create_and_update(self):
+        self.post("/bookings/create/", 0, 2)  # warm the rate tables and the dashboard counters
+        # session, user, room lock, overlap check, booking insert, nights insert, stats counters,
+        # rollup update (no row for this day yet) + insert; 4 savepoints + 4 releases
+        with self.assertNumQueries(17):
+            self.assertEqual(self.post("/bookings/create/", 5, 2).status_code, 302)
+
+        booking = Booking.objects.get(check_in=self.check_in + timedelta(days=5))
+        # session, user, booking, room lock, overlap check, stored facts, booking update,
+        # nights delete + insert, stats counters, rollup update; 3 savepoints + 3 releases
+        with self.assertNumQueries(17):
+            self.assertEqual(self.post(f"/bookings/update/{booking.pk}", 5, 3, guests=2).status_code, 302)
+        booking.refresh_from_db()
+        self.assertEqual((booking.check_out, booking.guests), (self.check_in + timedelta(days=8), 2))
+
+
+class ApprovalTests(TestCase):
+    """Single approvals go through the same overlap check as bulk ones."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user("manager", password="pw", is_staff=True, is_superuser=True)
+        cls.guest = User.objects.create_user("guest", password="pw")
+        cls.room = Room.objects.create(room_number="301", price=Decimal("90.00"), capacity=2)
+        check_in = date.today() + timedelta(days=20)
+        cls.approved = Booking(
+            user=cls.guest, room=cls.room, check_in=check_in, check_out=check_in + timedelta(days=3),
+            status=Booking.STATUS_APPROVED,
+        )
+        cls.approved.save(validate=False)
+        cls.declined = Booking(
+            user=cls.guest, room=cls.room, check_in=check_in + timedelta(days=1),
+            check_out=check_in + timedelta(days=4), status=Booking.STATUS_DECLINED,
+        )
+        cls.declined.save(validate=False)
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+
+    def test_dashboard_action_rejects_clashing_approval(self):
+        response = self.client.post(
+            "/dashboard/booking-action/", {"booking_id": self.declined.pk, "action": "approve"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()["success"])
+        self.declined.refresh_from_db()
+        self.assertEqual(self.declined.status, Booking.STATUS_DECLINED)
+
+    def test_dashboard_action_declines(self):
+        response = self.client.post(
+            "/dashboard/booking-action/", {"booking_id": self.approved.pk, "action": "decline"}
+        )
+        self.assertEqual(response.json(), {"success": True, "status": Booking.STATUS_DECLINED})
+        self.assertFalse(self.approved.nights.exists())
+
+    def test_approve_route_requires_post(self):
+        self.assertEqual(self.client.get(f"/bookings/approve/{self.declined.pk}/").status_code, 405)
+        self.assertEqual(self.client.get(f"/bookings/decline/{self.approved.pk}/").status_code, 405)
+        self.approved.refresh_from_db()
+        self.assertEqual(self.approved.status, Booking.STATUS_APPROVED)
+
+
+class CursorTests(TestCase):
+    def test_malformed_cursors_restart_from_first_page(self):
+        field = Booking._meta.get_field("check_in")
+        for raw_value in ("2024-13-45", 42, None):
+            cursor = base64.urlsafe_b64encode(json.dumps([raw_value, 1]).encode()).decode()
+            with self.assertRaises(InvalidCursor):
+                decode_cursor(cursor, field)
+        page = keyset_paginate(Booking.objects.all(), "check_in", cursor="not-a-cursor")
+        self.assertEqual(len(page), 0)
+
+
+class OccupancyTests(TestCase):
+    """RoomNight rows follow every booking write, and a clash leaves both tables untouched."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.guest = User.objects.create_user("guest", password="pw")
+        cls.room = Room.objects.create(room_number="401", price=Decimal("70.00"), capacity=2)
+        cls.other_room = Room.objects.create(room_number="402", price=Decimal("70.00"), capacity=2)
+        cls.check_in = date.today() + timedelta(days=40)
+
+    def _book(self, check_in, nights, room=None, **fields):
+        booking = Booking(
+            user=self.guest, room=room or self.room, check_in=check_in,
+            check_out=check_in + timedelta(days=nights), **fields,
+        )
+        booking.save(validate=False)
+        return booking
+
+    def nights_of(self, booking):
+        return list(RoomNight.objects.filter(booking=booking).values_list("room_id", "date"))
+
+    def test_nights_follow_dates_room_and_status(self):
+        booking = self._book(self.check_in, 2)
+        self.assertEqual(self.nights_of(booking), [
+            (self.room.pk, self.check_in), (self.room.pk, self.check_in + timedelta(days=1)),
+        ])
+
+        booking.room = self.other_room
+        booking.check_out = self.check_in + timedelta(days=1)
+        booking.save(validate=False)
+        self.assertEqual(self.nights_of(booking), [(self.other_room.pk, self.check_in)])
+
+        booking.status = Booking.STATUS_DECLINED
+        booking.save(validate=False, update_fields=["status"])
+        self.assertEqual(self.nights_of(booking), [])
+
+        booking.delete()
+        self.assertFalse(RoomNight.objects.exists())
+
+    def test_clashing_insert_is_rolled_back(self):
+        first = self._book(self.check_in, 3)
+        with self.assertRaises(IntegrityError):
+            self._book(self.check_in + timedelta(days=2), 2)
+        self.assertEqual(list(Booking.objects.values_list("pk", flat=True)), [first.pk])
+        self.assertEqual(len(self.nights_of(first)), 3)
+
+    def test_clashing_update_keeps_the_old_row_and_nights(self):
+        self._book(self.check_in, 3)
+        later = self._book(self.check_in + timedelta(days=5), 2)
+        before = self.nights_of(later)
+
+        later.check_in = self.check_in + timedelta(days=1)
+        with self.assertRaises(IntegrityError):
+            later.save(validate=False)
+        later.refresh_from_db()
+        self.assertEqual(later.check_in, self.check_in + timedelta(days=5))
+        self.assertEqual(self.nights_of(later), before)
+
+    def _legacy_overlap(self):
+        # bulk_create skips the post_save sync, like rows written before RoomNight existed
+        first, second, elsewhere = Booking.objects.bulk_create([
+            Booking(user=self.guest, room=self.room, check_in=self.check_in,
+                    check_out=self.check_in + timedelta(days=3)),
+            Booking(user=self.guest, room=self.room, check_in=self.check_in + timedelta(days=2),
+                    check_out=self.check_in + timedelta(days=4)),
+            Booking(user=self.guest, room=self.other_room, check_in=self.check_in,
+                    check_out=self.check_in + timedelta(days=1)),
+        ])
+        return first, second, elsewhere
+
+    def test_rebuild_reports_overlaps_and_counts_inserted_nights(self):
+        first, second, elsewhere = self._legacy_overlap()
+        written, conflicts = rebuild_room_nights(batch_size=2)
+        self.assertEqual(written, 4)
+        self.assertEqual(conflicts, [(second.pk, first.pk, self.check_in + timedelta(days=2))])
+        self.assertEqual(RoomNight.objects.count(), 4)
+        self.assertEqual(self.nights_of(second), [])
+        self.assertEqual(len(self.nights_of(elsewhere)), 1)
+
+    def test_rebuild_command_fails_on_overlaps(self):
+        first, second, _ = self._legacy_overlap()
+        out, err = io.StringIO(), io.StringIO()
+        with self.assertRaisesMessage(CommandError, "1 booking(s) overlap"):
+            call_command("rebuild_room_nights", stdout=out, stderr=err)
+        self.assertIn("Wrote 4 room night(s)", out.getvalue())
+        self.assertIn(f"Booking #{second.pk} overlaps booking #{first.pk}", err.getvalue())
+
+
+class ImportTests(TestCase):
+    """Bad input and overlapping rows end up in the reject report; everything else is imported."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.guest = User.objects.create_user("importer", password="pw")
+        cls.room = Room.objects.create(room_number="801", price=Decimal("65.00"), capacity=2)
+        cls.check_in = date.today() + timedelta(days=50)
+        Booking(
+            user=cls.guest, room=cls.room, check_in=cls.check_in, check_out=cls.check_in + timedelta(days=2),
+        ).save(validate=False)
+
+    def row(self, offset, nights, **fields):
+        check_in = self.check_in + timedelta(days=offset)
+        return {
+            "user": "importer", "room": "801", "check_in": check_in.isoformat(),
+            "check_out": (check_in + timedelta(days=nights)).isoformat(), **fields,
+        }
+
+    def run_import(self, text, input_format):
+        result = import_bookings(read_rows(io.StringIO(text), input_format))
+        return result.imported, {line: reason for line, _, reason in result.rejects}
+
+    def test_overlaps_with_existing_and_earlier_rows_are_rejected(self):
+        rows = [
+            self.row(1, 2),                                  # overlaps the stored booking
+            self.row(2, 3),                                  # free
+            self.row(4, 2),                                  # overlaps the row above
+            self.row(1, 2, status=Booking.STATUS_DECLINED),  # declined rows never block
+        ]
+        imported, rejects = self.run_import(json.dumps(rows), "json")
+        self.assertEqual(imported, 2)
+        self.assertEqual(rejects, {
+            1: "Room is already booked for these dates.",
+            3: "Overlaps an earlier row in this file.",
+        })
+        self.assertEqual(RoomNight.objects.filter(room=self.room).count(), 5)
+
+    def test_malformed_json_is_rejected_per_line(self):
+        lines = [json.dumps(self.row(3, 1)), "{not json", json.dumps(["a", "list"]), json.dumps(self.row(5, 1))]
+        imported, rejects = self.run_import("\n".join(lines), "ndjson")
+        self.assertEqual(imported, 2)
+        self.assertEqual(set(rejects), {2, 3})
+        self.assertTrue(rejects[2].startswith("Invalid JSON"))
+
+    def test_invalid_json_file_is_one_reject(self):
+        for text in ('[{"room": "801"', '{"room": "801"}'):
+            imported, rejects = self.run_import(text, "json")
+            self.assertEqual((imported, list(rejects)), (0, [1]))
+
+    def test_wrongly_typed_values_are_rejected(self):
+        imported, rejects = self.run_import(json.dumps([
+            self.row(3, 1, guests=[2]), self.row(3, 1, status=["pending"]), self.row(3, 1, total_price={}),
+        ]), "json")
+        self.assertEqual((imported, sorted(rejects)), (0, [1, 2, 3]))
+
+
+class ConcurrentImportTests(TransactionTestCase):
+    def test_same_file_imported_twice_at_once_books_each_night_once(self):
+        guest = User.objects.create_user("importer", password="pw")
+        room = Room.objects.create(room_number="802", price=Decimal("65.00"), capacity=2)
+        check_in = date.today() + timedelta(days=90)
+        rows = [
+            {"user": guest.username, "room": room.room_number,
+             "check_in": (check_in + timedelta(days=2 * i)).isoformat(),
+             "check_out": (check_in + timedelta(days=2 * i + 2)).isoformat()}
+            for i in range(50)
+        ]
+        text = "\n".join(json.dumps(row) for row in rows)
+        barrier = threading.Barrier(2)
+
+        def run(_):
+            barrier.wait(timeout=30)
+            try:
+                return import_bookings(read_rows(io.StringIO(text), "ndjson"))
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(run, range(2)))
+
+        self.assertEqual(sorted(result.imported for result in results), [0, len(rows)])
+        self.assertEqual(sorted(len(result.rejects) for result in results), [0, len(rows)])
+        self.assertEqual(Booking.objects.count(), len(rows))
+
+
+class SearchAvailabilityTests(TempMediaMixin, TestCase):
+    """Search results follow booking writes, in this process and in others sharing the cache."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.guest = User.objects.create_user("searcher", password="pw")
+        Room.objects.create(room_number="901", price=Decimal("75.00"), capacity=2)
+        Room.objects.create(room_number="902", price=Decimal("75.00"), capacity=2)
+        cls.check_in = date.today() + timedelta(days=60)
+        cls.check_out = cls.check_in + timedelta(days=3)
+
+    def setUp(self):
+        # The index is process-wide; drop what earlier (rolled back) tests loaded
+        availability_index.invalidate()
+        self.client.force_login(self.guest)
+
+    def free_rooms(self):
+        """Free room numbers, asserting the sync and async search views agree."""
+        params = {"check_in": self.check_in, "check_out": self.check_out}
+        sync, async_ = (
+            {room.room_number for room in self.client.get(path, params).context["available_rooms"]}
+            for path in ("/bookings/search/", "/bookings/search/async/")
+        )
+        self.assertEqual(async_, sync)
+        return sync
+
+    def book(self, room_number):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/bookings/create/", {
+                "room": Room.objects.get(room_number=room_number).pk,
+                "check_in": self.check_in + timedelta(days=1), "check_out": self.check_out,
+                "guests": 1, "notes": "", "total_price": "0",
+            })
+        self.assertEqual(response.status_code, 302)
+        return Booking.objects.latest("pk")
+
+    def test_create_cancel_and_delete(self):
+        self.assertEqual(self.free_rooms(), {"901", "902"})
+
+        booking = self.book("901")
+        self.assertEqual(self.free_rooms(), {"902"})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_transition([booking.pk], Booking.STATUS_DECLINED)
+        self.assertEqual(self.free_rooms(), {"901", "902"})
+
+        booking = self.book("902")
+        self.assertEqual(self.free_rooms(), {"901"})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"/bookings/delete/{booking.pk}")
+        self.assertEqual(self.free_rooms(), {"901", "902"})
+
+    def test_other_processes_reload_after_a_write(self):
+        other = AvailabilityIndex()  # stands in for another worker's copy
+        room_ids = list(Room.objects.order_by("room_number").values_list("pk", flat=True))
+        self.assertEqual(other.free_room_ids(room_ids, self.check_in, self.check_out), room_ids)
+
+        self.book("901")
+        self.assertEqual(other.free_room_ids(room_ids, self.check_in, self.check_out), room_ids[1:])
+
+
+class BulkTransitionTests(TestCase):
+    """A batch approval rejects clashes with stored bookings and with earlier members of the batch."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user("bulk", password="pw", is_staff=True, is_superuser=True)
+        cls.room = Room.objects.create(room_number="1001", price=Decimal("95.00"), capacity=2)
+        cls.other_room = Room.objects.create(room_number="1002", price=Decimal("95.00"), capacity=2)
+        cls.check_in = date.today() + timedelta(days=70)
+
+    def _book(self, offset, nights, room=None, status=Booking.STATUS_DECLINED):
+        # Declined bookings hold no nights, so overlapping ones can be set up freely
+        booking = Booking(
+            user=self.staff, room=room or self.room, check_in=self.check_in + timedelta(days=offset),
+            check_out=self.check_in + timedelta(days=offset + nights), status=status,
+        )
+        booking.save(validate=False)
+        return booking
+
+    def test_conflicts_within_the_batch_and_with_stored_bookings(self):
+        stored = self._book(0, 2, status=Booking.STATUS_APPROVED)
+        clashes_stored = self._book(1, 2)
+        first = self._book(5, 3)
+        overlaps_first = self._book(6, 2)
+        adjacent = self._book(8, 1)
+        same_dates_other_room = self._book(5, 3, room=self.other_room)
+
+        batch = [overlaps_first.pk, clashes_stored.pk, first.pk, adjacent.pk, same_dates_other_room.pk, 999999]
+        results = bulk_transition(batch, Booking.STATUS_APPROVED)
+
+        self.assertEqual(results[clashes_stored.pk], {"success": False, "error": "Room is already booked for these dates."})
+        self.assertEqual(results[overlaps_first.pk], {"success": False, "error": "Overlaps another booking in this batch."})
+        self.assertEqual(results[999999], {"success": False, "error": "Booking not found."})
+        for booking in (first, adjacent, same_dates_other_room):
+            self.assertEqual(results[booking.pk], {"success": True, "status": Booking.STATUS_APPROVED})
+        self.assertEqual(
+            set(Booking.objects.filter(status=Booking.STATUS_APPROVED).values_list("pk", flat=True)),
+            {stored.pk, first.pk, adjacent.pk, same_dates_other_room.pk},
+        )
+        self.assertEqual(RoomNight.objects.filter(booking__in=[first, adjacent, same_dates_other_room]).count(), 7)
+        self.assertFalse(RoomNight.objects.filter(booking__in=[clashes_stored, overlaps_first]).exists())
+
+    def test_bulk_endpoint_reports_per_id(self):
+        first = self._book(10, 2)
+        overlapping = self._book(11, 2)
+        self.client.force_login(self.staff)
+        response = self.client.post(
+            "/dashboard/booking-action/bulk/",
+            json.dumps({"ids": [first.pk, overlapping.pk], "action": "approve"}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.json()["updated"], 1)
+        overlapping.refresh_from_db()
+        self.assertEqual(overlapping.status, Booking.STATUS_DECLINED)
+
+
+class CalendarSpanTests(TestCase):
+    """Run-length spans are clipped to the window and never merge adjacent bookings."""
+
+    START = date(2031, 3, 10)
+    DAYS = 10
+
+    def day(self, offset):
+        return self.START + timedelta(days=offset)
+
+    def spans(self, bookings, room_ids=(1, 2)):
+        grid, bookings = occupancy_grid(list(room_ids), self.START, self.DAYS, bookings)
+        return {room_id: run_length_spans(grid[room_id], bookings) for room_id in room_ids}
+
+    def test_edges(self):
+        bookings = [
+            (10, 1, self.day(-3), self.day(2), "Approved"),   # starts before the window
+            (11, 1, self.day(2), self.day(4), "pending"),     # back to back with the one above
+            (12, 1, self.day(4), self.day(5), "pending"),     # and with this one
+            (13, 1, self.day(8), self.day(15), "Approved"),   # runs past the end
+            (14, 2, self.day(-1), self.day(11), "Approved"),  # covers the whole window
+            (15, 2, self.day(-2), self.day(0), "Approved"),   # checks out on the first day
+        ]
+        self.assertEqual(self.spans(bookings), {
+            1: [[0, 2, 10, "Approved"], [2, 2, 11, "pending"], [4, 1, 12, "pending"], [8, 2, 13, "Approved"]],
+            2: [[0, 10, 14, "Approved"]],
+        })
+
+    def test_empty_and_last_night(self):
+        bookings = [(20, 1, self.day(9), self.day(10), "pending"), (21, 3, self.day(0), self.day(2), "pending")]
+        self.assertEqual(self.spans(bookings), {1: [[9, 1, 20, "pending"]], 2: []})
+
+    def test_calendar_view(self):
+        staff = User.objects.create_user("desk", password="pw", is_staff=True)
+        room = Room.objects.create(room_number="1101", price=Decimal("70.00"), capacity=2)
+        # Checks out on the first day of the window, then the next guest arrives
+        Booking(user=staff, room=room, check_in=self.day(-3), check_out=self.day(0)).save(validate=False)
+        booking = Booking(user=staff, room=room, check_in=self.day(0), check_out=self.day(2))
+        booking.save(validate=False)
+
+        self.client.force_login(staff)
+        params = {"start": self.START, "days": self.DAYS}
+        for path in ("/bookings/calendar/", "/bookings/calendar/async/"):
+            with self.subTest(path=path):
+                response = self.client.get(path, params)
+                [row] = response.json()["rooms"]
+                self.assertEqual(row["spans"], [[0, 2, booking.pk, Booking.STATUS_PENDING]])
+                self.assertEqual(self.client.get(path, params, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+
+
+class SuggestionTests(TestCase):
+    """The gap scan offers one check-in per free gap, as close to the preferred date as the gap allows."""
+
+    def setUp(self):
+        self.base = date.today() + timedelta(days=100)
+
+    def day(self, offset):
+        return self.base + timedelta(days=offset)
+
+    def test_gap_starts(self):
+        intervals = [(self.day(0), self.day(3)), (self.day(5), self.day(6)), (self.day(7), self.day(12))]
+        starts = list(gap_starts(intervals, 2, self.day(1), self.day(-5), self.day(20)))
+        # Before the first stay, the exact fit between the first two, nothing in the one-night gap, after the last
+        self.assertEqual(starts, [self.day(-2), self.day(3), self.day(12)])
+
+    def test_gap_starts_with_nested_stays_and_bounds(self):
+        intervals = [(self.day(0), self.day(10)), (self.day(2), self.day(4))]
+        self.assertEqual(list(gap_starts(intervals, 3, self.day(5), self.day(0), self.day(11))), [self.day(10)])
+        self.assertEqual(list(gap_starts(intervals, 3, self.day(5), self.day(0), self.day(9))), [])
+
+    def test_suggest_alternatives(self):
+        guest = User.objects.create_user("suggested", password="pw")
+        room, free_twin, booked_twin = [
+            Room.objects.create(room_number=f"120{i}", room_type="double", price=Decimal("90.00"), capacity=2)
+            for i in range(3)
+        ]
+        Room.objects.create(room_number="1203", room_type="double", price=Decimal("90.00"), capacity=2,
+                            status="maintenance")
+        Room.objects.create(room_number="1204", room_type="suite", price=Decimal("90.00"), capacity=2)
+        for booked, check_in, check_out in ((room, 0, 3), (room, 5, 6), (booked_twin, 2, 4)):
+            Booking(user=guest, room=booked, check_in=self.day(check_in), check_out=self.day(check_out)).save(validate=False)
+
+        suggestions = suggest_alternatives(room, self.day(1), self.day(3), k=2)
+        self.assertEqual(
+            [(s.check_in, s.check_out, s.distance) for s in suggestions["dates"]],
+            [(self.day(3), self.day(5), 2), (self.day(-2), self.day(0), 3)],
+        )
+        self.assertEqual(suggestions["rooms"], [free_twin])
+
+
+class ExportTests(TestCase):
+    """Exports contain every matching booking exactly once, with every column, in either format."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user("accounts", password="pw", is_staff=True, email="acc@example.com")
+        cls.check_in = date.today() + timedelta(days=40)
+        for i in range(7):
+            room = Room.objects.create(
+                room_number=f"13{i:02d}", room_type="single" if i % 2 else "suite",
+                price=Decimal("70.00"), capacity=2,
+            )
+            Booking(
+                user=cls.staff, room=room, guests=1 + i % 2, check_in=cls.check_in + timedelta(days=i),
+                check_out=cls.check_in + timedelta(days=i + 1 + i % 3),
+                status=Booking.STATUS_APPROVED if i % 3 == 0 else Booking.STATUS_PENDING,
+            ).save(validate=False)
+
+    def expected(self):
+        """Every booking as the exported strings, minus created_at (whose text differs per format)."""
+        return [
+            {
+                "id": str(b.pk), "user": "accounts", "email": "acc@example.com",
+                "room": b.room.room_number, "room_type": b.room.room_type, "check_in": b.check_in.isoformat(),
+                "check_out": b.check_out.isoformat(), "guests": str(b.guests), "total_price": str(b.total_price),
+                "status": b.status,
+            }
+            for b in Booking.objects.select_related("room").order_by("created_at", "id")
+        ]
+
+    def export(self, **params):
+        self.client.force_login(self.staff)
+        response = self.client.get("/bookings/export/", params)
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_and_ndjson_hold_every_row_and_column(self):
+        columns = [name for name, _ in EXPORT_COLUMNS]
+        reader = csv.DictReader(io.StringIO(self.export()))
+        rows = list(reader)
+        self.assertEqual(reader.fieldnames, columns)
+        self.assertTrue(all(row.pop("created_at") for row in rows))
+        self.assertEqual(rows, self.expected())
+
+        lines = [json.loads(line) for line in self.export(format="ndjson").splitlines()]
+        self.assertTrue(all(list(line) == columns for line in lines))
+        self.assertTrue(all(line.pop("created_at") for line in lines))
+        self.assertEqual([{key: str(value) for key, value in line.items()} for line in lines], self.expected())
+
+    def test_rows_survive_chunk_boundaries_and_filters(self):
+        ordered = Booking.objects.order_by("created_at", "id")
+        self.assertEqual([row[0] for row in export_rows(chunk_size=2)], list(ordered.values_list("id", flat=True)))
+
+        start = self.check_in + timedelta(days=2)
+        rows = list(csv.DictReader(io.StringIO(self.export(status=Booking.STATUS_APPROVED, start=start))))
+        approved = ordered.filter(status=Booking.STATUS_APPROVED, check_in__gte=start)
+        self.assertEqual([int(row["id"]) for row in rows], list(approved.values_list("id", flat=True)))
+        self.assertEqual(len(rows), 2)
+
+
+class BenchmarkSeedingTests(TestCase):
+    def test_clear_removes_only_seeded_rows(self):
+        recompute_dashboard_stats()
+        # Real data that merely looks like benchmark data, in any case
+        guests = [User.objects.create_user(name, password="pw") for name in ("Benchley", "bench_admin", "bench00000")]
+        rooms = [
+            Room.objects.create(room_number=number, price=Decimal("70.00"), capacity=2)
+            for number in ("BENCH-1", "bench00001")
+        ]
+        kept = []
+        for i, (guest, room) in enumerate(zip(guests, rooms + rooms)):
+            booking = Booking(user=guest, room=room, check_in=date.today() + timedelta(days=5 + 3 * i),
+                              check_out=date.today() + timedelta(days=7 + 3 * i))
+            booking.save(validate=False)
+            kept.append(booking)
+        _, users, _ = seed_benchmark_data(rooms=5, users=3, bookings=40, seed=1)
+        # A benchmark guest staying in a real room goes too
+        Booking(user=users[0], room=rooms[0], check_in=date.today() + timedelta(days=30),
+                check_out=date.today() + timedelta(days=31)).save(validate=False)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            clear_benchmark_data()
+        self.assertCountEqual(Booking.objects.all(), kept)
+        self.assertEqual(set(RoomNight.objects.values_list("booking", flat=True)), {b.pk for b in kept})
+        self.assertCountEqual(Room.objects.all(), rooms)
+        self.assertCountEqual(User.objects.all(), guests)
+        self.assertFalse(BenchmarkRecord.objects.exists())
+        self.assertEqual(get_dashboard_stats().total_bookings, len(kept))
+
+
+class AvailabilityApiTests(TestCase):
+    """Repeat queries are served from the cache until a booking write changes the ETag."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.guest = User.objects.create_user("api", password="pw")
+        cls.rooms = [
+            Room.objects.create(room_number=f"160{i}", room_type="double", price=Decimal("90.00"), capacity=2)
+            for i in range(2)
+        ]
+        cls.check_in = date.today() + timedelta(days=70)
+        cls.params = {"check_in": cls.check_in, "check_out": cls.check_in + timedelta(days=2)}
+
+    def setUp(self):
+        # Cached payloads, versions, the index and rate tables all outlive the previous test's rollback
+        cache.clear()
+        availability_index.invalidate()
+        rate_tables.clear()
+
+    def get(self, **headers):
+        return self.client.get("/api/availability", self.params, headers=headers)
+
+    def free(self):
+        response = self.get()
+        return response["ETag"], [room["number"] for room in response.json()["rooms"]]
+
+    def test_warm_hit_and_not_modified_run_no_queries(self):
+        first = self.get()
+        self.assertEqual(first.json()["count"], 2)
+        self.assertEqual(first.json()["rooms"][0]["total_price"], "180.00")
+        with self.assertNumQueries(0):
+            again = self.get()
+        self.assertEqual(again.json(), first.json())
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get(if_none_match=first["ETag"]).status_code, 304)
+
+    def test_writes_change_the_etag(self):
+        etag, free = self.free()
+        self.assertEqual(free, ["1600", "1601"])
+
+        booking = Booking(user=self.guest, room=self.rooms[0], check_in=self.check_in,
+                          check_out=self.check_in + timedelta(days=1))
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.save()
+        self.assertEqual(self.get(if_none_match=etag).status_code, 200)
+        etag, free = self.free()
+        self.assertEqual(free, ["1601"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_transition([booking.pk], Booking.STATUS_APPROVED)
+        approved_etag, free = self.free()
+        self.assertNotEqual(approved_etag, etag)
+        self.assertEqual(free, ["1601"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.delete()
+        deleted_etag, free = self.free()
+        self.assertNotEqual(deleted_etag, approved_etag)
+        self.assertEqual(free, ["1600", "1601"])
+
+    def test_invalid_query(self):
+        response = self.client.get("/api/availability", {"check_in": self.check_in, "check_out": self.check_in})
+        self.assertEqual(response.status_code, 400)
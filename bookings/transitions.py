@@ -0,0 +1,111 @@
+# bookings/transitions.py
+from collections import defaultdict
+
+from django.db import transaction
+
+from .availability import RoomIntervals, availability_index
+from .cache import bump_bookings_version
+from .models import Booking, RoomNight
+from .occupancy import stay_nights
+
+ACTIONS = {
+    "approve": Booking.STATUS_APPROVED,
+    "decline": Booking.STATUS_DECLINED,
+}
+
+
+def _find_conflicts(bookings):
+    """
+    Bookings (being approved) that would overlap another non-declined booking.
+    One query loads every potential blocker outside the batch; the batch is
+    then swept in check-in order per room, so two members of the same batch
+    that overlap each other are caught too (the earlier one wins).
+    Returns {booking_id: message}.
+    """
+    if not bookings:
+        return {}
+
+    batch_ids = [b.pk for b in bookings]
+    blockers = (
+        Booking.objects.filter(
+            room_id__in={b.room_id for b in bookings},
+            check_in__lt=max(b.check_out for b in bookings),
+            check_out__gt=min(b.check_in for b in bookings),
+        )
+        .exclude(status=Booking.STATUS_DECLINED)
+        .exclude(pk__in=batch_ids)
+        .order_by()
+        .values_list("room_id", "check_in", "check_out", "id")
+    )
+    existing = defaultdict(RoomIntervals)
+    for room_id, check_in, check_out, booking_id in blockers:
+        existing[room_id].add(check_in, check_out, booking_id)
+
+    accepted = defaultdict(RoomIntervals)
+    conflicts = {}
+    for booking in sorted(bookings, key=lambda b: (b.room_id, b.check_in, b.created_at, b.pk)):
+        if not existing[booking.room_id].is_free(booking.check_in, booking.check_out):
+            conflicts[booking.pk] = "Room is already booked for these dates."
+        elif not accepted[booking.room_id].is_free(booking.check_in, booking.check_out):
+            conflicts[booking.pk] = "Overlaps another booking in this batch."
+        else:
+            accepted[booking.room_id].add(booking.check_in, booking.check_out, booking.pk)
+    return conflicts
+
+
+@transaction.atomic
+def bulk_transition(booking_ids, status):
+    """
+    Move many bookings to `status` in one transaction.
+    Validates the whole batch in one pass, writes every accepted row with a
+    single UPDATE, then resyncs the occupancy table, the dashboard stats and
+    the availability index (queryset.update() sends no signals).
+    Returns {booking_id: {"success": bool, "status" | "error": str}}.
+    """
+    from dashboard.stats import apply_booking_changes, stored_facts  # dashboard depends on bookings
+
+    ids = list(dict.fromkeys(booking_ids))
+    bookings = {b.pk: b for b in Booking.objects.select_for_update().filter(pk__in=ids)}
+    results = {}
+
+    to_change = []
+    for booking_id in ids:
+        booking = bookings.get(booking_id)
+        if booking is None:
+            results[booking_id] = {"success": False, "error": "Booking not found."}
+        elif booking.status == status:
+            results[booking_id] = {"success": True, "status": status}
+        else:
+            to_change.append(booking)
+
+    conflicts = _find_conflicts(to_change) if status != Booking.STATUS_DECLINED else {}
+    accepted = []
+    for booking in to_change:
+        if booking.pk in conflicts:
+            results[booking.pk] = {"success": False, "error": conflicts[booking.pk]}
+        else:
+            accepted.append(booking)
+            results[booking.pk] = {"success": True, "status": status}
+
+    if not accepted:
+        return results
+
+    accepted_ids = [b.pk for b in accepted]
+    before = stored_facts(Booking.objects.filter(pk__in=accepted_ids))
+    Booking.objects.filter(pk__in=accepted_ids).update(status=status)
+    for booking in accepted:
+        booking.status = status
+
+    # Occupancy: declined bookings release their nights, others hold them
+    RoomNight.objects.filter(booking_id__in=accepted_ids).delete()
+    if status != Booking.STATUS_DECLINED:
+        RoomNight.objects.bulk_create(
+            RoomNight(room_id=b.room_id, booking_id=b.pk, date=night)
+            for b in accepted
+            for night in stay_nights(b.check_in, b.check_out)
+        )
+
+    apply_booking_changes([(facts, facts._replace(status=status)) for facts in before.values()])
+    transaction.on_commit(lambda: availability_index.update_bookings(accepted))
+    transaction.on_commit(bump_bookings_version)
+    return results
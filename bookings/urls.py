@@ -11,6 +11,14 @@ urlpatterns = [
     path('delete/<int:pk>', views.booking_delete, name='booking_delete'),
 path("edit/<int:pk>/", views.booking_edit, name="edit"),
     path('search/', views.search_availability, name='search-availability'),
+    path('search/async/', views.search_availability_async, name='search-availability-async'),
+    path('all/', views.booking_list, name='all_bookings'),
+    path('pending/', views.pending_bookings_list, name='pending_list'),
+    path('approve/<int:pk>/', views.approve_booking, name='approve'),
+    path('decline/<int:pk>/', views.decline_booking, name='decline'),
+    path('export/', views.booking_export, name='export'),
+    path('calendar/', views.booking_calendar, name='calendar'),
+    path('calendar/async/', views.booking_calendar_async, name='calendar-async'),
 
 
 
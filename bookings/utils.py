@@ -1,6 +1,12 @@
 # bookings/utils.py
+from asgiref.sync import sync_to_async
 from django.db.models import Q
+from .availability import availability_index
 from .models import Booking
+from rooms.models import Room
+
+UNAVAILABLE_ROOM_STATUSES = Room.UNAVAILABLE_STATUSES
+
 
 def bookings_conflict(room, new_check_in, new_check_out, exclude_booking_id=None):
     """
@@ -16,3 +22,86 @@ def bookings_conflict(room, new_check_in, new_check_out, exclude_booking_id=None
         Q(check_in__lt=new_check_out) & Q(check_out__gt=new_check_in)
     )
     return conflict_q.exists()
+
+
+def booking_validation_errors(booking, room=None):
+    """
+    Single availability-validation pass for a booking write.
+    Returns a dict of field -> message (empty when the booking is valid):
+     - check_in < check_out
+     - guests <= room.capacity
+     - room not under maintenance / out of service
+     - no overlapping non-declined booking
+    `room` lets callers pass a Room they already hold so it is never re-fetched.
+    The overlap query runs at most once, and only when everything else is valid.
+    """
+    errors = {}
+
+    if booking.check_in and booking.check_out and booking.check_in >= booking.check_out:
+        errors["check_in"] = "Check-in date must be before check-out date."
+
+    if room is None and booking.room_id is not None:
+        room = booking.room
+    if room is None:
+        errors["room"] = "A room must be selected."
+        return errors
+
+    if booking.guests and booking.guests > room.capacity:
+        errors["guests"] = f"Number of guests ({booking.guests}) exceeds room capacity ({room.capacity})."
+
+    if room.status in UNAVAILABLE_ROOM_STATUSES:
+        errors["room"] = "Selected room is currently unavailable (maintenance or out of service)."
+
+    if not errors and booking.check_in and booking.check_out:
+        if bookings_conflict(room, booking.check_in, booking.check_out, exclude_booking_id=booking.pk):
+            errors["room"] = "Selected room is already booked for the chosen dates."
+
+    return errors
+
+
+def bookable_rooms(room_type=None, guests=None):
+    """Rooms of the given type and capacity that are not under maintenance or out of service."""
+    rooms_qs = Room.objects.exclude(status__in=UNAVAILABLE_ROOM_STATUSES)
+    if room_type:
+        rooms_qs = rooms_qs.filter(room_type=room_type)
+    if guests:
+        rooms_qs = rooms_qs.filter(capacity__gte=guests)
+    return rooms_qs
+
+
+def find_available_rooms(check_in, check_out, room_type=None, guests=None):
+    """
+    Bookable rooms for [check_in, check_out) without an overlapping
+    non-declined booking according to the in-process availability index.
+    """
+    rooms = list(bookable_rooms(room_type, guests))
+    free_ids = set(availability_index.free_room_ids([room.pk for room in rooms], check_in, check_out))
+    return [room for room in rooms if room.pk in free_ids]
+
+
+async def afind_available_rooms(check_in, check_out, room_type=None, guests=None):
+    """Async version of find_available_rooms(); the index may reload from the DB, so it runs via sync_to_async."""
+    rooms = [room async for room in bookable_rooms(room_type, guests)]
+    free_ids = set(await sync_to_async(availability_index.free_room_ids)(
+        [room.pk for room in rooms], check_in, check_out
+    ))
+    return [room for room in rooms if room.pk in free_ids]
+
+
+def lock_room(room_id):
+    """
+    Lock the Room row so concurrent writers for the same room serialize their
+    check-then-insert. Must be called inside transaction.atomic().
+    select_for_update() is a no-op on SQLite; there the IMMEDIATE transaction
+    mode in settings.DATABASES already takes the write lock at BEGIN.
+    """
+    try:
+        room_id = int(room_id)
+    except (TypeError, ValueError):
+        return None  # let form validation report the bad value
+    return Room.objects.select_for_update().filter(pk=room_id).first()
+
+
+def lock_rooms(room_ids):
+    """lock_room() for many rooms at once, in pk order so concurrent callers cannot deadlock."""
+    return list(Room.objects.select_for_update().filter(pk__in=room_ids).order_by("pk").values_list("pk", flat=True))
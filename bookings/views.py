@@ -1,14 +1,34 @@
+import hashlib
+
+from asgiref.sync import sync_to_async
 from django.contrib.admin.views.decorators import staff_member_required
-from django.http import HttpResponseForbidden
+from django.http import HttpResponseBadRequest, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from .models import Booking
-from .forms import SearchAvailabilityForm, BookingForm
+from .forms import (
+    SearchAvailabilityForm, BookingForm, BookingFilterForm, BookingExportForm, CalendarForm, AvailabilityQueryForm,
+)
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.db import transaction
-
-from .utils import bookings_conflict
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.views.decorators.http import condition, require_GET, require_POST
+
+from .cache import bookings_version, get_or_build
+from .export import EXPORT_FORMATS, export_rows, iter_export
+from .grid import calendar_payload, calendar_rooms, window_bookings
+from .pagination import keyset_paginate, pager_links
+from .suggestions import suggest_alternatives
+from .transitions import bulk_transition
+from .utils import afind_available_rooms, find_available_rooms, lock_room
+from ReservO.db import use_replica
+from rooms.cache import catalog_version
 from rooms.models import Room
+from rooms.rates import annotate_stay_totals, quote_many
+
+BOOKINGS_PER_PAGE = 50
+AVAILABILITY_API_TTL = 30  # seconds
 
 
 # -----------------------------
@@ -16,6 +36,7 @@ from rooms.models import Room
 # -----------------------------
 # from django.db.models import Q
 
+@use_replica
 def search_availability(request):
     """
     Page where users enter check-in/out and get a list of available rooms.
@@ -31,46 +52,60 @@ def search_availability(request):
         if check_in >= check_out:
             messages.error(request, "Check-out must be after check-in.")
         else:
-            # start with all rooms
-            rooms_qs = Room.objects.all()
+            # Filters by room_type (and guests if present), skips rooms under
+            # maintenance and drops rooms with an overlapping booking
+            available_rooms = find_available_rooms(
+                check_in,
+                check_out,
+                room_type=form.cleaned_data.get('room_type'),
+                guests=form.cleaned_data.get('guests'),
+            )
+            annotate_stay_totals(available_rooms, check_in, check_out)
 
-            # apply room_type filter if the form provides it
-            room_type = form.cleaned_data.get('room_type')
-            if room_type:
-                rooms_qs = rooms_qs.filter(room_type=room_type)
-
-            # apply guests/capacity filter if your form has it
-            guests = form.cleaned_data.get('guests')
-            if guests:
-                # assumes Room has a 'capacity' integer field
-                rooms_qs = rooms_qs.filter(capacity__gte=guests)
+    context = {
+        'form': form,
+        'available_rooms': available_rooms,
+    }
+    return render(request, 'bookings/search_availability.html', context)
 
-            # Exclude rooms that have bookings overlapping the requested period.
-            # Overlap condition: booking.check_in < check_out AND booking.check_out > check_in
-            conflicting_bookings = Booking.objects.filter(
-                room__in=rooms_qs,
-                check_in__lt=check_out,
-                check_out__gt=check_in
-            ).values_list('room_id', flat=True).distinct()
 
-            rooms_qs = rooms_qs.exclude(id__in=conflicting_bookings)
+@use_replica
+async def search_availability_async(request):
+    """
+    search_availability for ASGI: the room query runs as async iteration and
+    only the availability index and template rendering go through
+    sync_to_async, so the event loop is never blocked on the database.
+    """
+    # The form reads the room catalog cache, which may query on a miss
+    form = await sync_to_async(SearchAvailabilityForm)(request.GET or None)
+    available_rooms = None
 
-            # At this point rooms_qs contains only rooms matching filters and WITHOUT overlapping bookings.
-            # If you still want per-room custom checks (e.g. considering only APPROVED bookings),
-            # you can either change the Booking filter above to .filter(status=...) or fallback to bookings_conflict loop.
+    if form.is_valid():
+        check_in = form.cleaned_data['check_in']
+        check_out = form.cleaned_data['check_out']
 
-            available_rooms = list(rooms_qs)
+        if check_in >= check_out:
+            messages.error(request, "Check-out must be after check-in.")
+        else:
+            available_rooms = await afind_available_rooms(
+                check_in,
+                check_out,
+                room_type=form.cleaned_data.get('room_type'),
+                guests=form.cleaned_data.get('guests'),
+            )
+            await sync_to_async(annotate_stay_totals)(available_rooms, check_in, check_out)
 
     context = {
         'form': form,
         'available_rooms': available_rooms,
     }
-    return render(request, 'bookings/search_availability.html', context)
+    return await sync_to_async(render)(request, 'bookings/search_availability.html', context)
 
 
 # -----------------------------
 # BOOKING LIST
 # -----------------------------
+@use_replica
 @login_required
 def booking_list(request):
     """
@@ -78,12 +113,21 @@ def booking_list(request):
     Users see only their own.
     """
     if request.user.is_staff:
-        bookings = Booking.objects.all()
+        bookings = Booking.objects.for_listing()
     else:
-        bookings = Booking.objects.filter(user=request.user)
+        bookings = Booking.objects.for_listing().filter(user=request.user)
+
+    # Newest first, paginated with a (created_at, id) cursor
+    filter_form = BookingFilterForm(request.GET or None)
+    page = keyset_paginate(
+        filter_form.filter(bookings), 'created_at',
+        cursor=request.GET.get('after'), per_page=BOOKINGS_PER_PAGE, descending=True,
+    )
 
     return render(request, 'bookings/booking_list.html', {
-        'bookings': bookings
+        'bookings': page,
+        'filter_form': filter_form,
+        **pager_links(request, page),
     })
 
 
@@ -93,59 +137,57 @@ def booking_list(request):
 @login_required
 @transaction.atomic
 def booking_create(request):
+    suggestions = None
     if request.method == 'POST':
-        form = BookingForm(request.POST)
+        # Serialize writers for this room before the availability check
+        room = lock_room(request.POST.get('room'))
+        form = BookingForm(request.POST, room=room)
 
+        # is_valid() runs Booking.clean(), which performs the single overlap check
+        # against the Room instance the form already loaded.
         if form.is_valid():
             booking = form.save(commit=False)
             booking.user = request.user
-
-            # check conflicts
-            if bookings_conflict(booking.room, booking.check_in, booking.check_out):
-                messages.error(request, "Room is NOT available for the selected dates.")
-                return render(request, 'bookings/booking_form.html', {'form': form})
-
-            booking.total_price = booking.calculate_total_price()
             booking.save()
             messages.success(request, "Booking created successfully.")
             return redirect('bookings:booking_list')
 
+        if form.has_error('room'):
+            messages.error(request, "Room is NOT available for the selected dates.")
+            booking = form.instance
+            if booking.room_id and booking.check_in and booking.check_out and booking.check_in < booking.check_out:
+                suggestions = suggest_alternatives(booking.room, booking.check_in, booking.check_out, guests=booking.guests)
+
     else:
-        form = BookingForm()
+        # Suggestion links prefill the form through the query string
+        form = BookingForm(initial={
+            key: request.GET[key] for key in ('room', 'check_in', 'check_out', 'guests') if request.GET.get(key)
+        })
 
-    return render(request, 'bookings/booking_form.html', {'form': form})
+    return render(request, 'bookings/booking_form.html', {'form': form, 'suggestions': suggestions})
 
 
 # -----------------------------
 # BOOKING UPDATE (Admin or Internal Use)
 # -----------------------------
 @login_required
+@transaction.atomic
 def booking_update(request, pk):
     booking = get_object_or_404(Booking, pk=pk)
-    old_room = booking.room
-    old_in = booking.check_in
-    old_out = booking.check_out
 
     if request.method == 'POST':
-        form = BookingForm(request.POST, instance=booking)
+        room = lock_room(request.POST.get('room'))
+        form = BookingForm(request.POST, instance=booking, room=room)
 
+        # Form validation already re-checked availability (excluding this booking)
         if form.is_valid():
-            new_booking = form.save(commit=False)
-
-            # re-check only if something changed
-            if (new_booking.room != old_room or
-                    new_booking.check_in != old_in or
-                    new_booking.check_out != old_out):
-
-                if bookings_conflict(new_booking.room, new_booking.check_in, new_booking.check_out, exclude_booking_id=pk):
-                    messages.error(request, "Room is not available for updated dates.")
-                    return render(request, 'bookings/booking_form.html', {'form': form})
-
-            new_booking.total_price = new_booking.calculate_total_price()
-            new_booking.save()
+            form.save()
             messages.success(request, "Booking updated successfully.")
             return redirect('accounts:profile')
 
+        if form.has_error('room'):
+            messages.error(request, "Room is not available for updated dates.")
+
     else:
         form = BookingForm(instance=booking)
 
@@ -181,29 +223,44 @@ def is_admin(user):
     return user.is_staff or user.is_superuser
 
 
+@use_replica
 @user_passes_test(is_admin)
 def pending_bookings_list(request):
-    bookings = Booking.objects.filter(status=Booking.STATUS_PENDING).select_related('room', 'user')
-    return render(request, 'bookings/pending_list.html', {'bookings': bookings})
+    # Earliest arrivals first, paginated with a (check_in, id) cursor
+    filter_form = BookingFilterForm(request.GET or None)
+    filter_form.fields.pop('status')  # the queue is pending-only
+    bookings = Booking.objects.for_listing().filter(status=Booking.STATUS_PENDING)
+    page = keyset_paginate(
+        filter_form.filter(bookings), 'check_in',
+        cursor=request.GET.get('after'), per_page=BOOKINGS_PER_PAGE,
+    )
+    return render(request, 'bookings/pending_list.html', {
+        'bookings': page,
+        'filter_form': filter_form,
+        **pager_links(request, page),
+    })
 
 
 @staff_member_required
+@require_POST
 def approve_booking(request, pk):
-    booking = get_object_or_404(Booking, pk=pk)
-    booking.status = Booking.STATUS_APPROVED
-    booking.save()
-
-    messages.success(request, f"Booking #{booking.id} approved successfully.")
+    # Same path as the bulk action: overlap check, occupancy and stats in one transaction
+    result = bulk_transition([pk], Booking.STATUS_APPROVED)[pk]
+    if result['success']:
+        messages.success(request, f"Booking #{pk} approved successfully.")
+    else:
+        messages.error(request, f"Booking #{pk} could not be approved: {result['error']}")
     return redirect('bookings:booking_list')
 
 
 @staff_member_required
+@require_POST
 def decline_booking(request, pk):
-    booking = get_object_or_404(Booking, pk=pk)
-    booking.status = Booking.STATUS_DECLINED
-    booking.save()
-
-    messages.success(request, f"Booking #{booking.id} declined.")
+    result = bulk_transition([pk], Booking.STATUS_DECLINED)[pk]
+    if result['success']:
+        messages.success(request, f"Booking #{pk} declined.")
+    else:
+        messages.error(request, f"Booking #{pk} could not be declined: {result['error']}")
     return redirect('bookings:booking_list')
 
 
@@ -211,6 +268,7 @@ def decline_booking(request, pk):
 # BOOKING EDIT (User Only)
 # -----------------------------
 @login_required
+@transaction.atomic
 def booking_edit(request, pk):
     booking = get_object_or_404(Booking, pk=pk)
 
@@ -222,19 +280,16 @@ def booking_edit(request, pk):
         return redirect("accounts:profile")
 
     if request.method == "POST":
-        form = BookingForm(request.POST, instance=booking)
+        room = lock_room(request.POST.get("room"))
+        form = BookingForm(request.POST, instance=booking, room=room)
         if form.is_valid():
-            edited = form.save(commit=False)
-
-            if bookings_conflict(
-                    edited.room, edited.check_in, edited.check_out, exclude_booking_id=booking.pk):
-                messages.error(request, "Room is not available for those dates.")
-                return redirect("accounts:profile")
-
-            edited.total_price = edited.calculate_total_price()
-            edited.save()
+            form.save()
             messages.success(request, "Booking updated successfully.")
             return redirect("accounts:profile")
+
+        if form.has_error("room"):
+            messages.error(request, "Room is not available for those dates.")
+            return redirect("accounts:profile")
     else:
         form = BookingForm(instance=booking)
 
@@ -244,7 +299,145 @@ def booking_edit(request, pk):
 # -----------------------------
 # USER BOOKINGS PAGE
 # -----------------------------
+@use_replica
 @login_required
 def my_bookings(request):
-    bookings = Booking.objects.filter(user=request.user).order_by('-check_in')
+    bookings = Booking.objects.for_listing().filter(user=request.user).order_by('-check_in')
     return render(request, 'bookings/my_bookings.html', {'bookings': bookings})
+
+
+
+# -----------------------------
+# EXPORT (Accounting)
+# -----------------------------
+@staff_member_required
+def booking_export(request):
+    """
+    Stream every booking matching ?status&start&end&since as CSV or NDJSON
+    (?format=csv|ndjson). Rows are generated lazily, so memory stays flat.
+    """
+    form = BookingExportForm(request.GET)
+    if not form.is_valid():
+        return HttpResponseBadRequest(form.errors.as_text())
+
+    data = form.cleaned_data
+    rows = export_rows(status=data['status'], start=data['start'], end=data['end'], since=data['since'])
+    response = StreamingHttpResponse(iter_export(data['format'], rows), content_type=EXPORT_FORMATS[data['format']])
+    response['Content-Disposition'] = f'attachment; filename="bookings.{data["format"]}"'
+    return response
+
+
+# -----------------------------
+# CALENDAR (Front desk)
+# -----------------------------
+def calendar_etag(request):
+    form = CalendarForm(request.GET)
+    if not form.is_valid():
+        return None
+    data = form.cleaned_data
+    return f"cal-{bookings_version()}-{catalog_version()}-{data['start'].isoformat()}-{data['days']}"
+
+
+@staff_member_required
+@condition(etag_func=calendar_etag)
+def booking_calendar(request):
+    """
+    Room x date grid for ?start=YYYY-MM-DD&days=1..90 (default: today, 30)
+    as JSON with run-length encoded spans per room. The ETag changes with
+    every booking or room write, so polling an unchanged grid gets a 304.
+    Served from the primary: the ETag is built from the current versions, so
+    the body must not come from a replica that may not have those writes yet.
+    """
+    form = CalendarForm(request.GET)
+    if not form.is_valid():
+        return HttpResponseBadRequest(form.errors.as_text())
+
+    response = JsonResponse(calendar_payload(form.cleaned_data['start'], form.cleaned_data['days']))
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+@staff_member_required
+async def booking_calendar_async(request):
+    """
+    booking_calendar for ASGI: the window's bookings are read with async
+    iteration. condition() would call calendar_etag(), which reads the
+    version keys from the cache, on the event loop, so the ETag is built
+    in a thread here instead.
+    """
+    form = CalendarForm(request.GET)
+    if not form.is_valid():
+        return HttpResponseBadRequest(form.errors.as_text())
+
+    etag = quote_etag(await sync_to_async(calendar_etag)(request))
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    start, days = form.cleaned_data['start'], form.cleaned_data['days']
+    rooms = await sync_to_async(calendar_rooms)()
+    bookings = [row async for row in window_bookings(start, days)]
+    response = JsonResponse(calendar_payload(start, days, rooms, bookings))
+    response['Cache-Control'] = 'private, no-cache'
+    response['ETag'] = etag
+    return response
+
+
+# -----------------------------
+# PUBLIC AVAILABILITY API
+# -----------------------------
+def availability_api_key(request):
+    """Cache key / ETag for a valid query: the booking and room versions plus a digest of the parameters."""
+    form = AvailabilityQueryForm(request.GET)
+    if not form.is_valid():
+        return None
+    data = form.cleaned_data
+    params = f"{data['check_in']}|{data['check_out']}|{data['room_type']}|{data['guests'] or ''}"
+    digest = hashlib.sha1(params.encode()).hexdigest()[:16]
+    return f"avail-{bookings_version()}-{catalog_version()}-{digest}"
+
+
+def availability_payload(check_in, check_out, room_type=None, guests=None):
+    nights = (check_out - check_in).days
+    rooms = find_available_rooms(check_in, check_out, room_type=room_type, guests=guests)
+    totals = quote_many((room, check_in, check_out) for room in rooms)
+    return {
+        "check_in": check_in.isoformat(),
+        "check_out": check_out.isoformat(),
+        "nights": nights,
+        "count": len(rooms),
+        "rooms": [
+            {
+                "id": room.pk,
+                "number": room.room_number,
+                "type": room.room_type,
+                "capacity": room.capacity,
+                "price": str(room.price),
+                "total_price": str(total),
+            }
+            for room, total in zip(rooms, totals)
+        ],
+    }
+
+
+@require_GET
+@condition(etag_func=availability_api_key)
+def availability_api(request):
+    """
+    GET /api/availability?check_in&check_out[&room_type][&guests] as JSON,
+    for the public site and the mobile app. Same rules as search_availability.
+    Responses are cached per query until any booking or room changes (or
+    for AVAILABILITY_API_TTL seconds), so repeat searches skip the database.
+    """
+    form = AvailabilityQueryForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors.get_json_data()}, status=400)
+
+    payload = get_or_build(
+        f"bookings:api:availability:{availability_api_key(request)}",
+        lambda: availability_payload(**form.cleaned_data),
+        AVAILABILITY_API_TTL,
+    )
+    response = JsonResponse(payload)
+    response['Cache-Control'] = f'public, max-age={AVAILABILITY_API_TTL}'
+    return response
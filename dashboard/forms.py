@@ -0,0 +1,20 @@
+from django import forms
+from bookings.models import Booking
+from rooms.models import Room
+from .stats import TIMESERIES_TRUNC
+
+
+class TimeSeriesForm(forms.Form):
+    granularity = forms.ChoiceField(choices=[(g, g) for g in TIMESERIES_TRUNC], required=False)
+    start = forms.DateField(required=False)
+    end = forms.DateField(required=False)
+    room_type = forms.ChoiceField(choices=[("", "")] + Room.ROOM_TYPES, required=False)
+    status = forms.ChoiceField(choices=[("", "")] + Booking.STATUS_CHOICES, required=False)
+
+    def clean(self):
+        cleaned = super().clean()
+        start, end = cleaned.get("start"), cleaned.get("end")
+        if start and end and start > end:
+            raise forms.ValidationError("start must not be after end.")
+        cleaned["granularity"] = cleaned.get("granularity") or "month"
+        return cleaned
@@ -0,0 +1,234 @@
+# dashboard/instrumentation.py
+import contextvars
+import json
+import os
+import statistics
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.base import Template
+
+SAMPLE_FIELDS = ("latency_ms", "queries", "sql_ms", "template_ms")
+FLUSH_INTERVAL = 10  # seconds between snapshot files
+MAX_SIGNATURES = 100  # duplicate-query signatures kept per endpoint
+
+# Per-request accumulator, visible to the SQL wrapper and the template timer
+_current = contextvars.ContextVar("request_metrics", default=None)
+
+
+class RequestStats:
+    __slots__ = ("queries", "sql_ms", "template_ms", "in_template", "signatures")
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_ms = 0.0
+        self.template_ms = 0.0
+        self.in_template = False
+        self.signatures = Counter()
+
+    def sql_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_ms += (time.perf_counter() - started) * 1000
+            self.queries += 1
+            # The SQL still has its placeholders, so repeats with other params share a signature
+            self.signatures[sql] += 1
+
+
+class MetricsRecorder:
+    """
+    Rolling per-endpoint samples for this process: one bounded deque per URL
+    name (old samples fall off the end) plus a tally of duplicate queries.
+    """
+
+    def __init__(self, buffer_size=1000):
+        self._lock = threading.Lock()
+        self.buffer_size = buffer_size
+        self._samples = defaultdict(lambda: deque(maxlen=self.buffer_size))
+        self._duplicates = defaultdict(Counter)
+        self._last_flush = time.monotonic()
+
+    def record(self, endpoint, sample, duplicates):
+        with self._lock:
+            self._samples[endpoint].append(sample)
+            if duplicates:
+                tally = self._duplicates[endpoint]
+                tally.update(duplicates)
+                if len(tally) > MAX_SIGNATURES:
+                    self._duplicates[endpoint] = Counter(dict(tally.most_common(MAX_SIGNATURES // 2)))
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._duplicates.clear()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "taken_at": time.time(),
+                "endpoints": {
+                    endpoint: {
+                        "samples": [list(sample) for sample in samples],
+                        "duplicates": dict(self._duplicates.get(endpoint, {})),
+                    }
+                    for endpoint, samples in self._samples.items()
+                },
+            }
+
+    def maybe_flush(self, directory):
+        """Write this process's snapshot to <directory>/<pid>.json at most every FLUSH_INTERVAL seconds."""
+        now = time.monotonic()
+        if now - self._last_flush < FLUSH_INTERVAL:
+            return
+        self._last_flush = now
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        target = directory / f"{os.getpid()}.json"
+        tmp = target.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.snapshot()))
+        os.replace(tmp, target)
+
+
+recorder = MetricsRecorder(getattr(settings, "REQUEST_METRICS_BUFFER_SIZE", 1000))
+
+
+# -----------------------------
+# TEMPLATE TIMER
+# -----------------------------
+_original_render = Template._render
+
+
+def _timed_render(self, context):
+    stats = _current.get()
+    # Only the outermost template is timed; {% include %}/{% extends %} render inside it
+    if stats is None or stats.in_template:
+        return _original_render(self, context)
+    stats.in_template = True
+    started = time.perf_counter()
+    try:
+        return _original_render(self, context)
+    finally:
+        stats.template_ms += (time.perf_counter() - started) * 1000
+        stats.in_template = False
+
+
+def install_template_timer():
+    Template._render = _timed_render
+
+
+# -----------------------------
+# MIDDLEWARE
+# -----------------------------
+class RequestMetricsMiddleware:
+    """
+    Opt-in (settings.REQUEST_METRICS_ENABLED) per-view latency, SQL count and
+    time, template render time and duplicate-query signatures. When disabled
+    it raises MiddlewareNotUsed, so Django drops it from the chain entirely.
+
+    SQL run by async views through sync_to_async happens on another thread's
+    connection and is not counted.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_METRICS_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        install_template_timer()
+
+    def __call__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(stats.sql_wrapper))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        match = request.resolver_match
+        endpoint = match.view_name if match else "<unresolved>"
+        duplicates = {sql: count - 1 for sql, count in stats.signatures.items() if count > 1}
+        recorder.record(
+            endpoint,
+            (round(latency_ms, 3), stats.queries, round(stats.sql_ms, 3), round(stats.template_ms, 3)),
+            duplicates,
+        )
+        metrics_dir = getattr(settings, "REQUEST_METRICS_DIR", None)
+        if metrics_dir:
+            recorder.maybe_flush(metrics_dir)
+        return response
+
+
+# -----------------------------
+# REPORTING
+# -----------------------------
+SORT_KEYS = ("p95_ms", "p50_ms", "max_ms", "mean_queries", "mean_sql_ms", "mean_template_ms", "requests")
+
+
+def load_snapshots(directory, ttl):
+    """
+    (snapshots, unreadable file names) for the <pid>.json files in `directory`.
+    A snapshot taken more than `ttl` seconds ago belongs to a process that
+    has stopped flushing (exited, or restarted under a new pid); its file is
+    deleted rather than merged into every later report.
+    """
+    directory = Path(directory)
+    snapshots, unreadable = [], []
+    cutoff = time.time() - ttl
+    for path in sorted(directory.glob("*.json")) if directory.is_dir() else []:
+        try:
+            snapshot = json.loads(path.read_text())
+        except (OSError, ValueError):
+            unreadable.append(path.name)
+            continue
+        if snapshot.get("taken_at", 0) < cutoff:
+            path.unlink(missing_ok=True)
+        else:
+            snapshots.append(snapshot)
+    return snapshots, unreadable
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def summarize(snapshots, sort="p95_ms", top=None):
+    """Merge snapshots (from one or many processes) into one row per endpoint, worst first."""
+    samples, duplicates = defaultdict(list), defaultdict(Counter)
+    for snapshot in snapshots:
+        for endpoint, data in snapshot["endpoints"].items():
+            samples[endpoint].extend(data["samples"])
+            duplicates[endpoint].update(data["duplicates"])
+
+    rows = []
+    for endpoint, rows_ in samples.items():
+        latency, queries, sql_ms, template_ms = (list(column) for column in zip(*rows_))
+        ordered = sorted(latency)
+        rows.append({
+            "endpoint": endpoint,
+            "requests": len(rows_),
+            "p50_ms": round(_percentile(ordered, 0.50), 1),
+            "p95_ms": round(_percentile(ordered, 0.95), 1),
+            "max_ms": round(ordered[-1], 1),
+            "mean_queries": round(statistics.fmean(queries), 1),
+            "max_queries": max(queries),
+            "mean_sql_ms": round(statistics.fmean(sql_ms), 1),
+            "mean_template_ms": round(statistics.fmean(template_ms), 1),
+            "duplicate_queries": [
+                {"sql": sql, "repeats": count} for sql, count in duplicates[endpoint].most_common(5)
+            ],
+        })
+    rows.sort(key=lambda row: row[sort], reverse=True)
+    return rows[:top] if top else rows
@@ -0,0 +1,54 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.instrumentation import SORT_KEYS, load_snapshots, summarize
+
+
+class Command(BaseCommand):
+    help = (
+        "Show the N worst endpoints recorded by RequestMetricsMiddleware, merged across every "
+        "server process that wrote a snapshot to REQUEST_METRICS_DIR. Snapshots older than "
+        "REQUEST_METRICS_SNAPSHOT_TTL (left by exited workers) are deleted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=10)
+        parser.add_argument("--sort", choices=SORT_KEYS, default="p95_ms")
+        parser.add_argument("--json", action="store_true", help="Print the rows as JSON.")
+        parser.add_argument("--reset", action="store_true", help="Delete the snapshot files afterwards.")
+
+    def handle(self, *args, **options):
+        directory = Path(settings.REQUEST_METRICS_DIR)
+        snapshots, unreadable = load_snapshots(directory, settings.REQUEST_METRICS_SNAPSHOT_TTL)
+        for name in unreadable:
+            self.stderr.write(f"Skipping unreadable snapshot {name}")
+        if not snapshots:
+            raise CommandError(
+                f"No recent snapshots in {directory}. Run the server with RESERVO_REQUEST_METRICS=1 first."
+            )
+
+        rows = summarize(snapshots, sort=options["sort"], top=options["top"])
+
+        if options["json"]:
+            self.stdout.write(json.dumps(rows, indent=2))
+        else:
+            self.stdout.write(
+                f"{'endpoint':<40} {'reqs':>6} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} "
+                f"{'queries':>8} {'sql ms':>8} {'tmpl ms':>8} {'dupes':>6}"
+            )
+            for row in rows:
+                dupes = sum(d["repeats"] for d in row["duplicate_queries"])
+                self.stdout.write(
+                    f"{row['endpoint'][:40]:<40} {row['requests']:>6} {row['p50_ms']:>8} {row['p95_ms']:>8} "
+                    f"{row['max_ms']:>8} {row['mean_queries']:>8} {row['mean_sql_ms']:>8} "
+                    f"{row['mean_template_ms']:>8} {dupes:>6}"
+                )
+                for duplicate in row["duplicate_queries"][:3]:
+                    self.stdout.write(f"    x{duplicate['repeats']} {duplicate['sql'][:110]}")
+
+        if options["reset"]:
+            for path in directory.glob("*.json"):
+                path.unlink(missing_ok=True)
@@ -0,0 +1,48 @@
+# Generated by Django 5.1.15 on 2026-10-18 08:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardData',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('total_rooms', models.PositiveIntegerField(default=0)),
+                ('total_users', models.PositiveIntegerField(default=0)),
+                ('total_bookings', models.PositiveIntegerField(default=0)),
+                ('bookings_by_status', models.JSONField(blank=True, default=dict)),
+                ('rooms_by_type', models.JSONField(blank=True, default=dict)),
+                ('bookings_by_month', models.JSONField(blank=True, default=dict)),
+                ('approved_by_day', models.JSONField(blank=True, default=dict)),
+            ],
+            options={
+                'verbose_name_plural': 'dashboard data',
+            },
+        ),
+        migrations.CreateModel(
+            name='BookingRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(choices=[('pending', 'pending'), ('Approved', 'Approved'), ('Declined', 'Declined')], max_length=20)),
+                ('room_type', models.CharField(choices=[('single', 'Single'), ('double', 'Double'), ('suite', 'Suite'), ('conference', 'Conference')], max_length=20)),
+                ('bookings', models.IntegerField(default=0)),
+                ('nights', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+            options={
+                'ordering': ['day', 'status', 'room_type'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'status', 'room_type'), name='unique_booking_rollup')],
+            },
+        ),
+    ]
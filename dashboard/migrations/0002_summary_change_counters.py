@@ -0,0 +1,23 @@
+# Generated by Django 5.1.15 on 2026-10-18 09:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dashboarddata',
+            name='changes',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='dashboarddata',
+            name='summarized_changes',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
@@ -5,6 +5,50 @@ from django.contrib.auth.models import User
 
 class DashboardData(models.Model):
     """
-    Optional model for storing any precomputed stats if needed
+    Precomputed dashboard statistics, stored as a single row (pk=1).
+    Kept current incrementally by dashboard/signals.py; rebuilt by the
+    recompute_dashboard_stats command.
     """
+    SINGLETON_ID = 1
+
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    total_rooms = models.PositiveIntegerField(default=0)
+    total_users = models.PositiveIntegerField(default=0)
+    total_bookings = models.PositiveIntegerField(default=0)
+    bookings_by_status = models.JSONField(default=dict, blank=True)   # {"pending": 3, ...}
+    rooms_by_type = models.JSONField(default=dict, blank=True)        # {"single": 4, ...}
+    bookings_by_month = models.JSONField(default=dict, blank=True)    # {"2025-12": 7, ...} by check-in
+    approved_by_day = models.JSONField(default=dict, blank=True)      # {"2025-12-04": 2, ...} by check-in
+    # Booking writes bump `changes`; the three breakdowns above are rebuilt
+    # from BookingRollup on the next read once summarized_changes falls behind
+    changes = models.PositiveBigIntegerField(default=0)
+    summarized_changes = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "dashboard data"
+
+    def __str__(self):
+        return f"Dashboard stats (updated {self.updated_at:%Y-%m-%d %H:%M})"
+
+
+class BookingRollup(models.Model):
+    """
+    Daily rollup of bookings by check-in day, status and room type.
+    Month/year views are sums over these rows.
+    """
+    day = models.DateField()
+    status = models.CharField(max_length=20, choices=Booking.STATUS_CHOICES)
+    room_type = models.CharField(max_length=20, choices=Room.ROOM_TYPES)
+    bookings = models.IntegerField(default=0)
+    nights = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        ordering = ["day", "status", "room_type"]
+        constraints = [
+            models.UniqueConstraint(fields=["day", "status", "room_type"], name="unique_booking_rollup"),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.status} {self.room_type}: {self.bookings}"
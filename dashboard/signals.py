@@ -0,0 +1,71 @@
+# dashboard/signals.py
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from bookings.models import Booking
+from rooms.models import Room
+from .stats import (
+    apply_booking_changes, booking_facts, move_room_bookings, refresh_room_stats, refresh_user_count,
+    stored_facts,
+)
+
+
+@receiver(pre_save, sender=Booking)
+def remember_booking_facts(sender, instance, **kwargs):
+    # The stored row is what the rollups currently count for this booking
+    instance._dashboard_facts = None
+    if not instance._state.adding and instance.pk:
+        instance._dashboard_facts = stored_facts(Booking.objects.filter(pk=instance.pk)).get(instance.pk)
+
+
+@receiver(post_save, sender=Booking)
+def booking_saved(sender, instance, **kwargs):
+    apply_booking_changes([(getattr(instance, "_dashboard_facts", None), booking_facts(instance))])
+
+
+@receiver(pre_delete, sender=Booking)
+def remember_deleted_booking_facts(sender, instance, **kwargs):
+    # The instance may be stale (e.g. approved since it was loaded); the stored row is what is counted
+    instance._dashboard_facts = stored_facts(Booking.objects.filter(pk=instance.pk)).get(instance.pk)
+
+
+@receiver(post_delete, sender=Booking)
+def booking_deleted(sender, instance, **kwargs):
+    facts = getattr(instance, "_dashboard_facts", None)
+    if facts is not None:
+        apply_booking_changes([(facts, None)])
+
+
+@receiver(pre_save, sender=Room)
+def remember_room_type(sender, instance, **kwargs):
+    # The rollups file each booking under its room's type as stored before this save
+    instance._dashboard_room_type = None
+    if not instance._state.adding and instance.pk:
+        instance._dashboard_room_type = (
+            Room.objects.filter(pk=instance.pk).values_list("room_type", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Room)
+def room_type_changed(sender, instance, **kwargs):
+    old_type = getattr(instance, "_dashboard_room_type", None)
+    if old_type is not None and old_type != instance.room_type:
+        move_room_bookings(instance.pk, old_type, instance.room_type)
+
+
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Room)
+def room_changed(sender, **kwargs):
+    refresh_room_stats()
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, created, **kwargs):
+    if created:
+        refresh_user_count()
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, **kwargs):
+    refresh_user_count()
@@ -0,0 +1,286 @@
+# dashboard/stats.py
+from collections import Counter, defaultdict, namedtuple
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek, TruncYear
+
+from ReservO.db import read_from_primary
+from bookings.models import Booking
+from rooms.models import Room
+from .models import BookingRollup, DashboardData
+
+# What a single booking contributes to the precomputed statistics
+BookingFacts = namedtuple("BookingFacts", "day status room_type nights revenue")
+
+# Read together with the booking row, so the room type is the one the rollups hold
+FACT_FIELDS = ("check_in", "check_out", "status", "room__room_type", "total_price")
+
+
+def make_facts(check_in, check_out, status, room_type, total_price):
+    return BookingFacts(
+        day=check_in,
+        status=status,
+        room_type=room_type or "",
+        nights=max((check_out - check_in).days, 0),
+        revenue=total_price or Decimal("0.00"),
+    )
+
+
+def booking_facts(booking):
+    """Facts for an in-memory booking; the room type comes from its loaded room, else one query."""
+    if Booking.room.is_cached(booking):
+        room_type = booking.room.room_type
+    else:
+        room_type = Room.objects.filter(pk=booking.room_id).values_list("room_type", flat=True).first()
+    return make_facts(booking.check_in, booking.check_out, booking.status, room_type, booking.total_price)
+
+
+def stored_facts(queryset):
+    """{pk: BookingFacts} for the rows currently stored in the database (one query)."""
+    return {
+        row[0]: make_facts(*row[1:])
+        for row in queryset.order_by().values_list("pk", *FACT_FIELDS)
+    }
+
+
+# -----------------------------
+# INCREMENTAL UPDATES
+# -----------------------------
+def apply_booking_changes(changes):
+    """
+    Apply a batch of (old_facts, new_facts) pairs to the rollups and the
+    summary row. None stands for "did not exist" (create) or "no longer
+    exists" (delete). Deltas are merged first, then written with F()
+    increments, one UPDATE per touched rollup plus one for the summary
+    counters. The summary's breakdowns are refreshed from the rollups on the
+    next read (see get_dashboard_stats), so writers never lock the row to
+    read-modify-write it.
+    """
+    rollups = defaultdict(lambda: [0, 0, Decimal("0.00")])
+    total = 0
+
+    for old, new in changes:
+        for facts, sign in ((old, -1), (new, 1)):
+            if facts is None:
+                continue
+            delta = rollups[(facts.day, facts.status, facts.room_type)]
+            delta[0] += sign
+            delta[1] += sign * facts.nights
+            delta[2] += sign * facts.revenue
+            total += sign
+
+    with transaction.atomic():
+        updated = DashboardData.objects.filter(pk=DashboardData.SINGLETON_ID).update(
+            total_bookings=F("total_bookings") + total, changes=F("changes") + 1,
+        )
+        if not updated:
+            # Nothing precomputed yet: build everything (including this change) from scratch
+            recompute_dashboard_stats()
+            return
+
+        for key, delta in rollups.items():
+            if any(delta):
+                _increment_rollup(key, *delta)
+
+
+def _increment_rollup(key, bookings, nights, revenue):
+    day, status, room_type = key
+    increments = {
+        "bookings": F("bookings") + bookings,
+        "nights": F("nights") + nights,
+        "revenue": F("revenue") + revenue,
+    }
+    rollup = BookingRollup.objects.filter(day=day, status=status, room_type=room_type)
+    if rollup.update(**increments):
+        return
+    try:
+        with transaction.atomic():
+            BookingRollup.objects.create(
+                day=day, status=status, room_type=room_type, bookings=bookings, nights=nights, revenue=revenue,
+            )
+    except IntegrityError:
+        # A concurrent writer created the row first
+        rollup.update(**increments)
+
+
+@transaction.atomic
+def move_room_bookings(room_id, old_type, new_type):
+    """File the bookings of a room whose type changed under the new type (the row is already saved)."""
+    apply_booking_changes([
+        (facts._replace(room_type=old_type), facts)
+        for facts in stored_facts(Booking.objects.filter(room_id=room_id)).values()
+    ])
+
+
+def refresh_booking_summaries(data):
+    """
+    Rebuild the JSON breakdowns of the summary row from BookingRollup (one
+    grouped query) and store them unless another booking write landed since
+    `data` was read. Updates `data` in place.
+    """
+    by_status, by_month, approved_by_day = Counter(), Counter(), Counter()
+    rows = BookingRollup.objects.order_by().values("day", "status").annotate(count=Sum("bookings"))
+    for row in rows:
+        by_status[row["status"]] += row["count"]
+        by_month[row["day"].strftime("%Y-%m")] += row["count"]
+        if row["status"] == Booking.STATUS_APPROVED:
+            approved_by_day[row["day"].isoformat()] += row["count"]
+
+    data.bookings_by_status = _nonzero(by_status)
+    data.bookings_by_month = dict(sorted(_nonzero(by_month).items()))
+    data.approved_by_day = _nonzero(approved_by_day)
+    data.summarized_changes = data.changes
+    DashboardData.objects.filter(pk=data.pk, changes=data.changes).update(
+        bookings_by_status=data.bookings_by_status,
+        bookings_by_month=data.bookings_by_month,
+        approved_by_day=data.approved_by_day,
+        summarized_changes=data.changes,
+    )
+
+
+def _nonzero(counts):
+    return {key: value for key, value in counts.items() if value}
+
+
+def refresh_room_stats():
+    data = DashboardData.objects.filter(pk=DashboardData.SINGLETON_ID).first()
+    if data is None:
+        return
+    data.rooms_by_type = _rooms_by_type()
+    data.total_rooms = sum(data.rooms_by_type.values())
+    data.save(update_fields=["rooms_by_type", "total_rooms", "updated_at"])
+
+
+def refresh_user_count():
+    DashboardData.objects.filter(pk=DashboardData.SINGLETON_ID).update(total_users=User.objects.count())
+
+
+def _rooms_by_type():
+    return {
+        row["room_type"]: row["count"]
+        for row in Room.objects.order_by().values("room_type").annotate(count=Count("id"))
+    }
+
+
+# -----------------------------
+# FULL RECOMPUTE
+# -----------------------------
+@transaction.atomic
+@read_from_primary()
+def recompute_dashboard_stats(batch_size=5000):
+    """Rebuild the rollup table and the summary row from the source tables (read on the primary)."""
+    rollups = defaultdict(lambda: [0, 0, Decimal("0.00")])
+    by_status, by_month, approved_by_day = Counter(), Counter(), Counter()
+    total = 0
+
+    rows = Booking.objects.order_by().values_list(
+        "check_in", "check_out", "status", "room__room_type", "total_price"
+    )
+    for check_in, check_out, status, room_type, total_price in rows.iterator(chunk_size=batch_size):
+        nights = max((check_out - check_in).days, 0)
+        rollup = rollups[(check_in, status, room_type)]
+        rollup[0] += 1
+        rollup[1] += nights
+        rollup[2] += total_price or 0
+        by_status[status] += 1
+        by_month[check_in.strftime("%Y-%m")] += 1
+        if status == Booking.STATUS_APPROVED:
+            approved_by_day[check_in.isoformat()] += 1
+        total += 1
+
+    BookingRollup.objects.all().delete()
+    BookingRollup.objects.bulk_create(
+        (
+            BookingRollup(day=day, status=status, room_type=room_type, bookings=b, nights=n, revenue=r)
+            for (day, status, room_type), (b, n, r) in rollups.items()
+        ),
+        batch_size=batch_size,
+    )
+
+    rooms_by_type = _rooms_by_type()
+    data, _ = DashboardData.objects.update_or_create(
+        pk=DashboardData.SINGLETON_ID,
+        defaults={
+            "total_rooms": sum(rooms_by_type.values()),
+            "total_users": User.objects.count(),
+            "total_bookings": total,
+            "bookings_by_status": dict(by_status),
+            "rooms_by_type": rooms_by_type,
+            "bookings_by_month": dict(sorted(by_month.items())),
+            "approved_by_day": dict(approved_by_day),
+            "changes": 0,
+            "summarized_changes": 0,
+        },
+    )
+    return data
+
+
+def get_dashboard_stats():
+    """The summary row; computed on first use, its breakdowns refreshed after booking writes."""
+    data = DashboardData.objects.filter(pk=DashboardData.SINGLETON_ID).first()
+    if data is None:
+        return recompute_dashboard_stats()
+    if data.summarized_changes != data.changes:
+        refresh_booking_summaries(data)
+    return data
+
+
+# -----------------------------
+# TIME SERIES
+# -----------------------------
+TIMESERIES_TRUNC = {
+    "day": TruncDay,
+    "week": TruncWeek,
+    "month": TruncMonth,
+    "year": TruncYear,
+}
+TIMESERIES_CACHE_TTL = 5 * 60
+
+
+def booking_timeseries(granularity="month", start=None, end=None, room_type=None, status=None):
+    """
+    Bookings, occupied nights and revenue per period, by check-in date.
+    Aggregates the daily BookingRollup rows with Trunc*() so it runs on any
+    database backend. Results are cached per (granularity, range, filters)
+    for TIMESERIES_CACHE_TTL seconds.
+    """
+    trunc = TIMESERIES_TRUNC[granularity]
+    key = f"dashboard:timeseries:{granularity}:{start}:{end}:{room_type or '*'}:{status or '*'}"
+    series = cache.get(key)
+    if series is not None:
+        return series
+
+    qs = BookingRollup.objects.all()
+    if start:
+        qs = qs.filter(day__gte=start)
+    if end:
+        qs = qs.filter(day__lte=end)
+    if room_type:
+        qs = qs.filter(room_type=room_type)
+    if status:
+        qs = qs.filter(status=status)
+
+    # Shared cache: fill it from the primary even when called from a replica view
+    with read_from_primary():
+        rows = list(
+            qs.annotate(period=trunc("day"))
+            .values("period")
+            .annotate(bookings=Sum("bookings"), nights=Sum("nights"), revenue=Sum("revenue"))
+            .order_by("period")
+        )
+    series = [
+        {
+            "period": row["period"].isoformat(),
+            "bookings": row["bookings"],
+            "nights": row["nights"],
+            "revenue": f"{row['revenue']:.2f}",
+        }
+        for row in rows
+        if row["bookings"]
+    ]
+    cache.set(key, series, TIMESERIES_CACHE_TTL)
+    return series
@@ -1,3 +1,242 @@
-from django.test import TestCase
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import path
+from django.utils.timezone import now
+
+from bookings.models import Booking
+from bookings.transitions import bulk_transition
+from dashboard.instrumentation import RequestMetricsMiddleware, load_snapshots, recorder, summarize
+from dashboard.models import BookingRollup
+from dashboard.stats import booking_timeseries, get_dashboard_stats, recompute_dashboard_stats
+from rooms.models import Room
+
+
+class DashboardStatsTests(TestCase):
+    """The incrementally maintained statistics always equal a full recompute."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.guest = User.objects.create_user("guest", password="pw")
+        cls.single = Room.objects.create(room_number="601", room_type="single", price=Decimal("50.00"), capacity=1)
+        cls.double = Room.objects.create(room_number="602", room_type="double", price=Decimal("80.00"), capacity=2)
+        cls.check_in = date.today() + timedelta(days=15)
+        recompute_dashboard_stats()
+
+    def _book(self, room, offset, nights, **fields):
+        booking = Booking(
+            user=self.guest, room=room, check_in=self.check_in + timedelta(days=offset),
+            check_out=self.check_in + timedelta(days=offset + nights), **fields,
+        )
+        booking.save(validate=False)
+        return booking
+
+    def snapshot(self):
+        data = get_dashboard_stats()
+        rollups = sorted(
+            BookingRollup.objects.exclude(bookings=0, nights=0, revenue=0)
+            .values_list("day", "status", "room_type", "bookings", "nights", "revenue")
+        )
+        return rollups, {
+            "total_bookings": data.total_bookings,
+            "bookings_by_status": data.bookings_by_status,
+            "bookings_by_month": data.bookings_by_month,
+            "approved_by_day": data.approved_by_day,
+        }
+
+    def assertMatchesRecompute(self):
+        incremental = self.snapshot()
+        recompute_dashboard_stats()
+        self.assertEqual(incremental, self.snapshot())
+
+    def test_writes_match_recompute(self):
+        first = self._book(self.single, 0, 2)
+        second = self._book(self.double, 0, 3)
+        self._book(self.double, 5, 1, status=Booking.STATUS_APPROVED)
+        bulk_transition([first.pk], Booking.STATUS_APPROVED)
+        bulk_transition([second.pk], Booking.STATUS_DECLINED)
+        first.refresh_from_db()
+        first.check_out += timedelta(days=1)
+        first.save(validate=False)
+        second.delete()
+        self.assertMatchesRecompute()
+
+    def test_room_type_change_moves_its_bookings(self):
+        self._book(self.single, 0, 2)
+        self._book(self.single, 3, 1, status=Booking.STATUS_APPROVED)
+
+        self.single.room_type = "suite"
+        self.single.save()
+        rollups, _ = self.snapshot()
+        self.assertEqual({row[2] for row in rollups}, {"suite"})
+        self.assertFalse(BookingRollup.objects.filter(bookings__lt=0).exists())
+
+        # Later writes to those bookings still land on (and come off) the right rows
+        Booking.objects.filter(room=self.single).first().delete()
+        self.assertMatchesRecompute()
+
+
+class BookingTimeseriesTests(TestCase):
+    """Rollups are bucketed by check-in day into days, ISO weeks, months and years."""
+
+    DAYS = [date(2031, 1, 30), date(2031, 2, 2), date(2031, 2, 3), date(2031, 12, 31), date(2032, 1, 1)]
+
+    @classmethod
+    def setUpTestData(cls):
+        guest = User.objects.create_user("guest", password="pw")
+        recompute_dashboard_stats()
+        for i, day in enumerate(cls.DAYS):
+            room = Room.objects.create(room_number=f"61{i}", room_type="suite", price=Decimal("100.00"), capacity=2)
+            Booking(
+                user=guest, room=room, check_in=day, check_out=day + timedelta(days=1 + i % 2),
+                status=Booking.STATUS_APPROVED if i % 2 else Booking.STATUS_PENDING,
+            ).save(validate=False)
+
+    def setUp(self):
+        cache.clear()  # series are cached per query across tests
+
+    def buckets(self, granularity, **filters):
+        return {row["period"]: row["bookings"] for row in booking_timeseries(granularity, **filters)}
+
+    def test_periods(self):
+        self.assertEqual(self.buckets("day"), {day.isoformat(): 1 for day in self.DAYS})
+        # Weeks start on Monday; the last one straddles the new year
+        self.assertEqual(self.buckets("week"), {"2031-01-27": 2, "2031-02-03": 1, "2031-12-29": 2})
+        self.assertEqual(self.buckets("month"), {"2031-01-01": 1, "2031-02-01": 2, "2031-12-01": 1, "2032-01-01": 1})
+        self.assertEqual(self.buckets("year"), {"2031-01-01": 4, "2032-01-01": 1})
+
+    def test_sums_and_filters(self):
+        series = booking_timeseries("year", start=date(2031, 2, 1), status=Booking.STATUS_APPROVED)
+        # Approved: 2031-02-02 (2 nights) and 2031-12-31 (2 nights)
+        self.assertEqual(series, [{"period": "2031-01-01", "bookings": 2, "nights": 4, "revenue": "400.00"}])
+        self.assertEqual(booking_timeseries("year", room_type="single"), [])
+        self.assertEqual(self.buckets("month", end=date(2031, 2, 2)), {"2031-01-01": 1, "2031-02-01": 1})
+
+
+class DashboardStatsViewTests(TestCase):
+    def test_live_counters(self):
+        staff = User.objects.create_user("counter", password="pw", is_staff=True)
+        today = now().date()
+        for i, status in enumerate([Booking.STATUS_PENDING, Booking.STATUS_APPROVED, Booking.STATUS_APPROVED]):
+            room = Room.objects.create(room_number=f"63{i}", room_type="single", price=Decimal("50.00"), capacity=1)
+            check_in = today if i < 2 else today + timedelta(days=3)
+            Booking(user=staff, room=room, check_in=check_in, check_out=check_in + timedelta(days=1),
+                    status=status).save(validate=False)
+
+        self.client.force_login(staff)
+        for path in ("/dashboard/stats/", "/dashboard/stats/async/"):
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(path).json(), {
+                    "total_rooms": 3, "total_users": 1, "total_bookings": 3, "pending_bookings": 1,
+                    "approved_today": 1,
+                })
+
+
+def n_plus_one(request):
+    return HttpResponse(",".join(booking.room.room_number for booking in Booking.objects.order_by("pk")))
+
+
+urlpatterns = [path("n-plus-one/", n_plus_one, name="n-plus-one")]
+
+
+def snapshot(endpoints, taken_at=None, pid=1):
+    return {"pid": pid, "taken_at": taken_at or time.time(), "endpoints": endpoints}
+
+
+class SummarizeTests(SimpleTestCase):
+    def test_percentiles_merge_and_order(self):
+        # Latencies 1..100 split across two processes
+        slow = {"samples": [[ms, 2, 1.0, 0.0] for ms in range(1, 51)], "duplicates": {"SELECT 1": 3}}
+        slow_too = {"samples": [[ms, 2, 1.0, 0.0] for ms in range(51, 101)], "duplicates": {"SELECT 1": 2}}
+        chatty = {"samples": [[5, 40, 9.0, 1.0], [7, 20, 3.0, 1.0]], "duplicates": {}}
+        snapshots = [snapshot({"slow": slow, "chatty": chatty}), snapshot({"slow": slow_too}, pid=2)]
+
+        rows = summarize(snapshots)
+        self.assertEqual([row["endpoint"] for row in rows], ["slow", "chatty"])
+        self.assertEqual(
+            {key: rows[0][key] for key in ("requests", "p50_ms", "p95_ms", "max_ms", "mean_queries")},
+            {"requests": 100, "p50_ms": 51, "p95_ms": 96, "max_ms": 100, "mean_queries": 2},
+        )
+        self.assertEqual(rows[0]["duplicate_queries"], [{"sql": "SELECT 1", "repeats": 5}])
+
+        by_queries = summarize(snapshots, sort="mean_queries", top=1)
+        self.assertEqual([(row["endpoint"], row["mean_queries"], row["max_queries"]) for row in by_queries],
+                         [("chatty", 30, 40)])
+
+
+class SnapshotTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.addCleanup(recorder.reset)
+
+    def test_flush_and_stale_snapshots_are_pruned(self):
+        recorder.reset()
+        recorder.record("rooms:room_list", (12.0, 1, 0.5, 3.0), {})
+        recorder._last_flush = 0  # as if FLUSH_INTERVAL had passed
+        recorder.maybe_flush(self.directory)
+        recorder.maybe_flush(self.directory)  # within the interval: no rewrite
+        own = self.directory / f"{os.getpid()}.json"
+        self.assertEqual(json.loads(own.read_text())["endpoints"]["rooms:room_list"]["samples"], [[12.0, 1, 0.5, 3.0]])
+
+        dead = self.directory / "99999999.json"
+        dead.write_text(json.dumps(snapshot({"gone": {"samples": [[1, 1, 1, 1]], "duplicates": {}}},
+                                            taken_at=time.time() - 3600)))
+        (self.directory / "broken.json").write_text("{")
+        snapshots, unreadable = load_snapshots(self.directory, ttl=600)
+        self.assertEqual([s["pid"] for s in snapshots], [os.getpid()])
+        self.assertEqual(unreadable, ["broken.json"])
+        self.assertFalse(dead.exists())
+
+    def test_command_reports_recent_snapshots(self):
+        (self.directory / "1.json").write_text(json.dumps(snapshot({
+            "bookings:booking_list": {"samples": [[30, 4, 2, 5]], "duplicates": {}},
+        })))
+        out = io.StringIO()
+        with override_settings(REQUEST_METRICS_DIR=str(self.directory)):
+            call_command("request_metrics", "--json", stdout=out)
+        self.assertEqual([row["endpoint"] for row in json.loads(out.getvalue())], ["bookings:booking_list"])
+
+
+class RequestMetricsMiddlewareTests(TestCase):
+    def setUp(self):
+        recorder.reset()
+        self.addCleanup(recorder.reset)
+
+    def test_disabled_middleware_removes_itself(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            RequestMetricsMiddleware(lambda request: HttpResponse())
+
+    @override_settings(REQUEST_METRICS_ENABLED=True, REQUEST_METRICS_DIR=None, ROOT_URLCONF=__name__)
+    def test_n_plus_one_view_reports_its_repeated_query(self):
+        guest = User.objects.create_user("metrics", password="pw")
+        for i in range(3):
+            room = Room.objects.create(room_number=f"64{i}", price=Decimal("50.00"), capacity=1)
+            Booking(user=guest, room=room, check_in=date(2031, 3, 1), check_out=date(2031, 3, 2)).save(validate=False)
+
+        self.client.get("/n-plus-one/")
+        [row] = summarize([recorder.snapshot()])
+        self.assertEqual((row["endpoint"], row["requests"], row["mean_queries"]), ("n-plus-one", 1, 4))
+        [duplicate] = row["duplicate_queries"]
+        self.assertIn('FROM "rooms_room"', duplicate["sql"])
+        self.assertEqual(duplicate["repeats"], 2)
+
+    def test_metrics_view(self):
+        recorder.record("rooms:room_list", (12.0, 1, 0.5, 3.0), {})
+        self.client.force_login(User.objects.create_user("ops", password="pw", is_staff=True))
+        response = self.client.get("/dashboard/metrics/", {"sort": "requests"})
+        self.assertEqual([row["endpoint"] for row in response.json()["endpoints"]], ["rooms:room_list"])
+        self.assertEqual(self.client.get("/dashboard/metrics/", {"sort": "nope"}).status_code, 400)
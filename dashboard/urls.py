@@ -6,4 +6,9 @@ app_name = 'dashboard'
 urlpatterns = [
     path('', views.admin_dashboard, name='admin_dashboard'),
     path('booking-action/', views.approve_decline_booking, name='booking_action'),
+    path('booking-action/bulk/', views.bulk_booking_action, name='bulk_booking_action'),
+    path('timeseries/', views.booking_timeseries_api, name='booking_timeseries'),
+    path('stats/', views.dashboard_stats, name='stats'),
+    path('stats/async/', views.dashboard_stats_async, name='stats-async'),
+    path('metrics/', views.request_metrics, name='request_metrics'),
 ]
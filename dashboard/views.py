@@ -1,27 +1,42 @@
+import json
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Count, Q
 from django.shortcuts import render
 from bookings.models import Booking
-from rooms.models import Room
-from django.contrib.auth.models import User
 from django.utils.timezone import now
-from django.db.models import Count
 from django.http import JsonResponse
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_GET, require_POST
+from django.contrib.admin.views.decorators import staff_member_required
+from bookings.pagination import keyset_paginate, pager_links
+from bookings.transitions import ACTIONS, bulk_transition
+from ReservO.db import use_replica
+from rooms.models import Room
+from .forms import TimeSeriesForm
+from .instrumentation import SORT_KEYS, recorder, summarize
+from .stats import booking_timeseries, get_dashboard_stats
 
+PENDING_PER_PAGE = 25
+
+@use_replica
 def admin_dashboard(request):
-    total_rooms = Room.objects.count()
-    total_bookings = Booking.objects.count()
-    pending_bookings = Booking.objects.filter(status=Booking.STATUS_PENDING).count()
-    approved_today = Booking.objects.filter(status=Booking.STATUS_APPROVED, check_in=now().date()).count()
-    total_users = User.objects.count()
-
-    recent_bookings = Booking.objects.order_by('-check_in')[:10]
-    room_types = Room.objects.values('room_type').annotate(count=Count('id'))
-    monthly_bookings = (
-        Booking.objects.extra(select={'month': "strftime('%%m', check_in)"}).values('month')
-        .annotate(count=Count('id')).order_by('month')
-    )
+    # All counters come from the precomputed single-row store
+    stats = get_dashboard_stats()
+    total_rooms = stats.total_rooms
+    total_bookings = stats.total_bookings
+    pending_bookings = stats.bookings_by_status.get(Booking.STATUS_PENDING, 0)
+    approved_today = stats.approved_by_day.get(now().date().isoformat(), 0)
+    total_users = stats.total_users
 
-    pending_queue = Booking.objects.filter(status=Booking.STATUS_PENDING).order_by('check_in')
+    recent_bookings = Booking.objects.for_listing().order_by('-check_in')[:10]
+    room_types = [{'room_type': rt, 'count': count} for rt, count in sorted(stats.rooms_by_type.items())]
+    monthly_bookings = [{'month': month, 'count': count} for month, count in sorted(stats.bookings_by_month.items())]
+
+    pending_queue = keyset_paginate(
+        Booking.objects.for_listing().filter(status=Booking.STATUS_PENDING), 'check_in',
+        cursor=request.GET.get('pending_after'), per_page=PENDING_PER_PAGE,
+    )
 
     context = {
         'total_rooms': total_rooms,
@@ -30,28 +45,142 @@ def admin_dashboard(request):
         'approved_today': approved_today,
         'total_users': total_users,
         'recent_bookings': recent_bookings,
-        'room_types': list(room_types),
-        'monthly_bookings': list(monthly_bookings),
+        'room_types': room_types,
+        'monthly_bookings': monthly_bookings,
         'pending_queue': pending_queue,
+        'pending_pager': pager_links(request, pending_queue, 'pending_after'),
     }
     return render(request, 'dashboard/admin_dashboard.html', context)
 
+@staff_member_required
 @require_POST
 def approve_decline_booking(request):
     booking_id = request.POST.get('booking_id')
     action = request.POST.get('action')
     if not booking_id or not action:
         return JsonResponse({'success': False, 'error': 'Missing data'})
-
+    status = ACTIONS.get(action.lower())
+    if status is None:
+        return JsonResponse({'success': False, 'error': 'Invalid action'})
     try:
-        booking = Booking.objects.get(id=booking_id)
-        if action.lower() == 'approve':
-            booking.status = Booking.STATUS_APPROVED
-        elif action.lower() == 'decline':
-            booking.status = Booking.STATUS_DECLINED
-        else:
-            return JsonResponse({'success': False, 'error': 'Invalid action'})
-        booking.save()
-        return JsonResponse({'success': True, 'status': booking.status})
-    except Booking.DoesNotExist:
+        booking_id = int(booking_id)
+    except ValueError:
         return JsonResponse({'success': False, 'error': 'Booking not found'})
+
+    return JsonResponse(bulk_transition([booking_id], status)[booking_id])
+
+
+BULK_ACTION_LIMIT = 1000
+
+
+@staff_member_required
+@require_POST
+def bulk_booking_action(request):
+    """
+    POST a JSON body {"ids": [1, 2, ...], "action": "approve" | "decline"}.
+    The whole batch is validated in one pass and written in one transaction;
+    the response carries a result per id.
+    """
+    try:
+        payload = json.loads(request.body)
+        ids = [int(pk) for pk in payload['ids']]
+        action = str(payload['action']).lower()
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({'success': False, 'error': 'Expected {"ids": [...], "action": "..."}'}, status=400)
+
+    if action not in ACTIONS:
+        return JsonResponse({'success': False, 'error': 'Invalid action'}, status=400)
+    if not ids or len(ids) > BULK_ACTION_LIMIT:
+        return JsonResponse({'success': False, 'error': f'Send between 1 and {BULK_ACTION_LIMIT} ids'}, status=400)
+
+    results = bulk_transition(ids, ACTIONS[action])
+    return JsonResponse({
+        'success': True,
+        'action': action,
+        'updated': sum(1 for result in results.values() if result['success']),
+        'results': [{'id': pk, **result} for pk, result in results.items()],
+    })
+
+
+@use_replica
+@staff_member_required
+@require_GET
+def booking_timeseries_api(request):
+    """
+    GET ?granularity=day|week|month|year&start=&end=&room_type=&status=
+    Bookings, nights and revenue per period, by check-in date.
+    """
+    form = TimeSeriesForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({'success': False, 'errors': form.errors}, status=400)
+
+    data = form.cleaned_data
+    series = booking_timeseries(
+        data['granularity'], data['start'], data['end'],
+        room_type=data['room_type'] or None, status=data['status'] or None,
+    )
+    return JsonResponse({'success': True, 'granularity': data['granularity'], 'series': series})
+
+
+def booking_counters():
+    """Aggregate expressions for the booking counters, evaluated in one query."""
+    return {
+        'total_bookings': Count('id'),
+        'pending_bookings': Count('id', filter=Q(status=Booking.STATUS_PENDING)),
+        'approved_today': Count('id', filter=Q(status=Booking.STATUS_APPROVED, check_in=now().date())),
+    }
+
+
+@use_replica
+@staff_member_required
+@require_GET
+def dashboard_stats(request):
+    """
+    Live dashboard counters as JSON, counted straight from the tables: one
+    query each for rooms and users, one conditional aggregate for bookings.
+    """
+    return JsonResponse({
+        'total_rooms': Room.objects.count(),
+        'total_users': User.objects.count(),
+        **Booking.objects.aggregate(**booking_counters()),
+    })
+
+
+@use_replica
+@staff_member_required
+@require_GET
+async def dashboard_stats_async(request):
+    """
+    dashboard_stats for ASGI, with acount() and aaggregate(). The async ORM
+    runs every query on the same thread-sensitive executor, so gathering the
+    three would not overlap them; they are awaited in turn, and the event
+    loop serves other requests while each one runs.
+    """
+    return JsonResponse({
+        'total_rooms': await Room.objects.acount(),
+        'total_users': await User.objects.acount(),
+        **await Booking.objects.aaggregate(**booking_counters()),
+    })
+
+
+@staff_member_required
+@require_GET
+def request_metrics(request):
+    """
+    Per-endpoint latency/SQL/template summary for this server process,
+    worst first (?sort=p95_ms|mean_queries|..., ?top=N).
+    """
+    sort = request.GET.get('sort', 'p95_ms')
+    if sort not in SORT_KEYS:
+        return JsonResponse({'error': f"sort must be one of {', '.join(SORT_KEYS)}."}, status=400)
+    try:
+        top = int(request.GET.get('top', 0)) or None
+    except ValueError:
+        return JsonResponse({'error': 'top must be an integer.'}, status=400)
+
+    snapshot = recorder.snapshot()
+    return JsonResponse({
+        'enabled': settings.REQUEST_METRICS_ENABLED,
+        'pid': snapshot['pid'],
+        'endpoints': summarize([snapshot], sort=sort, top=top),
+    })
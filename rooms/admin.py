@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from rooms.models import Room
+from rooms.models import RatePlan, Room
 # Register your models here.
 
 @admin.register(Room)
@@ -8,3 +8,10 @@ class RoomAdmin(admin.ModelAdmin):
     list_display = ('room_number','room_type','price','capacity','status')
     list_filter = ('room_type','status')
     search_fields = ('room_number','description')
+
+
+@admin.register(RatePlan)
+class RatePlanAdmin(admin.ModelAdmin):
+    list_display = ('name', 'room_type', 'kind', 'value', 'start_date', 'end_date', 'weekdays', 'priority', 'active')
+    list_filter = ('active', 'kind', 'room_type')
+    search_fields = ('name',)
@@ -0,0 +1,134 @@
+# rooms/cache.py
+import threading
+import time
+
+from django.core.cache import cache, caches
+from django.core.cache.utils import make_template_fragment_key
+
+from ReservO.db import read_from_primary
+from .models import Room
+
+# Bumped by the Room signals; every catalog key embeds the current version,
+# so a bump makes all cached entries unreachable at once.
+CATALOG_VERSION_KEY = "rooms:catalog:version"
+CATALOG_TIMEOUT = 60 * 60
+
+
+class CacheCounter:
+    """Thread-safe hit/miss counter for one process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def reset(self):
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def report(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else None,
+        }
+
+
+catalog_counter = CacheCounter()
+
+# Template fragment versions: one per room card, plus one for the list as a
+# whole (membership and ordering). Bumped by the Room signals and kept in the
+# fragment cache itself, which is sized for one entry per room.
+FRAGMENT_CACHE = "fragments"
+ROOM_VERSION_KEY = "rooms:card:{pk}:version"
+ROOM_LIST_VERSION_KEY = "rooms:list:version"
+
+
+def catalog_version():
+    return cache.get_or_set(CATALOG_VERSION_KEY, 1, None)
+
+
+def bump_catalog_version():
+    try:
+        return cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.set(CATALOG_VERSION_KEY, 2, None)
+        return 2
+
+
+def _bump(key):
+    fragments = caches[FRAGMENT_CACHE]
+    try:
+        fragments.incr(key)
+    except ValueError:
+        # Missing (evicted) versions restart from the clock, never from a number an old fragment used
+        fragments.set(key, time.time_ns(), None)
+
+
+def room_list_version():
+    return caches[FRAGMENT_CACHE].get_or_set(ROOM_LIST_VERSION_KEY, time.time_ns, None)
+
+
+def room_versions(pks):
+    """{pk: fragment version} for the given rooms, in one cache round trip."""
+    fragments = caches[FRAGMENT_CACHE]
+    keys = {pk: ROOM_VERSION_KEY.format(pk=pk) for pk in pks}
+    found = fragments.get_many(keys.values())
+    missing = {key: time.time_ns() for key in keys.values() if key not in found}
+    if missing:
+        fragments.set_many(missing, None)
+        found.update(missing)
+    return {pk: found[key] for pk, key in keys.items()}
+
+
+def room_list_cached(is_staff):
+    """True when rooms/room_list.html has the whole list fragment for this audience cached."""
+    key = make_template_fragment_key("room-list", [room_list_version(), is_staff])
+    return caches[FRAGMENT_CACHE].has_key(key)
+
+
+def bump_room_list_version():
+    _bump(ROOM_LIST_VERSION_KEY)
+
+
+def bump_room_version(pk):
+    _bump(ROOM_VERSION_KEY.format(pk=pk))
+    bump_room_list_version()
+
+
+def cached_catalog(name, builder):
+    """Return the cached value for `name` at the current catalog version, building it on a miss."""
+    key = f"rooms:catalog:{catalog_version()}:{name}"
+    value = cache.get(key)
+    catalog_counter.record(hit=value is not None)
+    if value is None:
+        # Shared by every request until the next bump, so never built from a lagging replica
+        with read_from_primary():
+            value = builder()
+        cache.set(key, value, CATALOG_TIMEOUT)
+    return value
+
+
+def room_type_choices():
+    """Distinct room types currently in use, e.g. ["double", "single"]."""
+    return cached_catalog(
+        "room-types",
+        lambda: list(Room.objects.order_by("room_type").values_list("room_type", flat=True).distinct()),
+    )
+
+
+def room_choices():
+    """(pk, label) pairs for room dropdowns, in Room.Meta ordering."""
+    return cached_catalog(
+        "room-choices",
+        lambda: [(room.pk, str(room)) for room in Room.objects.only("id", "room_number", "room_type")],
+    )
+
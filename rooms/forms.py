@@ -4,4 +4,17 @@ from .models import Room
 class RoomForm(forms.ModelForm):
     class Meta:
         model = Room
-        fields= ['room_number','room_type','price','capacity','status','description','image']
\ No newline at end of file
+        fields= ['room_number','room_type','price','capacity','status','description','image']
+
+
+class RoomAvailabilityForm(forms.Form):
+    """Optional date range on the room list; when valid each room shows whether it is free."""
+    check_in = forms.DateField(widget=forms.DateInput(attrs={'type': 'date', 'class': 'form-control'}))
+    check_out = forms.DateField(widget=forms.DateInput(attrs={'type': 'date', 'class': 'form-control'}))
+
+    def clean(self):
+        cleaned = super().clean()
+        check_in, check_out = cleaned.get('check_in'), cleaned.get('check_out')
+        if check_in and check_out and check_in >= check_out:
+            raise forms.ValidationError("Check-out must be after check-in.")
+        return cleaned
@@ -0,0 +1,144 @@
+# rooms/images.py
+import hashlib
+import logging
+import os
+from io import BytesIO
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+# Widths (px) rendered for srcset; never upscaled past the original
+IMAGE_WIDTHS = (320, 640, 1024)
+# format -> (file extension, Pillow format, save options)
+IMAGE_FORMATS = {
+    "webp": ("webp", "WEBP", {"quality": 80, "method": 6}),
+    "jpeg": ("jpg", "JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+VARIANTS_DIR = "rooms/variants"
+
+
+def content_hash(field_file):
+    """sha256 hex digest of a FieldFile's bytes (committed or freshly uploaded)."""
+    digest = hashlib.sha256()
+    field_file.open("rb")
+    try:
+        field_file.seek(0)
+        for chunk in field_file.chunks():
+            digest.update(chunk)
+        field_file.seek(0)
+    finally:
+        if field_file._committed:
+            field_file.close()
+    return digest.hexdigest()
+
+
+def canonical_name(digest, filename):
+    ext = os.path.splitext(filename)[1].lower() or ".jpg"
+    return f"rooms/{digest[:20]}{ext}"
+
+
+def store_original(room, digest):
+    """
+    Point room.image at the content-addressed copy of its bytes, writing it
+    only if no identical file is stored yet. Re-uploading the same photo
+    therefore never adds another copy.
+    """
+    storage = room.image.storage
+    name = canonical_name(digest, room.image.name)
+    if room.image.name == name:
+        return
+    if not storage.exists(name):
+        room.image.open("rb")
+        room.image.seek(0)
+        name = storage.save(name, room.image)
+    room.image = name
+
+
+def build_variants(storage, name, digest, force=False):
+    """
+    Resized WebP and JPEG copies of the stored image `name` at IMAGE_WIDTHS,
+    kept under a directory named after the content hash so identical images
+    share them. Returns {"webp": {"320": name, ...}, "jpeg": {...}}, or {}
+    if the file is not a readable image.
+    """
+    try:
+        with storage.open(name, "rb") as fh:
+            image = ImageOps.exif_transpose(Image.open(fh))
+            image.load()
+    except (OSError, UnidentifiedImageError):
+        logger.warning("Cannot read image %s", name)
+        return {}
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+
+    variants = {fmt: {} for fmt in IMAGE_FORMATS}
+    for width in sorted({min(width, image.width) for width in IMAGE_WIDTHS}):
+        resized = None
+        for fmt, (ext, pil_format, options) in IMAGE_FORMATS.items():
+            variant = f"{VARIANTS_DIR}/{digest[:20]}/{width}.{ext}"
+            if force and storage.exists(variant):
+                storage.delete(variant)
+            if not storage.exists(variant):
+                if resized is None:
+                    height = max(round(image.height * width / image.width), 1)
+                    resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+                buffer = BytesIO()
+                resized.save(buffer, pil_format, **options)
+                variant = storage.save(variant, ContentFile(buffer.getvalue()))
+            variants[fmt][str(width)] = variant
+    return variants
+
+
+def srcset(storage, variants, fmt):
+    """"url 320w, url 640w, ..." for one format, or "" if no variants were built."""
+    return ", ".join(
+        f"{storage.url(name)} {width}w"
+        for width, name in sorted((variants.get(fmt) or {}).items(), key=lambda item: int(item[0]))
+    )
+
+
+def fallback_src(storage, variants, original_url, width=640):
+    """URL for <img src>: the JPEG variant closest to `width` from below, else the original."""
+    jpeg = variants.get("jpeg") or {}
+    widths = sorted(int(w) for w in jpeg)
+    if not widths:
+        return original_url
+    best = max([w for w in widths if w <= width] or widths[:1])
+    return storage.url(jpeg[str(best)])
+
+
+def media_variants(storage, name):
+    """Variants for a media file referenced directly by templates (no Room row), built once."""
+    key = f"rooms:media-variants:{name}"
+    variants = cache.get(key)
+    if variants is None:
+        variants = {}
+        if storage.exists(name):
+            with storage.open(name, "rb") as fh:
+                digest = hashlib.sha256(fh.read()).hexdigest()
+            variants = build_variants(storage, name, digest)
+        cache.set(key, variants, None)
+    return variants
+
+
+def process_room_image(room, force=False):
+    """
+    Image stage of Room.save(): dedupe a new upload by content hash and
+    (re)build its thumbnails. Existing images are only reprocessed when they
+    have no hash yet or `force` is set. Returns True if anything changed.
+    """
+    if not room.image:
+        changed = bool(room.image_hash or room.image_variants)
+        room.image_hash, room.image_variants = "", {}
+        return changed
+    if room.image._committed and room.image_hash and not force:
+        return False
+
+    digest = content_hash(room.image)
+    store_original(room, digest)
+    room.image_hash = digest
+    room.image_variants = build_variants(room.image.storage, room.image.name, digest, force=force)
+    return True
@@ -0,0 +1,80 @@
+import random
+import statistics
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from bookings.seeding import clear_benchmark_data, seed_benchmark_data
+from rooms.cache import bump_room_version
+
+
+def uncached_loader_templates():
+    """settings.TEMPLATES with the plain (non-caching) loaders, recompiling templates on every render."""
+    templates = [dict(engine, OPTIONS=dict(engine["OPTIONS"])) for engine in settings.TEMPLATES]
+    templates[0]["OPTIONS"]["loaders"] = [
+        "django.template.loaders.filesystem.Loader",
+        "django.template.loaders.app_directories.Loader",
+    ]
+    return templates
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the room list for a synthetic catalog in a throwaway test database and compare "
+        "no caching, the cached template loader, warm card fragments and one edited card."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rooms", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            clear_benchmark_data()
+            rooms, _, _ = seed_benchmark_data(rooms=options["rooms"], users=1, bookings=0, seed=options["seed"])
+            self._run([room.pk for room in rooms], options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def _run(self, room_ids, options):
+        client = Client()
+        fragments = caches["fragments"]
+        rng = random.Random(options["seed"])
+
+        def edit_one_card():
+            bump_room_version(rng.choice(room_ids))
+
+        scenarios = [
+            ("no caching", uncached_loader_templates(), fragments.clear),
+            ("cached loader", None, fragments.clear),
+            ("cached loader + fragments", None, None),
+            ("one card edited", None, edit_one_card),
+        ]
+        self.stdout.write(self.style.MIGRATE_HEADING(f"GET /rooms/ with {len(room_ids)} rooms"))
+        baseline = None
+        for label, templates, before in scenarios:
+            with override_settings(**({"TEMPLATES": templates} if templates else {})):
+                client.get("/rooms/")  # warm-up
+                timings = []
+                for _ in range(options["repeat"]):
+                    if before:
+                        before()
+                    started = time.perf_counter()
+                    response = client.get("/rooms/")
+                    timings.append((time.perf_counter() - started) * 1000)
+                    assert response.status_code == 200, response.status_code
+            median = statistics.median(timings)
+            baseline = baseline or median
+            self.stdout.write(
+                f"  {label:<28} median {median:>8.2f} ms  min {min(timings):>8.2f} ms  x{baseline / median:.1f}"
+            )
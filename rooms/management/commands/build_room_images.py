@@ -0,0 +1,56 @@
+import hashlib
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+from rooms.images import VARIANTS_DIR, process_room_image
+from rooms.models import Room
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfill responsive image variants for existing rooms: move each photo to its "
+        "content-addressed name (identical photos share one file) and build the WebP/JPEG "
+        "thumbnails. Reports duplicate files under rooms/ that no room uses any more."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Rebuild variants that already exist.")
+
+    def handle(self, *args, **options):
+        processed = 0
+        for room in Room.objects.exclude(image=""):
+            if process_room_image(room, force=options["force"]):
+                room.save(update_fields=["image", "image_hash", "image_variants"])
+                processed += 1
+                built = len(room.image_variants.get("jpeg", {}))
+                self.stdout.write(f"  {room.room_number}: {room.image.name} ({built} width(s))")
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} room image(s)."))
+        self._report_duplicates()
+
+    def _report_duplicates(self):
+        """List files in rooms/ with the same bytes as a file some room uses, without deleting anything."""
+        storage = Room._meta.get_field("image").storage
+        used = set(Room.objects.exclude(image="").values_list("image", flat=True))
+        used_hashes = set(Room.objects.exclude(image_hash="").values_list("image_hash", flat=True))
+
+        copies = defaultdict(list)
+        _, files = storage.listdir("rooms")
+        for filename in files:
+            name = f"rooms/{filename}"
+            if name in used or name.startswith(VARIANTS_DIR):
+                continue
+            with storage.open(name, "rb") as fh:
+                digest = hashlib.sha256(fh.read()).hexdigest()
+            if digest in used_hashes:
+                copies[digest].append((name, storage.size(name)))
+
+        if copies:
+            total = sum(size for names in copies.values() for _, size in names)
+            self.stdout.write(
+                f"{sum(len(names) for names in copies.values())} file(s) under rooms/ duplicate a stored "
+                f"room photo ({total / 1024:.0f} KB). They may still be linked from templates; delete by hand:"
+            )
+            for names in copies.values():
+                for name, size in names:
+                    self.stdout.write(f"  {name} ({size / 1024:.0f} KB)")
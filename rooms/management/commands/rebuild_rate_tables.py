@@ -0,0 +1,26 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from rooms.cache import bump_catalog_version
+from rooms.rates import RATE_TABLE_DAYS, rebuild_rate_tables
+
+
+class Command(BaseCommand):
+    help = (
+        f"Rematerialize every room's nightly rate table ({RATE_TABLE_DAYS} nights from today). "
+        "Tables are rebuilt automatically when a rate plan or room changes; run this daily "
+        "so the window rolls forward, and once after deploying rate plans."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", help="First night of the tables (YYYY-MM-DD, default today).")
+
+    def handle(self, *args, **options):
+        try:
+            start = date.fromisoformat(options["start"]) if options["start"] else None
+        except ValueError:
+            raise CommandError("--start must be a YYYY-MM-DD date.")
+        count = rebuild_rate_tables(start=start)
+        bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} rate table(s)."))
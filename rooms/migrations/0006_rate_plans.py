@@ -0,0 +1,41 @@
+# Generated by Django 5.1.15 on 2026-10-18 09:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0005_room_image_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RatePlan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('room_type', models.CharField(blank=True, choices=[('single', 'Single'), ('double', 'Double'), ('suite', 'Suite'), ('conference', 'Conference')], help_text='Leave blank to apply to every room type.', max_length=20)),
+                ('start_date', models.DateField(blank=True, null=True)),
+                ('end_date', models.DateField(blank=True, help_text='Last night the rule applies to.', null=True)),
+                ('weekdays', models.CharField(blank=True, help_text='Nights it applies to, 0=Mon ... 6=Sun (e.g. 45 for Fri and Sat). Blank for every night.', max_length=7)),
+                ('kind', models.CharField(choices=[('override', 'Nightly price'), ('percent', 'Percent adjustment'), ('amount', 'Amount adjustment')], default='percent', max_length=10)),
+                ('value', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('priority', models.PositiveSmallIntegerField(default=0, help_text='Lower numbers are applied first.')),
+                ('active', models.BooleanField(default=True)),
+            ],
+            options={
+                'ordering': ['priority', 'id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RoomRateTable',
+            fields=[
+                ('room', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rate_table', serialize=False, to='rooms.room')),
+                ('start', models.DateField()),
+                ('prices', models.BinaryField()),
+                ('built_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,40 @@
+from array import array
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import migrations
+
+# rooms.rates.RATE_TABLE_DAYS when this migration was written
+RATE_TABLE_DAYS = 366
+
+
+def backfill_rate_tables(apps, schema_editor):
+    """
+    Give every existing room a rate table. No rate plan exists yet when
+    0006 creates the tables, so each night costs the room's base price.
+    Rooms that already have a table are left alone.
+    """
+    Room = apps.get_model("rooms", "Room")
+    RoomRateTable = apps.get_model("rooms", "RoomRateTable")
+    start = date.today()
+    tables = (
+        RoomRateTable(
+            room_id=pk,
+            start=start,
+            prices=array("q", [int(price.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP) * 100)]
+                         * RATE_TABLE_DAYS).tobytes(),
+        )
+        for pk, price in Room.objects.values_list("pk", "price").iterator()
+    )
+    RoomRateTable.objects.bulk_create(tables, batch_size=500, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0006_rate_plans'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rate_tables, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,29 @@
 from django.db import models
 from decimal import  Decimal
 # Create your models here.
+class RoomQuerySet(models.QuerySet):
+    def with_availability(self, check_in, check_out, exclude_booking_id=None):
+        """
+        Annotate every room with `is_free` for [check_in, check_out) in the
+        same SQL statement: False under maintenance or out of service,
+        otherwise a correlated NOT EXISTS on the (room, date) occupancy
+        table, which only holds nights of non-declined bookings.
+        """
+        from bookings.models import RoomNight  # local import: bookings.models depends on this app
+
+        taken = RoomNight.objects.filter(room=models.OuterRef("pk"), date__gte=check_in, date__lt=check_out)
+        if exclude_booking_id:
+            taken = taken.exclude(booking_id=exclude_booking_id)
+        return self.annotate(is_free=models.Case(
+            models.When(status__in=Room.UNAVAILABLE_STATUSES, then=models.Value(False)),
+            default=~models.Exists(taken),
+            output_field=models.BooleanField(),
+        ))
+
+    def available_for(self, check_in, check_out, exclude_booking_id=None):
+        return self.with_availability(check_in, check_out, exclude_booking_id).filter(is_free=True)
+
+
 class Room(models.Model):
     ROOM_TYPES = [
         ("single", "Single"),
@@ -15,6 +38,8 @@ class Room(models.Model):
         ("maintenance", "Maintenance"),
         ("out_of_service", "Out of Service"),
     ]
+    # Statuses that make a room unbookable whatever its bookings
+    UNAVAILABLE_STATUSES = ("maintenance", "out_of_service")
 
     room_number = models.CharField(max_length=20, unique=True)
     room_type = models.CharField(max_length=20, choices=ROOM_TYPES, default='single')
@@ -23,6 +48,11 @@ class Room(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="available")
     description = models.TextField(blank=True)
     image = models.ImageField(upload_to="rooms/", blank=True)
+    # Filled by rooms.images on save: sha256 of the image and its resized copies
+    image_hash = models.CharField(max_length=64, blank=True, editable=False)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+
+    objects = RoomQuerySet.as_manager()
 
     class Meta:
         ordering = ["room_number"]
@@ -30,27 +60,96 @@ class Room(models.Model):
     def __str__(self):
         return f"Room: {self.room_number} ({self.get_room_type_display()})"
 
+    def save(self, *args, **kwargs):
+        from .images import process_room_image
+        if process_room_image(self) and kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "image", "image_hash", "image_variants"}
+        super().save(*args, **kwargs)
+
     def is_available_for_period(self, check_in, check_out, exclude_booking_id=None):
-        if self.status in ("maintenance", "out_of_service"):
+        """Single-room check; for a list of rooms use Room.objects.with_availability() instead."""
+        if self.status in self.UNAVAILABLE_STATUSES:
             return False
 
-        from bookings.models import Booking
-        qs = Booking.objects.filter(room=self).exclude(status="cancelled")
-        if exclude_booking_id:
-            qs = qs.exclude(pk=exclude_booking_id)
+        # One lookup on the (room, date) occupancy table
+        from bookings.occupancy import room_is_free
+        return room_is_free(self.pk, check_in, check_out, exclude_booking_id=exclude_booking_id)
 
-        overlaps = qs.filter(
-            check_in__lt=check_out,
-            check_out__gt=check_in
-        ).exists()
+    def is_available(self, check_in, check_out):
+        return self.is_available_for_period(check_in, check_out)
 
-        return not overlaps
+class RatePlan(models.Model):
+    """
+    A pricing rule. Every active rule matching a night (room type, date
+    range, weekday) is applied to the room's base price in priority order:
+    "override" sets the nightly price, "percent" adjusts it by `value` %
+    and "amount" adds `value`. The result is materialized per room and
+    night in RoomRateTable by rooms.rates.
+    """
+    KIND_OVERRIDE = "override"
+    KIND_PERCENT = "percent"
+    KIND_AMOUNT = "amount"
+    KIND_CHOICES = [
+        (KIND_OVERRIDE, "Nightly price"),
+        (KIND_PERCENT, "Percent adjustment"),
+        (KIND_AMOUNT, "Amount adjustment"),
+    ]
+
+    name = models.CharField(max_length=100)
+    room_type = models.CharField(max_length=20, choices=Room.ROOM_TYPES, blank=True,
+                                 help_text="Leave blank to apply to every room type.")
+    start_date = models.DateField(null=True, blank=True)
+    end_date = models.DateField(null=True, blank=True, help_text="Last night the rule applies to.")
+    weekdays = models.CharField(max_length=7, blank=True,
+                                help_text="Nights it applies to, 0=Mon ... 6=Sun (e.g. 45 for Fri and Sat). Blank for every night.")
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, default=KIND_PERCENT)
+    value = models.DecimalField(max_digits=10, decimal_places=2)
+    priority = models.PositiveSmallIntegerField(default=0, help_text="Lower numbers are applied first.")
+    active = models.BooleanField(default=True)
+
+    class Meta:
+        ordering = ["priority", "id"]
+
+    def __str__(self):
+        return self.name
+
+    def clean(self):
+        from django.core.exceptions import ValidationError
+        if self.start_date and self.end_date and self.start_date > self.end_date:
+            raise ValidationError({"end_date": "End date must not be before the start date."})
+        if any(day not in "0123456" for day in self.weekdays):
+            raise ValidationError({"weekdays": "Use the digits 0 (Monday) to 6 (Sunday)."})
+
+    def matches(self, room_type, night):
+        return (
+            (not self.room_type or self.room_type == room_type)
+            and (self.start_date is None or night >= self.start_date)
+            and (self.end_date is None or night <= self.end_date)
+            and (not self.weekdays or str(night.weekday()) in self.weekdays)
+        )
+
+    def apply(self, price):
+        if self.kind == self.KIND_OVERRIDE:
+            return self.value
+        if self.kind == self.KIND_PERCENT:
+            return price * (100 + self.value) / 100
+        return price + self.value
+
+
+class RoomRateTable(models.Model):
+    """
+    Materialized nightly prices for one room: rooms.rates.RATE_TABLE_DAYS
+    nights from `start`, packed as int64 cents. Rebuilt whenever a RatePlan
+    or the room itself changes, so quoting a stay is a slice sum.
+    """
+    room = models.OneToOneField(Room, on_delete=models.CASCADE, primary_key=True, related_name="rate_table")
+    start = models.DateField()
+    prices = models.BinaryField()
+    built_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Rates for room {self.room_id} from {self.start}"
 
-    def is_available(self, check_in, check_out):
-        return not self.booking_set.filter(
-            check_in__lt=check_out,
-            check_out__gt=check_in
-        ).exists()
 
 class RoomType(models.Model):
     name = models.CharField(max_length=100)
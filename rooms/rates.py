@@ -0,0 +1,151 @@
+# rooms/rates.py
+import threading
+from array import array
+from datetime import date, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from itertools import accumulate
+
+from ReservO.db import read_from_primary
+from .cache import catalog_version
+from .models import RatePlan, Room, RoomRateTable
+
+# Nights materialized per room, counted from the day the table is built
+RATE_TABLE_DAYS = 366
+CENT = Decimal("0.01")
+
+
+def to_cents(price):
+    return int(price.quantize(CENT, rounding=ROUND_HALF_UP) * 100)
+
+
+def active_rules():
+    return list(RatePlan.objects.filter(active=True))
+
+
+def night_price(base, room_type, night, rules):
+    """Rule evaluation for one night; the slow path the rate tables exist to avoid."""
+    price = base
+    for rule in rules:
+        if rule.matches(room_type, night):
+            price = rule.apply(price)
+    return max(price, Decimal("0")).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def nightly_cents(room_type, base, start, days, rules):
+    """array('q') of the price in cents of each of `days` nights from `start`."""
+    rules = [rule for rule in rules if not rule.room_type or rule.room_type == room_type]
+    return array("q", (
+        to_cents(night_price(base, room_type, start + timedelta(days=offset), rules))
+        for offset in range(days)
+    ))
+
+
+def rebuild_rate_tables(rooms=None, start=None):
+    """
+    Materialize RATE_TABLE_DAYS nights from `start` (default today) for
+    `rooms` (default every room) with one upsert. Rooms sharing a type and
+    base price share one computed row. Returns the number of tables written.
+    """
+    start = start or date.today()
+    rules = active_rules()
+    if rooms is None:
+        rooms = Room.objects.only("id", "room_type", "price")
+
+    built, tables = {}, []
+    for room in rooms:
+        key = (room.room_type, room.price)
+        if key not in built:
+            built[key] = nightly_cents(room.room_type, room.price, start, RATE_TABLE_DAYS, rules).tobytes()
+        tables.append(RoomRateTable(room_id=room.pk, start=start, prices=built[key]))
+    RoomRateTable.objects.bulk_create(
+        tables, batch_size=500,
+        update_conflicts=True, unique_fields=["room"], update_fields=["start", "prices", "built_at"],
+    )
+    return len(tables)
+
+
+class RateTableCache:
+    """
+    Prefix sums of the materialized rate tables, loaded on demand for this
+    process. Every rate change bumps the catalog version, which drops them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._tables = {}
+
+    def get(self, room_ids):
+        """{room_id: (start, prefix sums) or None if the room has no table}, in at most one query."""
+        version = catalog_version()
+        with self._lock:
+            if version != self._version:
+                self._version, self._tables = version, {}
+            found = {pk: self._tables[pk] for pk in room_ids if pk in self._tables}
+        missing = [pk for pk in room_ids if pk not in found]
+        if missing:
+            loaded = dict.fromkeys(missing)
+            with read_from_primary():
+                rows = list(
+                    RoomRateTable.objects.filter(room_id__in=missing).values_list("room_id", "start", "prices")
+                )
+            for room_id, start, prices in rows:
+                nightly = array("q")
+                nightly.frombytes(prices)
+                loaded[room_id] = (start, array("q", accumulate(nightly, initial=0)))
+            with self._lock:
+                if self._version == version:
+                    self._tables.update(loaded)
+            found.update(loaded)
+        return found
+
+    def clear(self):
+        with self._lock:
+            self._version, self._tables = None, {}
+
+
+rate_tables = RateTableCache()
+
+
+def quote_many(stays):
+    """
+    Totals for many (room, check_in, check_out) stays in one call: one query
+    for the tables this process has not loaded yet, then two prefix-sum
+    lookups per stay. Nights outside a room's table (or rooms without one)
+    fall back to rule evaluation. Returns Decimals in input order.
+    """
+    stays = list(stays)
+    tables = rate_tables.get({room.pk for room, _, _ in stays})
+    rules = None
+    totals = []
+    for room, check_in, check_out in stays:
+        nights = (check_out - check_in).days
+        cents, covered = 0, range(0)
+        table = tables.get(room.pk)
+        if table and nights > 0:
+            start, prefix = table
+            offset = (check_in - start).days
+            lo, hi = max(offset, 0), min(offset + nights, len(prefix) - 1)
+            if lo < hi:
+                cents = prefix[hi] - prefix[lo]
+                covered = range(lo - offset, hi - offset)
+        if len(covered) < max(nights, 0):
+            if rules is None:
+                rules = active_rules()
+            cents += sum(
+                to_cents(night_price(room.price, room.room_type, check_in + timedelta(days=night), rules))
+                for night in range(nights) if night not in covered
+            )
+        totals.append(Decimal(cents).scaleb(-2))
+    return totals
+
+
+def quote_stay(room, check_in, check_out):
+    return quote_many([(room, check_in, check_out)])[0]
+
+
+def annotate_stay_totals(rooms, check_in, check_out):
+    """Set room.stay_total on each room for [check_in, check_out) with a single quote_many() call."""
+    for room, total in zip(rooms, quote_many((room, check_in, check_out) for room in rooms)):
+        room.stay_total = total
+    return rooms
@@ -0,0 +1,48 @@
+# rooms/signals.py
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import bump_catalog_version, bump_room_version
+from .models import RatePlan, Room
+from .rates import rebuild_rate_tables
+
+
+@receiver(post_save, sender=Room)
+def rebuild_room_rates(sender, instance, raw=False, **kwargs):
+    # Registered before the catalog bump below, so no reader sees the new version with the old rates
+    if not raw:
+        rebuild_rate_tables([instance])
+
+
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Room)
+def invalidate_room_catalog(sender, instance, **kwargs):
+    bump_catalog_version()
+    bump_room_version(instance.pk)
+
+
+@receiver(pre_save, sender=RatePlan)
+def remember_plan_room_type(sender, instance, raw=False, **kwargs):
+    # A plan moved to another room type must also reprice the rooms it used to cover
+    instance._previous_room_type = None
+    if instance.pk and not raw:
+        instance._previous_room_type = (
+            RatePlan.objects.filter(pk=instance.pk).values_list("room_type", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=RatePlan)
+@receiver(post_delete, sender=RatePlan)
+def rebuild_rates_for_plan(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    room_types = {instance.room_type}
+    previous = getattr(instance, "_previous_room_type", None)
+    if previous is not None:
+        room_types.add(previous)
+    rooms = Room.objects.only("id", "room_type", "price")
+    # A blank room type covers every room
+    if "" not in room_types:
+        rooms = rooms.filter(room_type__in=room_types)
+    rebuild_rate_tables(rooms)
+    bump_catalog_version()
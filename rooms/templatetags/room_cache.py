@@ -0,0 +1,26 @@
+from django import template
+from django.conf import settings
+
+from rooms import cache as room_cache
+
+register = template.Library()
+
+
+@register.simple_tag
+def fragment_timeout():
+    return settings.FRAGMENT_TIMEOUT
+
+
+@register.simple_tag
+def room_list_version():
+    return room_cache.room_list_version()
+
+
+@register.filter
+def with_card_versions(rooms):
+    """The rooms as a list, each with .card_version for its {% cache %} key (one cache round trip)."""
+    rooms = list(rooms)
+    versions = room_cache.room_versions([room.pk for room in rooms])
+    for room in rooms:
+        room.card_version = versions[room.pk]
+    return rooms
@@ -0,0 +1,36 @@
+from django import template
+from django.core.files.storage import default_storage
+
+from rooms.images import fallback_src, media_variants, srcset
+
+register = template.Library()
+
+# Cards take a third of the row on desktop and the full width on phones
+CARD_SIZES = "(min-width: 768px) 33vw, 100vw"
+
+
+def _picture(storage, variants, original_url, alt, css_class, sizes):
+    return {
+        "webp_srcset": srcset(storage, variants, "webp"),
+        "jpeg_srcset": srcset(storage, variants, "jpeg"),
+        "src": fallback_src(storage, variants, original_url),
+        "alt": alt,
+        "css_class": css_class,
+        "sizes": sizes,
+    }
+
+
+@register.inclusion_tag("rooms/picture.html")
+def room_picture(room, fallback="", css_class="card-img-top", sizes=CARD_SIZES):
+    """<picture> with WebP/JPEG srcsets for a room photo; `fallback` is a media path used when there is no photo."""
+    if not room.image:
+        return media_picture(fallback, "No Image", css_class, sizes)
+    return _picture(
+        room.image.storage, room.image_variants, room.image.url, f"Room {room.room_number}", css_class, sizes
+    )
+
+
+@register.inclusion_tag("rooms/picture.html")
+def media_picture(name, alt="", css_class="card-img-top", sizes=CARD_SIZES):
+    """Same for a fixed file under MEDIA_ROOT, e.g. "rooms/suite1.jpg"; variants are built on first use."""
+    return _picture(default_storage, media_variants(default_storage, name), default_storage.url(name), alt, css_class, sizes)
@@ -1,3 +1,306 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+from io import BytesIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.cache.utils import make_template_fragment_key
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+from PIL import Image
+
+from bookings.models import Booking
+from rooms.cache import catalog_counter, catalog_version, room_choices, room_versions
+from rooms.images import VARIANTS_DIR
+from rooms.models import RatePlan, Room, RoomRateTable
+from rooms.rates import RATE_TABLE_DAYS, active_rules, night_price, quote_many, rate_tables
+
+
+class TempMediaMixin:
+    """Write image files and variants to a throwaway MEDIA_ROOT."""
+
+    @classmethod
+    def setUpClass(cls):
+        media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        cls.enterClassContext(override_settings(MEDIA_ROOT=media_root))
+        super().setUpClass()
+
+
+class RoomListFragmentTests(TempMediaMixin, TestCase):
+    """The cached room list re-renders exactly the cards whose room changed."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.rooms = [
+            Room.objects.create(room_number=f"5{i:02d}", room_type="single", price=Decimal("60.00"), capacity=1)
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        caches["fragments"].clear()
+
+    def test_warm_list_runs_no_room_query(self):
+        self.client.get("/rooms/")
+        with self.assertNumQueries(0):
+            self.assertContains(self.client.get("/rooms/"), "Room 500")
+
+    def test_edit_and_delete_show_up(self):
+        self.client.get("/rooms/")
+        room = self.rooms[1]
+        room.room_type = "suite"
+        room.save()
+        self.rooms[2].delete()
+
+        response = self.client.get("/rooms/")
+        self.assertContains(response, "<strong>Type:</strong> suite", html=False)
+        self.assertNotContains(response, "Room 502")
+
+    def test_async_list_matches_and_warm_list_runs_no_query(self):
+        cold = self.client.get("/rooms/async/")
+        with self.assertNumQueries(0):
+            warm = self.client.get("/rooms/async/")
+        self.assertEqual(warm.content, cold.content)
+        for room in self.rooms:
+            self.assertContains(warm, f"Room {room.room_number}")
+
+        self.rooms[0].delete()
+        self.assertNotContains(self.client.get("/rooms/async/"), "Room 500")
+
+    def test_async_list_with_dates(self):
+        check_in = date.today() + timedelta(days=5)
+        params = {"check_in": check_in, "check_out": check_in + timedelta(days=2)}
+        response = self.client.get("/rooms/async/", params)
+        self.assertEqual([room.room_number for room in response.context["rooms"]], ["500", "501", "502"])
+        self.assertTrue(all(room.is_free for room in response.context["rooms"]))
+
+    @mock.patch("ReservO.db.replica_configured", return_value=True)
+    def test_fragment_misses_render_from_the_primary(self, _):
+        # No "replica" connection exists here, so any read routed to it would raise
+        self.assertContains(self.client.get("/rooms/"), "Room 501")
+        caches["fragments"].clear()
+        self.assertContains(self.client.get("/rooms/async/"), "Room 501")
+
+
+class RateTableTests(TestCase):
+    """Quotes from the precomputed tables equal evaluating every rule night by night."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.today = date.today()
+        cls.rooms = [
+            Room.objects.create(room_number="701", room_type="single", price=Decimal("59.99"), capacity=1),
+            Room.objects.create(room_number="702", room_type="double", price=Decimal("85.00"), capacity=2),
+            Room.objects.create(room_number="703", room_type="suite", price=Decimal("210.00"), capacity=4),
+        ]
+        RatePlan.objects.create(name="Weekend", weekdays="45", kind=RatePlan.KIND_PERCENT, value=Decimal("20"))
+        RatePlan.objects.create(
+            name="Suite season", room_type="suite", start_date=cls.today + timedelta(days=30),
+            end_date=cls.today + timedelta(days=60), kind=RatePlan.KIND_OVERRIDE, value=Decimal("180.00"),
+        )
+        RatePlan.objects.create(
+            name="Double surcharge", room_type="double", kind=RatePlan.KIND_AMOUNT, value=Decimal("7.50"), priority=5,
+        )
+
+    def setUp(self):
+        # Loaded tables outlive the rollback of the previous test's rate changes
+        rate_tables.clear()
+
+    def rule_by_rule(self, room, check_in, check_out):
+        rules = active_rules()
+        return sum(
+            (night_price(room.price, room.room_type, check_in + timedelta(days=n), rules)
+             for n in range((check_out - check_in).days)),
+            Decimal("0.00"),
+        )
+
+    def assertQuotesMatch(self, stays):
+        self.assertEqual(quote_many(stays), [self.rule_by_rule(*stay) for stay in stays])
+
+    def test_quotes_match_rule_evaluation(self):
+        # Inside the table, across its first and last nights, and wholly outside it
+        starts = [-3, 0, 5, 28, 58, 200, RATE_TABLE_DAYS - 2, RATE_TABLE_DAYS + 10]
+        self.assertQuotesMatch([
+            (room, self.today + timedelta(days=start), self.today + timedelta(days=start + nights))
+            for room in self.rooms
+            for start in starts
+            for nights in (1, 4, 9)
+        ])
+
+    def test_moving_a_plan_reprices_old_and_new_room_types(self):
+        plan = RatePlan.objects.get(name="Suite season")
+        plan.room_type = "single"
+        plan.save()
+        stays = [(room, self.today + timedelta(days=29), self.today + timedelta(days=33)) for room in self.rooms]
+        self.assertQuotesMatch(stays)
+
+        plan.delete()
+        self.assertQuotesMatch(stays)
+
+    def test_every_room_has_a_table(self):
+        self.assertEqual(RoomRateTable.objects.count(), len(self.rooms))
+
+
+class ImageVariantTests(TempMediaMixin, TestCase):
+    """Identical photos are stored once and share one set of variants."""
+
+    @classmethod
+    def setUpTestData(cls):
+        buffer = BytesIO()
+        Image.new("RGB", (800, 400), "teal").save(buffer, "PNG")
+        cls.photo = buffer.getvalue()
+
+    def room(self, number, filename):
+        return Room.objects.create(
+            room_number=number, room_type="single", price=Decimal("60.00"), capacity=1,
+            image=SimpleUploadedFile(filename, self.photo, content_type="image/png"),
+        )
+
+    def test_identical_uploads_share_files(self):
+        first, second = self.room("801", "front.png"), self.room("802", "copy of front.png")
+        self.assertEqual(second.image.name, first.image.name)
+        self.assertEqual(second.image_hash, first.image_hash)
+        self.assertEqual(second.image_variants, first.image_variants)
+        # Never upscaled: the 1024 width collapses onto the original 800
+        self.assertEqual(set(first.image_variants["webp"]), {"320", "640", "800"})
+
+        storage = first.image.storage
+        self.assertEqual(storage.listdir("rooms")[1], [first.image.name.split("/")[-1]])
+        self.assertEqual(storage.listdir(VARIANTS_DIR)[0], [first.image_hash[:20]])
+        self.assertEqual(len(storage.listdir(f"{VARIANTS_DIR}/{first.image_hash[:20]}")[1]), 6)
+
+    def test_resave_does_not_rebuild(self):
+        room = self.room("803", "front.png")
+        with mock.patch("rooms.images.build_variants") as build:
+            room.save()
+            Room.objects.get(pk=room.pk).save()
+        build.assert_not_called()
+
+
+class AvailabilityAnnotationTests(TestCase):
+    """with_availability() agrees with the single-room check, including stays that touch at the edges."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.day = date.today() + timedelta(days=80)
+        guest = User.objects.create_user("annotated", password="pw")
+        cls.booked, cls.maintenance, cls.declined, cls.free, cls.later = [
+            Room.objects.create(room_number=f"170{i}", price=Decimal("60.00"), capacity=2,
+                                status="maintenance" if i == 1 else "available")
+            for i in range(5)
+        ]
+
+        def book(room, start, end, status=Booking.STATUS_PENDING):
+            booking = Booking(user=guest, room=room, check_in=cls.at(start), check_out=cls.at(end), status=status)
+            booking.save(validate=False)
+            return booking
+
+        cls.booking = book(cls.booked, 2, 5)
+        book(cls.declined, 2, 5, status=Booking.STATUS_DECLINED)
+        book(cls.later, 5, 7, status=Booking.STATUS_APPROVED)
+
+    @classmethod
+    def at(cls, offset):
+        return cls.day + timedelta(days=offset)
+
+    def free_rooms(self, start, end, exclude_booking_id=None):
+        rooms = Room.objects.filter(room_number__startswith="170").with_availability(
+            self.at(start), self.at(end), exclude_booking_id=exclude_booking_id,
+        )
+        for room in rooms:
+            self.assertEqual(
+                room.is_free,
+                room.is_available_for_period(self.at(start), self.at(end), exclude_booking_id=exclude_booking_id),
+                room.room_number,
+            )
+        return {room.room_number for room in rooms if room.is_free}
+
+    def test_overlap_maintenance_and_declined(self):
+        # Under maintenance never frees up; a declined booking never blocks
+        self.assertEqual(self.free_rooms(2, 5), {"1702", "1703", "1704"})
+        self.assertEqual(self.free_rooms(3, 4), {"1702", "1703", "1704"})
+
+    def test_stays_touching_at_the_edges(self):
+        # Checking out the day a booking checks in, and checking in the day it checks out
+        self.assertEqual(self.free_rooms(0, 2), {"1700", "1702", "1703", "1704"})
+        self.assertEqual(self.free_rooms(5, 7), {"1700", "1702", "1703"})
+        self.assertEqual(self.free_rooms(4, 6), {"1702", "1703"})
+
+    def test_exclude_booking(self):
+        self.assertIn("1700", self.free_rooms(3, 4, exclude_booking_id=self.booking.pk))
+        # Excluding some other (or no longer existing) booking still leaves this one blocking
+        self.assertNotIn("1700", self.free_rooms(3, 6, exclude_booking_id=self.booking.pk + 100))
+        self.assertEqual(
+            list(Room.objects.available_for(self.at(2), self.at(6), exclude_booking_id=self.booking.pk)
+                 .filter(room_number__startswith="170").values_list("room_number", flat=True)),
+            ["1700", "1702", "1703"],
+        )
+
+
+class RoomCacheVersionTests(TempMediaMixin, TestCase):
+    """Room writes bump the catalog and that room's card version; staff and guest cards are cached apart."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.rooms = [
+            Room.objects.create(room_number=f"18{i:02d}", room_type="single", price=Decimal("60.00"), capacity=1)
+            for i in range(2)
+        ]
+        cls.staff = User.objects.create_user("roomstaff", password="pw", is_staff=True)
+
+    def setUp(self):
+        cache.clear()
+        caches["fragments"].clear()
+        catalog_counter.reset()
+
+    def card_key(self, room, is_staff):
+        return make_template_fragment_key("room-card", [room.pk, room_versions([room.pk])[room.pk], is_staff])
+
+    def test_save_and_delete_bump_versions(self):
+        first, second = self.rooms
+        catalog, versions = catalog_version(), room_versions([first.pk, second.pk])
+        first.capacity = 2
+        first.save()
+        self.assertGreater(catalog_version(), catalog)
+        after_save = room_versions([first.pk, second.pk])
+        self.assertNotEqual(after_save[first.pk], versions[first.pk])
+        self.assertEqual(after_save[second.pk], versions[second.pk])
+
+        catalog = catalog_version()
+        first.delete()
+        self.assertGreater(catalog_version(), catalog)
+
+    def test_catalog_cache_hits_until_a_room_changes(self):
+        self.assertEqual(len(room_choices()), 2)
+        with self.assertNumQueries(0):
+            room_choices()
+        Room.objects.create(room_number="1899", room_type="suite", price=Decimal("90.00"), capacity=2)
+        self.assertEqual(len(room_choices()), 3)
+        self.assertEqual((catalog_counter.hits, catalog_counter.misses), (1, 2))
+
+    def test_edit_invalidates_only_that_card(self):
+        first, second = self.rooms
+        self.client.get("/rooms/")
+        self.assertIsNotNone(caches["fragments"].get(self.card_key(first, False)))
+        stale_first = self.card_key(first, False)
+
+        first.status = "maintenance"
+        first.save()
+        self.assertIsNone(caches["fragments"].get(self.card_key(first, False)))
+        self.assertIsNotNone(caches["fragments"].get(self.card_key(second, False)))
+        self.assertNotEqual(self.card_key(first, False), stale_first)
+        self.assertContains(self.client.get("/rooms/"), "<strong>Status:</strong> maintenance", html=False)
+
+    def test_staff_and_guest_cards_are_cached_apart(self):
+        edit_link = f'href="/rooms/update/{self.rooms[0].pk}/"'
+        self.assertNotContains(self.client.get("/rooms/"), edit_link)
+        self.client.force_login(self.staff)
+        self.assertContains(self.client.get("/rooms/"), edit_link)
+        self.client.logout()
+        self.assertNotContains(self.client.get("/rooms/"), edit_link)
+        self.assertIsNotNone(caches["fragments"].get(self.card_key(self.rooms[0], True)))
+        self.assertIsNotNone(caches["fragments"].get(self.card_key(self.rooms[0], False)))
@@ -6,6 +6,7 @@ from . import views
 
 urlpatterns = [
     path('', views.room_list, name='room_list'),
+    path('async/', views.room_list_async, name='room_list_async'),
     path('create/', user_passes_test(is_admin)(views.room_create), name='room_create'),
     path('update/<int:pk>/', views.room_update, name='room_update'),
     path('delete/<int:pk>/', views.room_delete, name='room_delete'),
@@ -1,10 +1,47 @@
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect, get_object_or_404
+from ReservO.db import read_from_primary, use_replica
+from .cache import room_list_cached
 from .models import Room
-from .forms import RoomForm
+from .forms import RoomAvailabilityForm, RoomForm
 
-def room_list(request):
+def listed_rooms(form):
+    """All rooms; with valid dates each one carries is_free, computed in the same query."""
     rooms = Room.objects.all()
-    return render(request, 'rooms/room_list.html', {'rooms': rooms})
+    if form.is_valid():
+        rooms = rooms.with_availability(form.cleaned_data['check_in'], form.cleaned_data['check_out'])
+    return rooms
+
+@use_replica
+def room_list(request):
+    form = RoomAvailabilityForm(request.GET or None)
+    context = {'rooms': listed_rooms(form), 'form': form}
+    if form.is_bound:
+        return render(request, 'rooms/room_list.html', context)
+    # Cached cards are keyed by versions bumped on the primary: render misses from
+    # the primary too, or a lagging replica's rows get stored under the new version
+    with read_from_primary():
+        return render(request, 'rooms/room_list.html', context)
+
+@use_replica
+async def room_list_async(request):
+    """
+    room_list for ASGI: rooms are read with async iteration and only rendering
+    (which also loads the session user) goes through sync_to_async. Without
+    dates the rooms are only read when the cached list is missing, so a warm
+    list still runs no room query.
+    """
+    form = RoomAvailabilityForm(request.GET or None)
+    rooms = listed_rooms(form)
+    if form.is_bound:
+        rooms = [room async for room in rooms]
+        return await sync_to_async(render)(request, 'rooms/room_list.html', {'rooms': rooms, 'form': form})
+    # Fragment misses are rendered from the primary, as in room_list
+    with read_from_primary():
+        user = await request.auser()
+        if not await sync_to_async(room_list_cached)(user.is_staff):
+            rooms = [room async for room in rooms]
+        return await sync_to_async(render)(request, 'rooms/room_list.html', {'rooms': rooms, 'form': form})
 
 def room_create(request):
     if request.method == 'POST':